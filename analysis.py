@@ -0,0 +1,492 @@
+"""분석 파이프라인(Streamlit 비의존).
+
+실거래 표본 → 매도가능가(하/중/상) → 손익 매트릭스/손실0 입찰가 → 보고서 → cases 저장.
+새 분석 화면과 batch_cli.py가 같은 함수를 사용합니다.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+import area_index
+import bid_sim
+import comps
+import price_index
+import storage
+import trade_warehouse
+import valuation
+
+COMPS_VIEW_COLUMNS = ["계약년월", "시군구", "번지", "건물명", "전용면적(㎡)", "거래금액", "면적단가", "층", "건축년도"]
+
+
+def fmt_money(v):
+    if v is None or v == "":
+        return "-"
+    try:
+        return f"{int(v):,}원"
+    except Exception:
+        return str(v)
+
+
+def parse_comps_xlsx(xlsx_bytes: bytes) -> pd.DataFrame:
+    """대표님 실거래 엑셀 포맷(고정)을 전제로 파싱합니다.
+    기대 컬럼:
+      - 전용면적(㎡)
+      - 거래금액  (원 단위)
+    워크북은 comps.load_comps로 한 번만 읽고(내용 해시 캐시), 여기서는 추정용 컬럼만 꺼냅니다.
+    """
+    return comps.estimator_frame(comps.load_comps(xlsx_bytes))
+
+
+def load_comps_for_area(xlsx_bytes, xlsx_name, wh_pick, area_m2):
+    """새 분석 실거래 표본을 대상면적 기준으로 읽습니다. 반환: (estimate 입력, 결과 표본용 표 또는 None)
+
+    대용량/CSV는 면적 ±10㎡ 구간만 스트리밍하므로, 검수 단계에서 면적이 바뀌면 다시 불러야 합니다.
+    """
+    if xlsx_bytes is not None and comps.should_stream(len(xlsx_bytes), xlsx_name):
+        if not area_m2:
+            # 면적을 모르면 구간을 정할 수 없음 → 검수에서 면적을 입력한 뒤 읽음(파일 전체를 올리지 않음)
+            return pd.DataFrame(columns=["area_m2", "price"]), None
+        # 대용량/CSV: 대상면적 ±10㎡·지상층 행만 남기며 읽기(전체 시트를 표로 만들지 않음)
+        streamed = comps.stream_comps(xlsx_bytes, area_m2)
+        return comps.estimator_frame(streamed), comps.view_frame(streamed)
+    if xlsx_bytes is not None:
+        return parse_comps_xlsx(xlsx_bytes), None
+    # 창고(trades)에서 동 전체 실거래를 인덱스 조회(네트워크 없음, 금액은 만원 → 원)
+    wh_view = trade_warehouse.query_dong(*wh_pick)
+    return trade_warehouse.view_to_comps(wh_view), trade_warehouse.view_in_won(wh_view)
+
+
+def estimate_sale_price_range(comps: pd.DataFrame, subject_area: float, market=None) -> dict:
+    """전용면적 유사표본 기반 매도가능가(하/중/상) 산정.
+    - 기본: ±3㎡ (표본 부족 시 ±5㎡)
+    - 분위수 25/50/75 사용
+    - 이상치 방지용 간단 필터 포함
+    - market=(lawd_cd, property_type, dong)이면 유사표본이 없을 때 가격지수 집계로 대신 산정
+    """
+    if subject_area is None or comps is None or "area_m2" not in comps.columns or "price" not in comps.columns:
+        out = {"low": None, "mid": None, "high": None, "note": "실거래 데이터 컬럼 인식 실패 또는 대상면적 없음"}
+    else:
+        # 면적 정렬 인덱스(같은 표는 캐시 재사용)에서 ±3/±5㎡ 구간을 이진 탐색
+        out = area_index.index_for(comps).estimate(float(subject_area))
+    if out.get("mid") is None and market and subject_area:
+        fallback = price_index.estimate(*market, subject_area)
+        if fallback.get("mid") is not None:
+            return fallback
+    return out
+
+
+def holding_costs(loan_amount, interest_rate, holding_days, early_repay_fee_rate):
+    """보유기간 이자/중도상환수수료(입찰가와 무관한 고정비)."""
+    interest_cost = loan_amount * interest_rate * (holding_days / 365.0)
+    early_fee = loan_amount * early_repay_fee_rate
+    return interest_cost, early_fee
+
+
+def bid_grid(bid_start, bid_end, bid_step) -> np.ndarray:
+    """range(bid_start, bid_end + 1, bid_step)와 같은 입찰가 배열."""
+    return np.arange(int(bid_start), int(bid_end) + 1, int(bid_step), dtype=np.int64)
+
+
+def profit_grid(sale_prices, bids, tax_rate, fixed_cost) -> np.ndarray:
+    """입찰가 × 매도가 손익(원, 반올림 정수). shape=(len(bids), len(sale_prices))
+
+    손익 = 매도가 - 입찰가 × (1 + 세율) - 고정비(수리/명도/이자/중도상환)
+    """
+    sp = np.asarray(sale_prices, dtype=np.float64)[None, :]
+    b = np.asarray(bids, dtype=np.float64)[:, None]
+    return np.rint(sp - b - b * tax_rate - fixed_cost).astype(np.int64)
+
+
+def loss0_bid(sale_price, bid_start, bid_end, bid_step, tax_rate, fixed_cost):
+    """입찰가 격자에서 손익(반올림) >= 0인 최대 입찰가. 없으면 None.
+
+    손익은 입찰가에 대해 단조감소이므로 (매도가 - 고정비) / (1 + 세율)에서 바로 격자 위치를 구하고,
+    경계의 반올림 오차만 앞뒤 한 칸으로 보정합니다.
+    """
+    bid_start, bid_end, bid_step = int(bid_start), int(bid_end), int(bid_step)
+    n = (bid_end - bid_start) // bid_step + 1
+    if n <= 0:
+        return None
+
+    def ok(k):
+        return profit_grid([sale_price], [bid_start + k * bid_step], tax_rate, fixed_cost)[0, 0] >= 0
+
+    limit = (float(sale_price) - fixed_cost) / (1.0 + tax_rate)
+    k = min(n - 1, int(np.floor((limit - bid_start) / bid_step)))
+    k = max(k, -1)
+    if k + 1 < n and ok(k + 1):
+        k += 1
+    while k >= 0 and not ok(k):
+        k -= 1
+    return bid_start + k * bid_step if k >= 0 else None
+
+
+def matrix_frame(bids, sale_prices, profits) -> pd.DataFrame:
+    """화면/저장용 표(입찰가 + '매도가 N.NN억' 컬럼)."""
+    data = {"입찰가": np.asarray(bids, dtype=np.int64)}
+    for j, sp in enumerate(sale_prices):
+        data[f"매도가 {sp/100_000_000:.2f}억"] = profits[:, j]
+    return pd.DataFrame(data)
+
+
+def build_profit_matrix(sale_prices, bid_start, bid_end, bid_step, tax_rate, loan_amount, interest_rate, holding_days, early_repay_fee_rate, repair_cost, eviction_cost):
+    interest_cost, early_fee = holding_costs(loan_amount, interest_rate, holding_days, early_repay_fee_rate)
+    fixed_cost = repair_cost + eviction_cost + interest_cost + early_fee
+    bids = bid_grid(bid_start, bid_end, bid_step)
+    df = matrix_frame(bids, sale_prices, profit_grid(sale_prices, bids, tax_rate, fixed_cost))
+    return df, {"interest_cost": int(round(interest_cost)), "early_fee": int(round(early_fee))}
+
+
+def generate_report_stub(subject: dict, sale_range: dict, outputs: dict, assumptions: dict) -> str:
+    """OpenAI API 없이도 '실전형'으로 보이도록 보고서를 구성합니다.
+    - 매도가능가(하/중/상) 산정 근거를 표(마크다운 테이블)로 설명
+    - 한줄 결론(진행/보류/비추천)을 자동으로 제시
+    """
+    case_no = subject.get("case_no") or "미추출/수정필요"
+    address = subject.get("address") or "미추출/수정필요"
+    area = subject.get("area_m2")
+    appraisal = subject.get("appraisal")
+    min_price = subject.get("min_price")
+    auction_date = subject.get("auction_date") or "-"
+    base_right = subject.get("base_right") or "-"
+
+    occ = subject.get("occupancy_hint") or "-"
+    special = subject.get("special_hint") or "-"
+    rights_summary = subject.get("rights_summary") or "-"
+
+    loss0 = outputs.get("loss0_max_bid")
+    rec = outputs.get("recommended_bid") or "-"
+    loan_amount = outputs.get("loan_amount")
+
+    stats = (sale_range or {}).get("stats") or {}
+    delta_used = stats.get("delta_used")
+    n = stats.get("n") or ((sale_range or {}).get("n") if isinstance(sale_range, dict) else None)
+    outlier_flag = "적용" if stats.get("outlier_filtered") else "미적용"
+
+    # --- 한줄 결론(보수적) ---
+    verdict = "보류"
+    verdict_reason = []
+    if not min_price or int(min_price) <= 0:
+        verdict = "보류"
+        verdict_reason.append("최저가 확인 필요(0원/미추출)")
+    else:
+        if loss0 and int(loss0) >= int(min_price):
+            verdict = "진행 가능(조건부)"
+            verdict_reason.append("손실0 상한이 최저가 이상")
+        else:
+            verdict = "보류/비추천"
+            verdict_reason.append("손실0 상한이 최저가 미만")
+
+        if "제시외" in str(special):
+            verdict_reason.append("제시외 건물 리스크")
+        if "중복" in str(special):
+            verdict_reason.append("중복사건 상태 재확인")
+
+    low = (sale_range or {}).get("low")
+    mid = (sale_range or {}).get("mid")
+    high = (sale_range or {}).get("high")
+
+    rationale_table = """| 항목 | 값 | 의미 |
+|---|---:|---|
+"""
+    rationale_table += f"| 유사면적 기준 | ±{int(delta_used) if delta_used else '-'}㎡ | 대상면적(전용)과 비슷한 거래만 사용 |\n"
+    rationale_table += f"| 표본 수(n) | {n if n else '-'} | 표본이 많을수록 신뢰도 ↑ |\n"
+    rationale_table += f"| 하단(25%) | {fmt_money(low)} | **빠른 매도**를 노릴 때 기준 |\n"
+    rationale_table += f"| 기준(50%) | {fmt_money(mid)} | **현실 매도**의 중심값(중앙값) |\n"
+    rationale_table += f"| 상단(75%) | {fmt_money(high)} | 상품화/시간여유가 있을 때 상단 목표 |\n"
+    rationale_table += f"| 이상치 필터 | {outlier_flag} | 중앙값 대비 과도한 값은 제거(왜곡 방지) |\n"
+
+    lines = []
+    lines.append(f"# 경매 분석 리포트(자동 · 실전형)")
+    lines.append("")
+    # ✅ 요약 3줄(맨 위)
+    lines.append(f"- **결론:** {verdict}")
+    lines.append(f"- **추천 입찰가:** {rec}")
+    lines.append(f"- **핵심 리스크:** {special if special!='-' else '특이사항 힌트 없음'} / {occ if occ!='-' else '점유 힌트 없음'}")
+    lines.append("")
+    lines.append(f"## 결론: **{verdict}**")
+    if verdict_reason:
+        lines.append(f"- 사유: {' / '.join(verdict_reason)}")
+    lines.append("")
+
+    lines.append("## 1) 물건 요약")
+    lines.append(f"- 사건번호: **{case_no}**")
+    if subject.get("related_case"):
+        lines.append(f"- 관련사건(중복): {subject.get('related_case')}")
+    lines.append(f"- 주소: **{address}**")
+    lines.append(f"- 전용면적: **{area if area is not None else '-'} ㎡**")
+    lines.append(f"- 감정가/최저가: **{fmt_money(appraisal)} / {fmt_money(min_price)}**")
+    lines.append(f"- 매각기일: **{auction_date}**")
+    lines.append(f"- 말소기준: **{base_right}**")
+    lines.append("")
+
+    lines.append("## 2) 권리/명도/특이사항 요약")
+    lines.append(f"- 점유 힌트: **{occ}**")
+    lines.append(f"- 특이사항 힌트: **{special}**")
+    lines.append(f"- 등기 요약: **{rights_summary}**")
+    lines.append("")
+
+    lines.append("## 3) 매도가능가(실거래 기반) — 근거")
+    lines.append(rationale_table)
+    lines.append("")
+    val = outputs.get("valuation") or {}
+    if val.get("mid") is not None:
+        ci = val.get("ci") or {}
+        model = val.get("model") or {}
+
+        def _ci(k):
+            v = ci.get(k)
+            return f"{fmt_money(v[0])} ~ {fmt_money(v[1])}" if v else "-"
+
+        lines.append("### 3-1) 시점·층·연식 보정 매도가능가")
+        lines.append(f"- {val.get('note') or ''}")
+        lines.append("| 항목 | 보정값 | 95% 신뢰구간 |")
+        lines.append("|---|---:|---:|")
+        lines.append(f"| 하단(25%) | {fmt_money(val.get('low'))} | {_ci('low')} |")
+        lines.append(f"| 기준(50%) | {fmt_money(val.get('mid'))} | {_ci('mid')} |")
+        lines.append(f"| 상단(75%) | {fmt_money(val.get('high'))} | {_ci('high')} |")
+        if model.get("estimate"):
+            mci = model.get("ci") or [None, None]
+            lines.append(f"| 모형 추정가 | {fmt_money(model.get('estimate'))} | {fmt_money(mci[0])} ~ {fmt_money(mci[1])} |")
+        lines.append("")
+    market = outputs.get("market_index") or {}
+    if market.get("ppm_12m"):
+        est = market.get("estimate") or {}
+        yoy = market.get("yoy_pct")
+        lines.append("### 3-2) 지역 가격지수(월별 ㎡당 중앙값)")
+        lines.append(f"- 기준: {market.get('dong') or '시군구 전체'} · {market.get('area_bucket')} · {market.get('ref_month')} 기준")
+        lines.append(f"- 최근 12개월 ㎡당 중앙값: **{fmt_money(market.get('ppm_12m'))}** ({market.get('n_12m')}건)")
+        lines.append(f"- 전년 동기 대비: **{'-' if yoy is None else f'{yoy:+.1f}%'}**")
+        if est.get("mid") is not None:
+            lines.append(f"- 가격지수 환산 매도가(하/중/상): {fmt_money(est.get('low'))} / {fmt_money(est.get('mid'))} / {fmt_money(est.get('high'))}")
+        lines.append("")
+    lines.append("## 4) 손실0 기준 요약(손실 금지 + 6개월 회전)")
+    lines.append(f"- 손실0 상한(기준 매도가 기준): **{fmt_money(loss0)}**")
+    lines.append(f"- 추천 입찰가(확률형): **{rec}**")
+    lines.append(f"- 대출(감정가 60% 가정): **{fmt_money(loan_amount)}**")
+    lines.append("")
+    lines.append("## 5) 입찰 전 체크리스트(필수)")
+    lines.append("- 매각물건명세서/현황조사서 최종 확인(임차인/점유/특별매각조건)")
+    lines.append("- 등기부 최신본 재발급(입찰 직전)")
+    lines.append("- 전입세대 열람/확정일자(숨은 점유자/임차)")
+    lines.append("- 제시외/불법 증·개축 여부 현장 확인")
+    lines.append("- 관리비/체납/공과금 확인")
+    return "\n".join(lines)
+
+
+def save_case(case: dict):
+    summ = storage.case_summary(case.get("outputs"))
+    storage.execute("""
+    INSERT INTO cases(
+        id, created_at, created_by, status, case_no, address, property_type, area_m2, appraisal, min_price, auction_date, links,
+        inputs_json, outputs_json, report_md, created_ts,
+        verdict, loss0_max_bid, recommended_bid, sale_mid, sale_n
+    ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+    """, (
+        case["id"], case["created_at"], case["created_by"], case["status"], case.get("case_no"), case.get("address"),
+        case.get("property_type"), case.get("area_m2"), case.get("appraisal"), case.get("min_price"),
+        case.get("auction_date"), json.dumps(case.get("links") or {}, ensure_ascii=False),
+        json.dumps(case.get("inputs") or {}, ensure_ascii=False),
+        json.dumps(case.get("outputs") or {}, ensure_ascii=False),
+        case.get("report_md") or "",
+        storage.to_epoch(case["created_at"]),
+        *(summ[c] for c in storage.CASE_SUMMARY_COLUMNS),
+    ))
+
+def comps_sample_view(comps_raw: pd.DataFrame, area_m2, limit: int = 30) -> pd.DataFrame:
+    """결과 화면용 실거래 표본(유사면적 ±10㎡, 지하층 제외, 상위 limit건)."""
+    try:
+        sa = float(area_m2) if area_m2 else None
+    except Exception:
+        sa = None
+    comps_view = comps_raw.copy() if comps_raw is not None else pd.DataFrame()
+    if sa is not None and "전용면적(㎡)" in comps_view.columns:
+        comps_view = comps_view.iloc[area_index.AreaIndex(comps_view["전용면적(㎡)"]).positions(sa, 10.0)]
+    if "층" in comps_view.columns:
+        _floor_num = pd.to_numeric(comps_view["층"], errors="coerce")
+        comps_view = comps_view[_floor_num.ne(-1) | _floor_num.isna()]
+    keep_cols = [c for c in COMPS_VIEW_COLUMNS if c in comps_view.columns]
+    return comps_view[keep_cols].head(limit)
+
+
+def finalize_analysis(subj: dict, reviewed: dict, sale_range: dict, assumptions: dict, comps_raw: pd.DataFrame = None,
+                      market=None):
+    """검수값(reviewed)으로 손익/추천가/보고서를 만듭니다.
+
+    subj: PDF 파싱 결과(관련사건/힌트/등기 요약 등), reviewed: 사건번호·주소·면적·감정가·최저가 등 확정값
+    market: 실거래 창고 (lawd_cd, property_type, dong)이면 가격지수 추이/요약을 함께 저장
+    반환: (outputs, inputs, report_md). 매도가능가를 못 구하면 ValueError.
+    """
+    case_no = reviewed.get("case_no")
+    address = reviewed.get("address")
+    property_type = reviewed.get("property_type")
+    area_m2 = reviewed.get("area_m2")
+    appraisal = int(reviewed.get("appraisal") or 0)
+    min_price = int(reviewed.get("min_price") or 0)
+    auction_date = reviewed.get("auction_date")
+    base_right = reviewed.get("base_right")
+
+    loan_amount = int(appraisal * 0.60)
+    sr = dict(sale_range or {})
+    if sr.get("prices"):
+        # 표본 전체 대신 분위수 표본만 저장(outputs_json 크기 고정), 시뮬레이션도 저장본으로 돌려 재현 가능
+        sr["prices_n"] = len(sr["prices"])
+        sr["prices"] = bid_sim.compact_sample(sr["prices"])
+    comps_view = comps_sample_view(comps_raw, area_m2)
+
+    if sr.get("low") is None:
+        raise ValueError("실거래 표본에서 유사표본 매도가능가를 산출하지 못했습니다. 실거래 컬럼/면적을 확인해주세요.")
+
+    sale_prices = [int(sr["low"]), int(sr["mid"]), int(sr["high"])]
+    bid_start = int(min_price) if int(min_price) > 0 else int(appraisal * 0.80)
+    bid_end = (bid_start + 40_000_000) if int(min_price) <= 0 else int(min_price + 40_000_000)
+    bid_step = int(assumptions["bid_step"])
+
+    tax_rate = float(assumptions["tax_rate"])
+    interest_cost, early_fee = holding_costs(
+        loan_amount,
+        float(assumptions["interest_rate"]),
+        int(assumptions["holding_days"]),
+        float(assumptions["early_repay_fee_rate"]),
+    )
+    fixed_cost = int(assumptions["repair_cost"]) + int(assumptions["eviction_cost"]) + interest_cost + early_fee
+    cost_info = {"interest_cost": int(round(interest_cost)), "early_fee": int(round(early_fee))}
+
+    bids = bid_grid(bid_start, bid_end, bid_step)
+    profits = profit_grid(sale_prices, bids, tax_rate, fixed_cost)
+    loss0_max_bid = loss0_bid(sale_prices[1], bid_start, bid_end, bid_step, tax_rate, fixed_cost)
+    df_matrix = matrix_frame(bids, sale_prices, profits)
+
+    recommended_bid = None
+    if loss0_max_bid:
+        lo = int(loss0_max_bid * 0.97)
+        hi = int(loss0_max_bid * 0.99)
+        def round_step(x): return int(round(x / bid_step) * bid_step)
+        recommended_bid = f"{round_step(lo):,} ~ {round_step(hi):,}원"
+
+    # 한줄 결론(진행/보류/비추천) - 화면 배너용
+    verdict = "보류"
+    verdict_reason = []
+    if int(min_price) <= 0:
+        verdict = "보류"
+        verdict_reason.append("최저가 미추출(0원) → 최저가 수동 입력 후 재분석 필요")
+    else:
+        if loss0_max_bid and loss0_max_bid >= int(min_price):
+            verdict = "진행 가능(조건부)"
+            verdict_reason.append("손실0 상한이 최저가 이상(손실 금지 조건 충족)")
+        else:
+            verdict = "보류/비추천"
+            verdict_reason.append("손실0 상한이 최저가 미만(손실 금지 조건 불충족)")
+
+        sh = (subj.get("special_hint") or "")
+        if "제시외" in sh:
+            verdict_reason.append("제시외 건물 가능성 → 원상복구/민원 리스크 확인 필요")
+        if "중복" in sh:
+            verdict_reason.append("중복사건(정지) 표기 → 입찰 직전 사건 진행상태 재확인")
+
+    # 입찰가별 손실확률(몬테카를로, 고정 시드로 저장값 재현 가능)
+    sim_ranges = bid_sim.default_ranges(assumptions)
+    sim_table = bid_sim.simulate(
+        bids, tax_rate, loan_amount, float(assumptions["early_repay_fee_rate"]), sim_ranges,
+        prices=sr.get("prices"), quartiles=sale_prices, seed=0,
+    )
+    simulation = {
+        "n": bid_sim.DEFAULT_SCENARIOS,
+        "ranges": {k: list(v) for k, v in sim_ranges.items()},
+        "max_loss_prob": bid_sim.DEFAULT_MAX_LOSS_PROB,
+        "max_bid": bid_sim.max_bid_for_loss_prob(sim_table),
+    }
+
+    outputs = {
+        "sale_range": sr,
+        "sale_prices": sale_prices,
+        "matrix": df_matrix.to_dict(orient="records"),
+        "cost_info": cost_info,
+        "loan_amount": loan_amount,
+        "loss0_max_bid": loss0_max_bid,
+        "verdict": verdict,
+        "verdict_reason": verdict_reason,
+        "recommended_bid": recommended_bid,
+        "matrix_cols": list(df_matrix.columns),
+        "bid_range": {"start": bid_start, "end": bid_end, "step": bid_step},
+        "simulation": simulation,
+        "comps_sample": comps_view.to_dict(orient="records"),
+        "subject_snapshot": {
+            "case_no": case_no or None,
+            "related_case": subj.get("related_case"),
+            "address": address or None,
+            "property_type": property_type or None,
+            "area_m2": float(area_m2) if area_m2 else None,
+            "appraisal": int(appraisal) if appraisal else None,
+            "min_price": int(min_price) if min_price else None,
+            "min_price_pct": subj.get("min_price_pct"),
+            "current_round": subj.get("current_round"),
+            "prior_unsold_count": subj.get("prior_unsold_count"),
+            "auction_date": auction_date or None,
+            "base_right": base_right or None,
+            "floor": reviewed.get("floor"),
+            "build_year": reviewed.get("build_year"),
+            "occupancy_hint": subj.get("occupancy_hint"),
+            "special_hint": subj.get("special_hint"),
+            "rights_summary": subj.get("rights_summary"),
+            "rights_rows": subj.get("rights_rows") or [],
+        },
+    }
+
+    # 시점·층·연식 보정 매도가능가(표시/보고서용, 손익 매트릭스는 기존 매도가능가 기준)
+    if comps_raw is not None and len(comps_raw):
+        val, val_err = valuation.adjusted_range(comps_raw, area_m2, reviewed.get("floor"), reviewed.get("build_year"))
+        outputs["valuation"] = val if val is not None else {"error": val_err}
+    if market:
+        outputs["market_index"] = price_index.market_summary(*market, area_m2)
+
+    inputs = dict(assumptions)
+    inputs.update({"loan_amount": loan_amount, "appraisal": appraisal, "min_price": min_price})
+
+    report_md = generate_report_stub(
+        {
+            "case_no": case_no,
+            "related_case": subj.get("related_case"),
+            "address": address,
+            "area_m2": area_m2,
+            "appraisal": appraisal,
+            "min_price": min_price,
+            "auction_date": auction_date or subj.get("auction_date"),
+            "base_right": base_right or subj.get("base_right"),
+            "occupancy_hint": subj.get("occupancy_hint"),
+            "special_hint": subj.get("special_hint"),
+            "rights_rows": subj.get("rights_rows"),
+            "rights_summary": subj.get("rights_summary"),
+        },
+        sr, outputs, inputs
+    )
+    return outputs, inputs, report_md
+
+
+def build_case(case_id: str, created_at: str, created_by, subj: dict, reviewed: dict, links: dict,
+               inputs: dict, outputs: dict, report_md: str) -> dict:
+    """save_case에 넘길 케이스 dict."""
+    area_m2 = reviewed.get("area_m2")
+    appraisal = reviewed.get("appraisal")
+    min_price = reviewed.get("min_price")
+    return {
+        "id": case_id,
+        "created_at": created_at,
+        "created_by": created_by,
+        "status": "DONE",
+        "case_no": reviewed.get("case_no") or None,
+        "address": reviewed.get("address") or None,
+        "property_type": reviewed.get("property_type") or None,
+        "area_m2": float(area_m2) if area_m2 else None,
+        "appraisal": int(appraisal) if appraisal else None,
+        "min_price": int(min_price) if min_price else None,
+        "min_price_pct": subj.get("min_price_pct"),
+        "current_round": subj.get("current_round"),
+        "prior_unsold_count": subj.get("prior_unsold_count"),
+        "auction_date": reviewed.get("auction_date") or None,
+        "links": links,
+        "inputs": inputs,
+        "outputs": outputs,
+        "report_md": report_md,
+    }
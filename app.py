@@ -1,16 +1,32 @@
-import io, re, json, base64, mimetypes, html
-import requests
-import xml.etree.ElementTree as ET
+import os, re, json, base64, hashlib, mimetypes, html
 import bcrypt
 import pandas as pd
 import streamlit as st
+import plotly.graph_objects as go
 from urllib.parse import quote
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from pathlib import Path
-from PyPDF2 import PdfReader
-import sqlite3
-from urllib.parse import quote
+import storage
+import columnar
+import comps
+import area_index
+import valuation
+import retention
+import molit_api
+import vworld_api
+import lot_index
+import pdf_cache
+import auction_pdf
+import bulk_ingest
+import bid_sim
+import trade_warehouse
+import price_index
+import law_code_helper
+from analysis import (
+    fmt_money, estimate_sale_price_range,
+    save_case, finalize_analysis, build_case, bid_grid, load_comps_for_area,
+)
 
 APP_DIR = Path(__file__).parent
 DATA_DIR = APP_DIR / "data"
@@ -20,140 +36,16 @@ LOCAL_TZ = ZoneInfo("Asia/Seoul")
 BUILD_ID = "2026-02-25-01"
 DATA_DIR.mkdir(exist_ok=True)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+storage.configure(DB_PATH)
 
 def get_settings():
     delete_after_days = 30
     if "storage" in st.secrets and "delete_after_days" in st.secrets["storage"]:
         delete_after_days = max(30, int(st.secrets["storage"]["delete_after_days"]))
-    return {"delete_after_days": delete_after_days, "case_keep_days": 30}
+    return {"delete_after_days": delete_after_days, "case_keep_days": 30, "tx_keep_days": 30}
 
 def init_db():
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS cases(
-        id TEXT PRIMARY KEY,
-        created_at TEXT,
-        created_by TEXT,
-        status TEXT,
-        case_no TEXT,
-        address TEXT,
-        property_type TEXT,
-        area_m2 REAL,
-        appraisal INTEGER,
-        min_price INTEGER,
-        auction_date TEXT,
-        links TEXT,
-        inputs_json TEXT,
-        outputs_json TEXT,
-        report_md TEXT
-    )""")
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS uploads(
-        id TEXT PRIMARY KEY,
-        case_id TEXT,
-        file_type TEXT,
-        storage_path TEXT,
-        uploaded_at TEXT,
-        delete_after TEXT,
-        deleted_at TEXT
-    )""")
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS tx_runs(
-        id TEXT PRIMARY KEY,
-        created_at TEXT,
-        created_by TEXT,
-        title TEXT,
-        query TEXT,
-        rows_json TEXT
-    )""")
-    con.commit()
-    con.close()
-
-def cleanup_uploads(delete_after_days: int):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    now = datetime.utcnow()
-    cur.execute("""SELECT id, storage_path, delete_after FROM uploads WHERE deleted_at IS NULL""")
-    for uid, path, delete_after in cur.fetchall():
-        try:
-            if delete_after and now >= datetime.fromisoformat(delete_after):
-                p = Path(path)
-                if p.exists():
-                    p.unlink()
-                cur.execute("""UPDATE uploads SET deleted_at=? WHERE id=?""", (now.isoformat(), uid))
-        except Exception:
-            pass
-    con.commit()
-    con.close()
-
-def _parse_local_dt(v):
-    if v is None:
-        return None
-    s = str(v).strip()
-    if not s:
-        return None
-    s = s.replace("Z", "+00:00")
-    try:
-        dt = datetime.fromisoformat(s)
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=LOCAL_TZ)
-        return dt.astimezone(LOCAL_TZ)
-    except Exception:
-        try:
-            return datetime.strptime(s[:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ)
-        except Exception:
-            return None
-
-def cleanup_old_cases(keep_days: int):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    now_local = datetime.now(LOCAL_TZ)
-    cutoff = now_local - timedelta(days=int(keep_days))
-
-    cur.execute("""SELECT id, created_at FROM cases""")
-    rows = cur.fetchall()
-    expired_ids = []
-    for rid, created_at in rows:
-        dt = _parse_local_dt(created_at)
-        if dt and dt < cutoff:
-            expired_ids.append(rid)
-
-    if not expired_ids:
-        con.close()
-        return
-
-    for rid in expired_ids:
-        cur.execute("""SELECT id, storage_path FROM uploads WHERE case_id=?""", (rid,))
-        for uid, storage_path in cur.fetchall():
-            try:
-                p = Path(storage_path)
-                if p.exists():
-                    p.unlink()
-            except Exception:
-                pass
-            cur.execute("""DELETE FROM uploads WHERE id=?""", (uid,))
-        cur.execute("""DELETE FROM cases WHERE id=?""", (rid,))
-
-    con.commit()
-    con.close()
-
-def cleanup_old_tx_runs(keep_days: int = 30):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    now_local = datetime.now(LOCAL_TZ)
-    cutoff = now_local - timedelta(days=int(keep_days))
-    cur.execute("""SELECT id, created_at FROM tx_runs""")
-    rows = cur.fetchall()
-    expired_ids = []
-    for rid, created_at in rows:
-        dt = _parse_local_dt(created_at)
-        if dt and dt < cutoff:
-            expired_ids.append(rid)
-    for rid in expired_ids:
-        cur.execute("""DELETE FROM tx_runs WHERE id=?""", (rid,))
-    con.commit()
-    con.close()
+    storage.ensure_schema()
 
 def allowed_users():
     users = []
@@ -218,357 +110,99 @@ def require_login():
     st.markdown("</div>", unsafe_allow_html=True)
     st.stop()
 
+def _write_blob(storage_path: Path, data) -> bool:
+    """내용 주소 파일을 한 번만 씁니다(임시 파일 → rename). 새로 썼으면 True."""
+    import uuid
+    if storage_path.exists():
+        return False
+    # 세션은 한 프로세스의 스레드이므로 pid만으로는 임시 파일 이름이 겹칩니다
+    tmp = storage_path.with_name(f".{storage_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, storage_path)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
 def save_upload(case_id: str, file_type: str, uploaded_file):
+    """업로드를 SHA-256 내용 주소({hash}{suffix})로 저장합니다.
+    같은 파일은 한 번만 쓰고, uploads 행은 참조(케이스별)로 추가됩니다.
+    파일 삭제는 retention이 마지막 참조가 만료될 때 수행합니다."""
     import uuid
     settings = get_settings()
     uid = str(uuid.uuid4())
+    data = uploaded_file.getbuffer()
+    digest = hashlib.sha256(data).hexdigest()
     suffix = Path(uploaded_file.name).suffix.lower() or ".bin"
-    storage_path = UPLOAD_DIR / f"{uid}_{file_type}{suffix}"
-    with open(storage_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    storage_path = UPLOAD_DIR / f"{digest}{suffix}"
 
     now = datetime.utcnow()
     delete_after = now + timedelta(days=settings["delete_after_days"])
 
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute("""
-      INSERT INTO uploads(id, case_id, file_type, storage_path, uploaded_at, delete_after, deleted_at)
-      VALUES(?,?,?,?,?,?,NULL)
-    """, (uid, case_id, file_type, str(storage_path), now.isoformat(), delete_after.isoformat()))
-    con.commit()
-    con.close()
+    # 참조 행을 먼저 기록해 두면, 동시에 도는 정리 작업이 이 파일을 지우지 않습니다
+    storage.execute("""
+      INSERT INTO uploads(id, case_id, file_type, storage_path, uploaded_at, delete_after, deleted_at, uploaded_ts, delete_after_ts, content_hash)
+      VALUES(?,?,?,?,?,?,NULL,?,?,?)
+    """, (
+        uid, case_id, file_type, str(storage_path), now.isoformat(), delete_after.isoformat(),
+        storage.to_epoch(now.isoformat(), naive_utc=True), storage.to_epoch(delete_after.isoformat(), naive_utc=True),
+        digest,
+    ))
+    _write_blob(storage_path, data)
     return str(storage_path)
 
-def parse_auction_pdf(pdf_bytes: bytes) -> dict:
-    """옥션원 PDF 전용 파서(안정화).
-    - 본 사건번호와 관련사건(중복)을 구분
-    - 최저가(80%) / 2차 금액을 우선 추출
-    - 새주소 우선 추출 + 반복 토큰 정리
-    """
-    reader = PdfReader(io.BytesIO(pdf_bytes))
-    pages = []
-    for page in reader.pages[:6]:
-        try:
-            pages.append(page.extract_text() or "")
-        except Exception:
-            pages.append("")
-    text = "\n".join(pages)
-
-    flat = re.sub(r"[\t\r]", " ", text)
-    flat = re.sub(r"\s+", " ", flat).strip()
-
-    def norm_date(s: str):
-        return s.replace("-", ".").replace("/", ".")
-
-    def dedupe_tokens(s: str):
-        toks = re.split(r"\s+", s.strip())
-        out = []
-        for t in toks:
-            if not out or out[-1] != t:
-                out.append(t)
-        s2 = " ".join(out)
-        s2 = re.sub(r"(서울특별시)(?:\s*\1)+", r"\1", s2)
-        s2 = re.sub(r"(중랑구)(?:\s*\1)+", r"\1", s2)
-        return s2.strip()
-
-    # 사건번호: '매각기일' 라인 근처 우선
-    case_no = None
-    m = re.search(r"매각기일[^\n]{0,150}(\d{4}\s*타경\s*\d+)", text)
-    if m:
-        case_no = m.group(1).replace(" ", "")
-    if not case_no:
-        m = re.search(r"(?:지방법원|지원)[^0-9]{0,80}(\d{4}\s*타경\s*\d+)", flat)
-        if m:
-            case_no = m.group(1).replace(" ", "")
-    if not case_no:
-        for mm in re.finditer(r"(\d{4}\s*타경\s*\d+)", flat):
-            span = flat[max(0, mm.start()-40):mm.end()+40]
-            if "관련사건" in span:
-                continue
-            case_no = mm.group(1).replace(" ", "")
-            break
-
-    related_case = None
-    m = re.search(r"관련사건\s*(\d{4}\s*타경\s*\d+)", flat)
-    if m:
-        related_case = m.group(1).replace(" ", "")
-
-    auction_date = None
-    m = re.search(r"매각기일\s*[:：]?\s*(\d{4}[\.-]\d{2}[\.-]\d{2})", flat)
-    if m:
-        auction_date = norm_date(m.group(1))
-
-    base_right = None
-    m = re.search(r"말소기준권리\s*[:：]?\s*(\d{4}[\.-]\d{2}[\.-]\d{2})", flat)
-    if m:
-        base_right = norm_date(m.group(1))
-
-    
-    address = None
-
-    # 주소(옥션원): 텍스트 추출 시 토큰 반복(서울특별시서울특별시, 길길길길, 층층층층 등)이 흔합니다.
-    # '새 주소' 또는 '소재지' 위치를 찾고, 다음 키워드 전까지만 짧게 잘라냅니다.
-    def _slice_after(label: str, max_len: int = 140):
-        i = flat.find(label)
-        if i < 0:
-            return None
-        seg = flat[i + len(label): i + len(label) + max_len]
-        for stop in ["물건종별", "감 정 가", "감정가", "평당", "대 지 권", "대지권", "최저매각", "최 저 가"]:
-            j = seg.find(stop)
-            if j > 5:
-                seg = seg[:j]
-                break
-        return seg.strip()
-
-    # 요청사항: 구주소(소재지) 우선 사용
-    addr = _slice_after("소 재 지")
-    if not addr:
-        addr = _slice_after("새 주 소")
-
-    if addr:
-        address = re.sub(r"\s+", " ", addr).strip()
-        # 반복 토큰 축약
-        address = re.sub(r"(서울특별시)\1+", r"\1", address)
-        address = re.sub(r"(중랑구)\1+", r"\1", address)
-        address = re.sub(r"(길)\1+", r"\1", address)
-        address = re.sub(r"(비동)\1+", r"\1", address)
-        address = re.sub(r"(층)\1+", r"\1", address)
-        address = re.sub(r"(호)\1+", r"\1", address)
-        address = re.sub(r"([가-힣0-9]{1,6})\1{1,}", r"\1", address)
-        # 기존 dedupe_tokens도 한번 적용(있으면)
-        try:
-            address = dedupe_tokens(address)
-        except Exception:
-            pass
-
-        # 소재지에서 지번 주소(시/구/군/동/번지) 우선 추출
-        raw = address.replace(",", " ")
-        raw = re.sub(r"\s+", " ", raw).strip()
-        raw = re.sub(r"(서울특별시)\1+", r"\1", raw)
-        raw = re.sub(r"([가-힣]{1,12}(?:동|읍|면|리))\1+", r"\1", raw)
-
-        jibun_patterns = [
-            r"((?:서울특별시|부산광역시|대구광역시|인천광역시|광주광역시|대전광역시|울산광역시|세종특별자치시|[가-힣]+도)\s+[가-힣]+(?:시|군|구)\s+[가-힣0-9]+(?:동|읍|면|리)\s*\d+(?:-\d+)?)",
-            r"([가-힣]+(?:시|군|구)\s+[가-힣0-9]+(?:동|읍|면|리)\s*\d+(?:-\d+)?)",
-        ]
-        jibun = None
-        for ptn in jibun_patterns:
-            m = re.search(ptn, raw)
-            if m:
-                jibun = m.group(1)
-                break
-        if jibun:
-            jibun = re.sub(r"\s+", " ", jibun).strip()
-            jibun = re.sub(r"([가-힣]{1,12}(?:동|읍|면|리))\1+", r"\1", jibun)
-            address = jibun
-
-    area_m2 = None
-    m = re.search(r"건물면적\s*([0-9]+(?:\.[0-9]+)?)\s*㎡", flat)
-    if m:
-        area_m2 = float(m.group(1))
-
-    def to_int_money(s: str):
-        return int(s.replace(",", ""))
-
-    appraisal = None
-    m = re.search(r"감\s*정\s*가\s*([0-9]{1,3}(?:,[0-9]{3})+)\s*원", flat)
-    if m:
-        appraisal = to_int_money(m.group(1))
-    else:
-        cands = []
-        for mm in re.finditer(r"감\s*정\s*가|감정가", flat):
-            seg = flat[mm.end():mm.end()+200]
-            for m1 in re.finditer(r"([0-9]{1,3}(?:,[0-9]{3})+)", seg):
-                cands.append(to_int_money(m1.group(1)))
-        appraisal = max(cands) if cands else None
-
-    min_price = None
-    # 최저가: PDF 텍스트 추출 시 '원' 글자가 'ਗ'처럼 깨질 수 있어, '원' 없이도 잡히도록 패턴을 구성합니다.
-
-    # 1) "최 저 가(80%) 273,600,000" 형태
-    m = re.search(r"최\s*저\s*가\s*\(\s*80\s*%\s*\)\s*([0-9]{1,3}(?:,[0-9]{3})+)", flat)
-    if m:
-        min_price = to_int_money(m.group(1))
-
-    # 2) "2차 2026-03-04 273,600,000" 형태
-    if not min_price:
-        m = re.search(r"2차\s*\d{4}[\.-]\d{2}[\.-]\d{2}\s*([0-9]{1,3}(?:,[0-9]{3})+)", flat)
-        if m:
-            min_price = to_int_money(m.group(1))
-
-    # 3) "273,600,000 (80%)" 형태
-    if not min_price:
-        m = re.search(r"([0-9]{1,3}(?:,[0-9]{3})+)\s*[^0-9]{0,3}\(\s*80\s*%\s*\)", flat)
-        if m:
-            min_price = to_int_money(m.group(1))
-
-    # 4) 안전장치: '최저가' 키워드 주변 후보(감정가 이하 중 최대)
-    if not min_price:
-        cands = []
-        for mm in re.finditer(r"최\s*저\s*가|최저가|최\s*저\s*매\s*각\s*가\s*격", flat):
-            seg = flat[mm.end():mm.end()+260]
-            for m1 in re.finditer(r"([0-9]{1,3}(?:,[0-9]{3})+)", seg):
-                cands.append(to_int_money(m1.group(1)))
-        if cands:
-            if appraisal:
-                under = [x for x in cands if x <= appraisal]
-                min_price = max(under) if under else max(cands)
-            else:
-                min_price = max(cands)
-
-    occupancy_hint = []
-    if re.search(r"임차인이\s*없", flat):
-        occupancy_hint.append("임차인 없음")
-    if re.search(r"소유자가\s*점유", flat):
-        occupancy_hint.append("소유자 점유")
-    if re.search(r"전입세대확인서", flat):
-        occupancy_hint.append("전입세대확인서 언급")
-
-    special = []
-    if re.search(r"제시외\s*건물", flat) or re.search(r"제시외\s*건물\s*포함", flat):
-        special.append("제시외 건물 포함")
-    if re.search(r"\(중복\)\s*-\s*정지|중복\)\-정지", flat):
-        special.append("중복사건(정지) 표기")
-
-    rights_rows = []
-    for mm in re.finditer(r"(\d+)\((갑|을)\d+\)\s*(\d{4}\.\d{2}\.\d{2})\s*([가-힣]+)\s*([^0-9]+?)\s*([0-9]{1,3}(?:,[0-9]{3})+)\s*원\s*(말소기준등기)?\s*(소멸|인수|존속)?", flat):
-        rights_rows.append({
-            "no": mm.group(1),
-            "ab": mm.group(2),
-            "date": mm.group(3),
-            "kind": mm.group(4).strip(),
-            "holder": re.sub(r"\s+"," ",mm.group(5)).strip(),
-            "amount": to_int_money(mm.group(6)),
-            "is_base": True if mm.group(7) else False,
-            "status": (mm.group(8) or "").strip(),
-        })
-    rights_summary = None
-    if rights_rows:
-        base_row = next((r for r in rights_rows if r.get("is_base")), None)
-        if base_row:
-            rights_summary = f"말소기준등기: {base_row['date']} {base_row['kind']}({base_row['holder']})"
-            if not base_right:
-                base_right = base_row["date"]
-        else:
-            rights_summary = f"등기 표 파싱 {len(rights_rows)}건(말소기준등기 표기 미발견)"
+def copy_upload_refs(src_case_id: str, dst_case_id: str) -> int:
+    """다른 케이스의 업로드 파일을 새 케이스에서도 참조하도록 참조 행만 복제합니다(파일 복사 없음).
+    보관기간은 원본이 아니라 복제 시점부터 새로 셉니다(원본과 같이 만료되면 새 케이스의 파일이 지워짐)."""
+    import uuid
+    rows = storage.fetch_all(
+        """SELECT file_type, storage_path, content_hash
+           FROM uploads WHERE case_id=? AND deleted_at IS NULL""",
+        (src_case_id,),
+    )
+    if not rows:
+        return 0
 
-    # --- 최저가 정보(저감율/차수/유찰횟수) ---
-    min_price_pct = None
-    explicit_pct = None
-    m = re.search(r"최\s*저\s*가\s*\(\s*([0-9]{2,3})\s*%\s*\)", flat)
-    if m:
-        explicit_pct = int(m.group(1))
-    if explicit_pct is not None:
-        min_price_pct = float(explicit_pct)
-    elif appraisal and min_price:
-        try:
-            min_price_pct = round((float(min_price) / float(appraisal)) * 100.0, 1)
-        except Exception:
-            min_price_pct = None
-
-    rounds = []
-    for mm in re.finditer(r"(\d)차\s*(\d{4}[\.-]\d{2}[\.-]\d{2})\s*([0-9]{1,3}(?:,[0-9]{3})+)", flat):
-        rno = int(mm.group(1))
-        d = mm.group(2).replace("-", ".")
-        price = int(mm.group(3).replace(",", ""))
-        tail = flat[mm.end():mm.end()+20]
-        status = "유찰" if "유찰" in tail else ("변경" if "변경" in tail else "")
-        rounds.append({"round": rno, "date": d, "price": price, "status": status})
-
-    current_round = None
-    current_status = None
-    if auction_date and rounds:
-        for r in rounds:
-            if r["date"] == auction_date:
-                current_round = r["round"]
-                current_status = r["status"] or None
-                break
-
-    if current_round is None and min_price and rounds:
-        same = [r for r in rounds if r["price"] == int(min_price)]
-        if same:
-            same_sorted = sorted(same, key=lambda x: x["round"])
-            current_round = same_sorted[0]["round"]
-            current_status = same_sorted[0]["status"] or None
-
-    prior_unsold_count = None
-    if current_round and rounds:
-        prior_unsold_count = sum(1 for r in rounds if r["round"] < current_round and r["status"] == "유찰")
+    now = datetime.utcnow()
+    delete_after = now + timedelta(days=get_settings()["delete_after_days"])
+    stamps = (
+        now.isoformat(), delete_after.isoformat(),
+        storage.to_epoch(now.isoformat(), naive_utc=True), storage.to_epoch(delete_after.isoformat(), naive_utc=True),
+    )
 
-    return {
-        "case_no": case_no,
-        "related_case": related_case,
-        "address": address,
-        "appraisal": appraisal,
-        "min_price": min_price,
-        "min_price_pct": min_price_pct,
-        "current_round": current_round,
-        "prior_unsold_count": prior_unsold_count,
-        "current_status": current_status,
-        "area_m2": area_m2,
-        "auction_date": auction_date,
-        "base_right": base_right,
-        "occupancy_hint": " / ".join(occupancy_hint) if occupancy_hint else None,
-        "special_hint": " / ".join(special) if special else None,
-        "rights_rows": rights_rows,
-        "rights_summary": rights_summary,
-        "raw_text_snippet": text[:1200],
-    }
+    def _tx(cur):
+        cur.executemany(
+            """INSERT INTO uploads(id, case_id, file_type, storage_path, uploaded_at, delete_after, deleted_at, uploaded_ts, delete_after_ts, content_hash)
+               VALUES(?,?,?,?,?,?,NULL,?,?,?)""",
+            [(str(uuid.uuid4()), dst_case_id, file_type, path, *stamps, content_hash) for file_type, path, content_hash in rows],
+        )
 
+    storage.transaction(_tx)
+    return len(rows)
 
-def parse_comps_xlsx(xlsx_bytes: bytes) -> pd.DataFrame:
-    """대표님 실거래 엑셀 포맷(고정)을 전제로 파싱합니다.
-    기대 컬럼:
-      - 전용면적(㎡)
-      - 거래금액  (원 단위)
+def parse_auction_pdf(pdf_bytes: bytes) -> dict:
+    """SHA-256 내용 해시 캐시를 거치는 파서.
+    - 같은 PDF(같은 파서 버전)는 추출/정규식 없이 저장된 결과 반환
+    - 파서 버전만 바뀐 경우 저장된 텍스트로 다시 파싱(PDF 텍스트 추출 생략)
     """
-    df = pd.read_excel(io.BytesIO(xlsx_bytes))
-
-    # 컬럼명 정규화(공백 제거 등)
-    cols = {str(c).strip(): c for c in df.columns}
-
-    area_col = cols.get("전용면적(㎡)") or cols.get("전용면적")
-    price_col = cols.get("거래금액") or cols.get("거래금액(원)") or cols.get("매매금액")
-
-    if area_col is None or price_col is None:
-        # 안전장치: 유사 키워드로라도 찾기
-        for k, orig in cols.items():
-            if area_col is None and ("전용" in k and "면적" in k):
-                area_col = orig
-            if price_col is None and ("거래" in k and ("금액" in k or "가격" in k)):
-                price_col = orig
-
-    if area_col is None or price_col is None:
-        raise ValueError(f"실거래 엑셀에서 필수 컬럼을 찾지 못했습니다. 컬럼={list(df.columns)}")
-
-    out = pd.DataFrame({
-        "area_m2": pd.to_numeric(df[area_col], errors="coerce"),
-        "price": pd.to_numeric(df[price_col], errors="coerce"),  # 이미 '원' 단위
-    })
-
-    # 비정상 값 제거(잡음 제거)
-    out = out.dropna(subset=["area_m2", "price"])
-    out = out[(out["area_m2"] > 5) & (out["price"] > 10_000_000)]
-    return out
+    digest = pdf_cache.content_hash(pdf_bytes)
+    text, subject = pdf_cache.get(digest, auction_pdf.PARSER_VERSION)
+    if subject is not None:
+        return subject
+    if text is None:
+        text = auction_pdf.extract_pdf_text(pdf_bytes)
+    subject = auction_pdf.parse_auction_text(text)
+    try:
+        pdf_cache.put(digest, auction_pdf.PARSER_VERSION, text, subject)
+    except Exception:
+        pass
+    return subject
 
 def parse_comps_view_xlsx(xlsx_bytes: bytes) -> pd.DataFrame:
     """실거래 조회/리스트 화면용 표 데이터."""
-    df = pd.read_excel(io.BytesIO(xlsx_bytes))
-    if "면적단가" not in df.columns and {"거래금액", "전용면적(㎡)"} <= set(df.columns):
-        _p = pd.to_numeric(df["거래금액"], errors="coerce")
-        _a = pd.to_numeric(df["전용면적(㎡)"], errors="coerce")
-        df["면적단가"] = (_p / _a).round()
-
-    keep_cols = [c for c in ["계약년월", "시군구", "번지", "건물명", "전용면적(㎡)", "거래금액", "면적단가", "층", "건축년도"] if c in df.columns]
-    if keep_cols:
-        df = df[keep_cols].copy()
-
-    if "층" in df.columns:
-        _floor_num = pd.to_numeric(df["층"], errors="coerce")
-        df = df[_floor_num.ne(-1) | _floor_num.isna()]
-
-    return df
+    return comps.view_frame(comps.load_comps(xlsx_bytes))
 
 def _secret_get(path: list[str], default=None):
     cur = st.secrets
@@ -612,92 +246,34 @@ SIDO_GUGUN_OPTIONS = {
     ],
 }
 
-def fetch_vworld_lot_candidates(sido: str, sigungu: str, size: int = 200):
-    key = _get_vworld_key()
-    if not key:
-        return [], "VWORLD_API_KEY가 설정되지 않았습니다."
-    q = f"{sido} {sigungu}".strip()
-    url = "https://api.vworld.kr/req/search"
-    params = {
-        "service": "search",
-        "request": "search",
-        "version": "2.0",
-        "crs": "EPSG:4326",
-        "size": str(size),
-        "page": "1",
-        "query": q,
-        "type": "PARCEL",
-        "format": "json",
-        "errorformat": "json",
-        "key": key,
-    }
-    try:
-        r = requests.get(url, params=params, timeout=12)
-        r.raise_for_status()
-        obj = r.json()
-        items = (((obj or {}).get("response") or {}).get("result") or {}).get("items") or []
-    except Exception as e:
-        return [], f"VWORLD 조회 실패: {e}"
-
-    out = []
-    seen = set()
-    for it in items:
-        addr = str(it.get("address") or "")
-        pnu = str(it.get("id") or "")
-        m = re.search(r"([가-힣0-9]+동)\s+(\d+)(?:-(\d+))?", addr)
-        if not m:
-            continue
-        dong = m.group(1)
-        bun_main = m.group(2)
-        bun_sub = m.group(3) or "0"
-        bunji = f"{bun_main}-{bun_sub}" if bun_sub != "0" else bun_main
-        key2 = (dong, bunji, pnu)
-        if key2 in seen:
-            continue
-        seen.add(key2)
-        out.append({"dong": dong, "bunji": bunji, "pnu": pnu, "address": addr})
-    return out, None
+def fetch_vworld_lot_candidates(sido: str, sigungu: str, force: bool = False, progress=None):
+    """시군구 전체 지번 후보를 parcels 인덱스에 적재합니다(TTL 안이면 네트워크 없이 반환).
+    반환: (후보 수, err, from_index)"""
+    return vworld_api.load_candidates(
+        sido, sigungu, _get_vworld_key(),
+        ttl_sec=int(_secret_get(["vworld", "index_ttl_sec"], vworld_api.DEFAULT_TTL_SEC)),
+        force=force,
+        progress=progress,
+        max_in_flight=int(_secret_get(["vworld", "max_in_flight"], vworld_api.DEFAULT_MAX_IN_FLIGHT)),
+        rate_per_sec=float(_secret_get(["vworld", "rate_per_sec"], vworld_api.DEFAULT_RATE_PER_SEC)),
+    )
 
 def _molit_fetch_month(lawd_cd: str, yyyymm: str, property_type: str = "연립다세대"):
-    svc_key = _get_molit_key()
-    if not svc_key:
-        return [], "MOLIT_SERVICE_KEY가 설정되지 않았습니다."
-    if property_type == "아파트":
-        url = "https://openapi.molit.go.kr/OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcAptTradeDev"
-    else:
-        url = "https://openapi.molit.go.kr/OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcRHTrade"
-    params = {"serviceKey": svc_key, "LAWD_CD": lawd_cd, "DEAL_YMD": yyyymm}
-    try:
-        r = requests.get(url, params=params, timeout=15)
-        r.raise_for_status()
-        root = ET.fromstring(r.text)
-        items = root.findall(".//item")
-    except Exception as e:
-        return [], f"MOLIT 조회 실패({yyyymm}): {e}"
-
-    rows = []
-    for it in items:
-        def t(tag):
-            v = it.findtext(tag)
-            return (v or "").strip()
-        rows.append(
-            {
-                "계약년월": f"{t('년')}{t('월').zfill(2)}",
-                "시군구": t("법정동"),
-                "번지": t("지번"),
-                "건물명": t("건물명"),
-                "전용면적(㎡)": t("전용면적"),
-                "거래금액": (t("거래금액") or "").replace(",", ""),
-                "층": t("층"),
-                "건축년도": t("건축년도"),
-            }
-        )
-    return rows, None
+    return molit_api.fetch_month(lawd_cd, yyyymm, property_type, _get_molit_key(), rate_per_sec=_molit_rate_per_sec())
 
-def fetch_molit_trades_by_lot(pnu: str, dong: str, bunji: str, months_back: int = 12, property_type: str = "연립다세대"):
-    if not pnu or len(pnu) < 5:
-        return pd.DataFrame(), "PNU를 찾지 못했습니다."
-    lawd_cd = pnu[:5]
+def _molit_max_in_flight() -> int:
+    return int(_secret_get(["molit", "max_in_flight"], molit_api.DEFAULT_MAX_IN_FLIGHT))
+
+def _molit_rate_per_sec() -> float:
+    return float(_secret_get(["molit", "rate_per_sec"], molit_api.DEFAULT_RATE_PER_SEC))
+
+def _molit_cache_settings() -> dict:
+    return {
+        "settle_months": int(_secret_get(["molit", "cache_settle_months"], molit_api.DEFAULT_SETTLE_MONTHS)),
+        "recent_ttl_sec": int(_secret_get(["molit", "cache_recent_ttl_sec"], molit_api.DEFAULT_RECENT_TTL_SEC)),
+    }
+
+def _recent_yms(months_back: int):
     today = datetime.now(LOCAL_TZ)
     yms = []
     y, m = today.year, today.month
@@ -707,143 +283,140 @@ def fetch_molit_trades_by_lot(pnu: str, dong: str, bunji: str, months_back: int
         if m == 0:
             y -= 1
             m = 12
+    return yms
+
+def _sync_lawd(lawd_cd: str, property_type: str, yms, cache_stats: dict, resync_empty: bool = False):
+    # 시군구 전체를 창고(trades)에 증분 동기화(키가 없어도 이미 동기화된 월은 사용)
+    return trade_warehouse.sync_district(
+        lawd_cd, property_type, yms, _get_molit_key(),
+        max_in_flight=_molit_max_in_flight(),
+        rate_per_sec=_molit_rate_per_sec(),
+        stats=cache_stats,
+        resync_empty=resync_empty,
+        **_molit_cache_settings(),
+    )
 
-    all_rows = []
-    last_err = None
-    for ym in yms:
-        rows, err = _molit_fetch_month(lawd_cd, ym, property_type=property_type)
-        if err:
-            last_err = err
-            continue
-        all_rows.extend(rows)
-    if not all_rows:
-        return pd.DataFrame(), (last_err or "실거래 데이터를 찾지 못했습니다.")
-
-    df = pd.DataFrame(all_rows)
-    if "시군구" in df.columns:
-        df["시군구"] = df["시군구"].astype(str).str.strip()
-    if "번지" in df.columns:
-        df["번지"] = df["번지"].astype(str).str.strip()
-    df = df[df["시군구"].astype(str).str.contains(str(dong).replace("동", ""), na=False)]
-    df = df[df["번지"] == str(bunji)]
-    if "층" in df.columns:
-        fl = pd.to_numeric(df["층"], errors="coerce")
-        df = df[fl.ne(-1) | fl.isna()]
-    if "전용면적(㎡)" in df.columns:
-        df["전용면적(㎡)"] = pd.to_numeric(df["전용면적(㎡)"], errors="coerce")
-    if "거래금액" in df.columns:
-        df["거래금액"] = pd.to_numeric(df["거래금액"], errors="coerce")
-    if {"거래금액", "전용면적(㎡)"} <= set(df.columns):
-        df["면적단가"] = (df["거래금액"] / df["전용면적(㎡)"]).round()
-    keep = [c for c in ["계약년월", "시군구", "번지", "건물명", "전용면적(㎡)", "거래금액", "면적단가", "층", "건축년도"] if c in df.columns]
-    return df[keep].copy(), None
-
-
-def estimate_sale_price_range(comps: pd.DataFrame, subject_area: float) -> dict:
-    """전용면적 유사표본 기반 매도가능가(하/중/상) 산정.
-    - 기본: ±3㎡ (표본 부족 시 ±5㎡)
-    - 분위수 25/50/75 사용
-    - 이상치 방지용 간단 필터 포함
-    """
-    if subject_area is None or "area_m2" not in comps.columns or "price" not in comps.columns:
-        return {"low": None, "mid": None, "high": None, "note": "실거래 데이터 컬럼 인식 실패 또는 대상면적 없음"}
-
-    subject_area = float(subject_area)
-
-    def pick(delta: float):
-        return comps[(comps["area_m2"].between(subject_area - delta, subject_area + delta))].copy()
-
-    f3 = pick(3.0)
-    f = f3 if len(f3) >= 8 else pick(5.0)
-
-    if len(f) == 0:
-        return {"low": None, "mid": None, "high": None, "note": "유사면적 표본이 부족합니다(±5㎡ 내 거래 없음)"}
-
-    # 이상치 필터(중앙값 대비 과도한 값 제거)
-    med = float(f["price"].median())
-    f2 = f[(f["price"] >= med * 0.5) & (f["price"] <= med * 1.7)]
-    if len(f2) >= 5:
-        f = f2  # 충분하면 필터 적용
-
-    q25 = int(f["price"].quantile(0.25))
-    q50 = int(f["price"].quantile(0.50))
-    q75 = int(f["price"].quantile(0.75))
-
-    delta_used = 3 if len(f3) >= 8 else 5
-    return {
-        "low": q25,
-        "mid": q50,
-        "high": q75,
-        "n": int(len(f)),
-        "note": f"유사면적 표본 {len(f)}건 기반(±{delta_used}㎡, 분위수 25/50/75, 이상치 필터 적용)",
-    }
-
+def fetch_molit_trades_by_lot(pnu: str, dong: str, bunji: str, months_back: int = 12, property_type: str = "연립다세대",
+                              resync_empty: bool = False):
+    if not pnu or len(pnu) < 5:
+        return pd.DataFrame(), "PNU를 찾지 못했습니다."
+    lawd_cd = pnu[:5]
+    yms = _recent_yms(months_back)
+
+    # 동기화 후 동/번지는 인덱스로 조회
+    cache_stats = {"hit": 0, "miss": 0}
+    report = _sync_lawd(lawd_cd, property_type, yms, cache_stats, resync_empty)
+    month_errors = report["errors"]
+    out = trade_warehouse.query_lot(lawd_cd, property_type, dong, bunji, yms)
+    if out.empty and month_errors:
+        first_err = next(iter(month_errors.values()), None)
+        return pd.DataFrame(), (first_err or "실거래 데이터를 찾지 못했습니다.")
+    out.attrs["month_errors"] = month_errors
+    out.attrs["cache_stats"] = cache_stats
+    out.attrs["sync_report"] = report
+    return out, None
 
-def build_profit_matrix(sale_prices, bid_start, bid_end, bid_step, tax_rate, loan_amount, interest_rate, holding_days, early_repay_fee_rate, repair_cost, eviction_cost):
-    holding_years = holding_days / 365.0
-    interest_cost = loan_amount * interest_rate * holding_years
-    early_fee = loan_amount * early_repay_fee_rate
-
-    bids = list(range(bid_start, bid_end + 1, bid_step))
-    rows = []
-    for bid in bids:
-        row = {"입찰가": bid}
-        for sp in sale_prices:
-            profit = sp - bid - (bid * tax_rate) - repair_cost - eviction_cost - interest_cost - early_fee
-            row[f"매도가 {sp/100_000_000:.2f}억"] = int(round(profit))
-        rows.append(row)
-    df = pd.DataFrame(rows)
-    return df, {"interest_cost": int(round(interest_cost)), "early_fee": int(round(early_fee))}
-
-def save_case(case: dict):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute("""
-    INSERT INTO cases(
-        id, created_at, created_by, status, case_no, address, property_type, area_m2, appraisal, min_price, auction_date, links,
-        inputs_json, outputs_json, report_md
-    ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-    """, (
-        case["id"], case["created_at"], case["created_by"], case["status"], case.get("case_no"), case.get("address"),
-        case.get("property_type"), case.get("area_m2"), case.get("appraisal"), case.get("min_price"),
-        case.get("auction_date"), json.dumps(case.get("links") or {}, ensure_ascii=False),
-        json.dumps(case.get("inputs") or {}, ensure_ascii=False),
-        json.dumps(case.get("outputs") or {}, ensure_ascii=False),
-        case.get("report_md") or ""
-    ))
-    con.commit()
-    con.close()
-
-def list_cases():
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    # 최신 저장 순서 기준으로 조회(시간 문자열 파싱 이슈 회피)
-    cur.execute("""SELECT rowid, id, created_at, case_no, address, status, auction_date, outputs_json FROM cases ORDER BY rowid DESC""")
-    rows = cur.fetchall()
-    con.close()
+def parse_lot_lines(text: str, default_sido: str, default_sigungu: str):
+    """일괄 조회 입력(한 줄에 1지번) → (lots, 인식 실패 줄).
+    형식: '동 번지' (현재 선택한 시/구) 또는 '시/도 구/군 동 번지'"""
+    lots, bad = [], []
+    seen = set()
+    for line in str(text or "").splitlines():
+        toks = line.replace(",", " ").split()
+        if not toks:
+            continue
+        if len(toks) == 2:
+            sido, sigungu, dong, bunji = default_sido, default_sigungu, toks[0], toks[1]
+        elif len(toks) == 4:
+            sido, sigungu, dong, bunji = toks
+        else:
+            bad.append(line.strip())
+            continue
+        if not re.fullmatch(r"\d+(?:-\d+)?", bunji):
+            bad.append(line.strip())
+            continue
+        key = (vworld_api.region_key(sido, sigungu), dong, bunji)
+        if key in seen:
+            continue
+        seen.add(key)
+        lots.append({"region": key[0], "dong": dong, "bunji": bunji})
+    return lots, bad
+
+def _lot_lawd_cd(lot: dict):
+    """지번의 LAWD_CD: 후보 인덱스의 PNU 앞 5자리, 없으면 법정동코드 표."""
+    pnu = lot_index.get_index(lot["region"]).pnu(lot["dong"], lot["bunji"])
+    if pnu and len(pnu) >= 5:
+        return pnu[:5]
+    return law_code_helper.REGION_CODES.get(lot["region"])
+
+def fetch_molit_trades_by_lots(lots, months_back: int = 12, property_type: str = "연립다세대", resync_empty: bool = False):
+    """여러 지번 일괄 조회. (LAWD_CD, 월)마다 한 번만 받아 창고에 넣고, 지번별로 나눠 '대상' 컬럼을 붙여 합칩니다.
+    반환: (df, err, 지번별 오류 dict)"""
+    yms = _recent_yms(months_back)
+    lot_errors = {}
+    by_lawd = {}
+    for lot in lots:
+        label = f"{lot['region']} {lot['dong']} {lot['bunji']}"
+        lawd_cd = _lot_lawd_cd(lot)
+        if not lawd_cd:
+            lot_errors[label] = "시군구 코드를 찾지 못했습니다."
+            continue
+        by_lawd.setdefault(lawd_cd, []).append((label, lot))
+
+    cache_stats = {"hit": 0, "miss": 0}
+    month_errors = {}
+    frames = []
+    for lawd_cd, items in by_lawd.items():
+        report = _sync_lawd(lawd_cd, property_type, yms, cache_stats, resync_empty)
+        for ym, err in report["errors"].items():
+            month_errors[f"{lawd_cd}:{ym}"] = err
+        for label, lot in items:
+            df = trade_warehouse.query_lot(lawd_cd, property_type, lot["dong"], lot["bunji"], yms)
+            if df.empty:
+                lot_errors.setdefault(label, "거래 없음")
+                continue
+            df.insert(0, "대상", label)
+            frames.append(df)
+
+    if not frames:
+        first_err = next(iter(month_errors.values()), None)
+        return pd.DataFrame(), (first_err or "실거래 데이터를 찾지 못했습니다."), lot_errors
+    out = pd.concat(frames, ignore_index=True)
+    out.attrs["month_errors"] = month_errors
+    out.attrs["cache_stats"] = cache_stats
+    out.attrs["lawd_count"] = len(by_lawd)
+    return out, None, lot_errors
+
+
+def query_cases(search: str = "", cursor=None, limit: int = 20):
+    """분석 리스트 1페이지(키셋, 사건번호/주소 검색). 반환: (cases, next_cursor)"""
+    where, params = [], []
+    q = (search or "").strip()
+    if q:
+        clause, clause_params = storage.search_where("cases_fts", ("case_no", "address"), q)
+        where.append(clause)
+        params.extend(clause_params)
+    rows, next_cursor = storage.keyset_page(
+        """SELECT created_ts, rowid, id, created_at, case_no, address, status, auction_date,
+                  verdict, loss0_max_bid, recommended_bid
+           FROM cases""",
+        where, params, cursor, limit,
+    )
     out = []
-    for rowid, rid, created_at, case_no, address, status, auction_date, outputs_json in rows:
-        o = {}
-        try:
-            o = json.loads(outputs_json) if outputs_json else {}
-        except Exception:
-            o = {}
+    for _ts, rowid, rid, created_at, case_no, address, status, auction_date, verdict, loss0_max_bid, recommended_bid in rows:
         out.append({
             "rowid": rowid,
             "id": rid, "created_at": created_at, "case_no": case_no, "address": address, "status": status,
             "auction_date": auction_date,
-            "loss0_max_bid": o.get("loss0_max_bid"),
-            "recommended_bid": o.get("recommended_bid"),
+            "verdict": verdict,
+            "loss0_max_bid": loss0_max_bid,
+            "recommended_bid": recommended_bid,
         })
-    return out
+    return out, next_cursor
 
 def get_case(case_id: str):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute("""SELECT id, created_at, created_by, status, case_no, address, property_type, area_m2, appraisal, min_price, auction_date, links, inputs_json, outputs_json, report_md
+    row = storage.fetch_one("""SELECT id, created_at, created_by, status, case_no, address, property_type, area_m2, appraisal, min_price, auction_date, links, inputs_json, outputs_json, report_md
                    FROM cases WHERE id=?""", (case_id,))
-    row = cur.fetchone()
-    con.close()
     if not row:
         return None
     (rid, created_at, created_by, status, case_no, address, property_type, area_m2, appraisal, min_price, auction_date, links, inputs_json, outputs_json, report_md) = row
@@ -857,12 +430,13 @@ def get_case(case_id: str):
     }
 
 def save_tx_run(run: dict):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute(
+    """rows(DataFrame 또는 레코드 목록)는 원시 숫자 타입 그대로 압축 컬럼 블롭으로 저장합니다."""
+    rows = run.get("rows")
+    frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows or [])
+    storage.execute(
         """
-        INSERT INTO tx_runs(id, created_at, created_by, title, query, rows_json)
-        VALUES(?,?,?,?,?,?)
+        INSERT INTO tx_runs(id, created_at, created_by, title, query, rows_json, created_ts, row_count, rows_blob)
+        VALUES(?,?,?,?,?,NULL,?,?,?)
         """,
         (
             run["id"],
@@ -870,59 +444,77 @@ def save_tx_run(run: dict):
             run.get("created_by"),
             run.get("title") or "",
             run.get("query") or "",
-            json.dumps(run.get("rows") or [], ensure_ascii=False),
+            storage.to_epoch(run["created_at"]),
+            int(len(frame)),
+            columnar.encode_frame(frame),
         ),
     )
-    con.commit()
-    con.close()
-
-def list_tx_runs():
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute("""SELECT rowid, id, created_at, title, query, rows_json FROM tx_runs ORDER BY rowid DESC""")
-    rows = cur.fetchall()
-    con.close()
-    out = []
-    for rowid, rid, created_at, title, query, rows_json in rows:
-        rr = []
-        try:
-            rr = json.loads(rows_json) if rows_json else []
-        except Exception:
-            rr = []
-        out.append(
-            {
-                "rowid": rowid,
-                "id": rid,
-                "created_at": created_at,
-                "title": title or "-",
-                "query": query or "",
-                "count": len(rr),
-            }
-        )
-    return out
 
-def get_tx_run(run_id: str):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute("""SELECT id, created_at, created_by, title, query, rows_json FROM tx_runs WHERE id=?""", (run_id,))
-    row = cur.fetchone()
-    con.close()
+def _tx_run_summary(rowid, rid, created_at, title, query, row_count):
+    return {
+        "rowid": rowid,
+        "id": rid,
+        "created_at": created_at,
+        "title": title or "-",
+        "query": query or "",
+        "count": int(row_count or 0),
+    }
+
+def query_tx_runs(search: str = "", cursor=None, limit: int = 20):
+    """실거래 리스트 1페이지(키셋). 반환: (runs, next_cursor)"""
+    where, params = [], []
+    q = (search or "").strip()
+    if q:
+        clause, clause_params = storage.search_where("tx_runs_fts", ("title", "query"), q)
+        where.append(clause)
+        params.extend(clause_params)
+    rows, next_cursor = storage.keyset_page(
+        """SELECT created_ts, rowid, id, created_at, title, query, row_count FROM tx_runs""",
+        where, params, cursor, limit,
+    )
+    return [_tx_run_summary(*r[1:]) for r in rows], next_cursor
+
+def get_tx_run(run_id: str, columns=None):
+    """저장된 실거래 조회 1건. frame은 columns를 주면 해당 컬럼만 읽습니다."""
+    row = storage.fetch_one("""SELECT id, created_at, created_by, title, query, rows_blob, rows_json FROM tx_runs WHERE id=?""", (run_id,))
     if not row:
         return None
-    rid, created_at, created_by, title, query, rows_json = row
+    rid, created_at, created_by, title, query, rows_blob, rows_json = row
     try:
-        rows = json.loads(rows_json) if rows_json else []
+        if rows_blob:
+            frame = columnar.decode_frame(rows_blob, columns=columns)
+        else:
+            frame = pd.DataFrame(json.loads(rows_json) if rows_json else [])
     except Exception:
-        rows = []
+        frame = pd.DataFrame()
     return {
         "id": rid,
         "created_at": created_at,
         "created_by": created_by,
         "title": title or "-",
         "query": query or "",
-        "rows": rows,
+        "frame": frame,
     }
 
+def format_trade_view(df: pd.DataFrame) -> pd.DataFrame:
+    """실거래 표 화면 표시용 포맷(저장은 원시 숫자로 하고, 표시 직전에만 문자열로 변환)."""
+    out = df.copy()
+
+    def _fmt(v, fn):
+        if pd.isna(v) or str(v).strip() in ("", "nan"):
+            return v
+        try:
+            return fn(v)
+        except Exception:
+            return v
+
+    if "전용면적(㎡)" in out.columns:
+        out["전용면적(㎡)"] = out["전용면적(㎡)"].map(lambda v: _fmt(v, lambda x: f"{float(x):.2f}"))
+    for col in ["거래금액", "면적단가"]:
+        if col in out.columns:
+            out[col] = out[col].map(lambda v: _fmt(v, lambda x: f"{int(x):,}"))
+    return out
+
 def now_local_str():
     return datetime.now(LOCAL_TZ).strftime("%Y-%m-%d %H:%M:%S")
 
@@ -943,14 +535,6 @@ def format_created_at_local(v):
     except Exception:
         return s.replace("T", " ").replace("Z", "")[:19]
 
-def fmt_money(v):
-    if v is None or v == "":
-        return "-"
-    try:
-        return f"{int(v):,}원"
-    except Exception:
-        return str(v)
-
 def fmt_area(v):
     if v is None or v == "":
         return "-"
@@ -1039,183 +623,33 @@ def extract_latlon_from_link(url: str):
     return None
 
 
-def clean_extracted_snippet(s: str) -> str:
-    """PDF에서 추출한 텍스트(참고용)를 보기 좋게 정리합니다."""
-    if not s:
-        return ""
-    t = s
-    # 공백/탭 정리
-    t = re.sub(r"[\t\r]", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
-
-    # 주소/지명 중복 정리(참고용)
-    t = normalize_address(t)
-
-    # 자주 반복되는 헤더 토큰 축약(옥션원)
-    # 예: '매각물건현황매각물건현황...' → 1회
-    for token in ["매각물건현황", "임차인현황", "등기부현황", "매각사례분석"]:
-        t = re.sub(rf"(?:{token}){{2,}}", token, t)
-
-    # 일반 반복 토큰 축약(길길길길, 층층층층 등)
-    t = re.sub(r"([가-힣0-9]{1,8})\1{1,}", r"\1", t)
-
-    # 가독성 위해 주요 라벨 앞에 줄바꿈 삽입
-    for label in ["사건번호", "소 재 지", "새 주 소", "감 정 가", "최 저 가", "매각기일", "말소기준권리", "관련사건"]:
-        t = t.replace(label, f"\n{label}")
-    t = re.sub(r"\n+", "\n", t).strip()
-
-    # 너무 길면 앞부분만
-    if len(t) > 700:
-        t = t[:700] + "\n…(생략)"
-    return t
-
-def normalize_address(addr: str) -> str:
-    """옥션원 PDF 텍스트 추출로 생기는 중복 토큰을 최대한 정리합니다."""
-    if not addr:
-        return ""
-    a = addr
-    a = re.sub(r"[\t\r\n]", " ", a)
-    a = re.sub(r"\s+", " ", a).strip()
-
-    # 토큰 내부 반복(중랑구중랑구, 비동비동, 5층층층 등)
-    a = re.sub(r"([가-힣0-9]{1,8})\1{1,}", r"\1", a)
-
-    # 쉼표/특수기호를 공백으로 통일 후 단어 단위 중복 제거
-    tmp = re.sub(r"[，,]", " ", a)
-    tmp = re.sub(r"\s+", " ", tmp).strip()
-    parts = tmp.split(" ")
-    cleaned = []
-    prev = None
-    for p in parts:
-        if not p:
-            continue
-        # 또 한번 내부 반복 축약
-        p2 = re.sub(r"([가-힣0-9]{1,8})\1{1,}", r"\1", p)
-        if p2 == prev:
-            continue
-        cleaned.append(p2)
-        prev = p2
-
-    a2 = " ".join(cleaned)
-    # 흔한 반복 토큰 추가 정리(필요 시)
-    for token in ["서울특별시", "중랑구", "묵동", "현진월드빌", "비동", "동", "층", "호"]:
-        a2 = re.sub(rf"(?:{re.escape(token)})\s+(?:{re.escape(token)})", token, a2)
-
-    return a2.strip()
+LIST_PAGE_SIZE = 20
+AREA_TABLE_MAX = 100
 
+def _list_cursor(state_key: str, search: str):
+    """키셋 페이지 커서 스택(검색어가 바뀌면 첫 페이지로 초기화)."""
+    if st.session_state.get(f"{state_key}_q") != search:
+        st.session_state[f"{state_key}_q"] = search
+        st.session_state[f"{state_key}_cursors"] = [None]
+    stack = st.session_state.setdefault(f"{state_key}_cursors", [None])
+    return stack[-1], len(stack)
 
-def generate_report_stub(subject: dict, sale_range: dict, outputs: dict, assumptions: dict) -> str:
-    """OpenAI API 없이도 '실전형'으로 보이도록 보고서를 구성합니다.
-    - 매도가능가(하/중/상) 산정 근거를 표(마크다운 테이블)로 설명
-    - 한줄 결론(진행/보류/비추천)을 자동으로 제시
-    """
-    case_no = subject.get("case_no") or "미추출/수정필요"
-    address = subject.get("address") or "미추출/수정필요"
-    area = subject.get("area_m2")
-    appraisal = subject.get("appraisal")
-    min_price = subject.get("min_price")
-    auction_date = subject.get("auction_date") or "-"
-    base_right = subject.get("base_right") or "-"
-
-    occ = subject.get("occupancy_hint") or "-"
-    special = subject.get("special_hint") or "-"
-    rights_summary = subject.get("rights_summary") or "-"
-
-    loss0 = outputs.get("loss0_max_bid")
-    rec = outputs.get("recommended_bid") or "-"
-    loan_amount = outputs.get("loan_amount")
-
-    stats = (sale_range or {}).get("stats") or {}
-    delta_used = stats.get("delta_used")
-    n = stats.get("n") or ((sale_range or {}).get("n") if isinstance(sale_range, dict) else None)
-    outlier_flag = "적용" if stats.get("outlier_filtered") else "미적용"
-
-    # --- 한줄 결론(보수적) ---
-    verdict = "보류"
-    verdict_reason = []
-    if not min_price or int(min_price) <= 0:
-        verdict = "보류"
-        verdict_reason.append("최저가 확인 필요(0원/미추출)")
-    else:
-        if loss0 and int(loss0) >= int(min_price):
-            verdict = "진행 가능(조건부)"
-            verdict_reason.append("손실0 상한이 최저가 이상")
-        else:
-            verdict = "보류/비추천"
-            verdict_reason.append("손실0 상한이 최저가 미만")
-
-        if "제시외" in str(special):
-            verdict_reason.append("제시외 건물 리스크")
-        if "중복" in str(special):
-            verdict_reason.append("중복사건 상태 재확인")
-
-    low = (sale_range or {}).get("low")
-    mid = (sale_range or {}).get("mid")
-    high = (sale_range or {}).get("high")
-
-    rationale_table = """| 항목 | 값 | 의미 |
-|---|---:|---|
-"""
-    rationale_table += f"| 유사면적 기준 | ±{int(delta_used) if delta_used else '-'}㎡ | 대상면적(전용)과 비슷한 거래만 사용 |\n"
-    rationale_table += f"| 표본 수(n) | {n if n else '-'} | 표본이 많을수록 신뢰도 ↑ |\n"
-    rationale_table += f"| 하단(25%) | {fmt_money(low)} | **빠른 매도**를 노릴 때 기준 |\n"
-    rationale_table += f"| 기준(50%) | {fmt_money(mid)} | **현실 매도**의 중심값(중앙값) |\n"
-    rationale_table += f"| 상단(75%) | {fmt_money(high)} | 상품화/시간여유가 있을 때 상단 목표 |\n"
-    rationale_table += f"| 이상치 필터 | {outlier_flag} | 중앙값 대비 과도한 값은 제거(왜곡 방지) |\n"
-
-    lines = []
-    lines.append(f"# 경매 분석 리포트(자동 · 실전형)")
-    lines.append("")
-    # ✅ 요약 3줄(맨 위)
-    lines.append(f"- **결론:** {verdict}")
-    lines.append(f"- **추천 입찰가:** {rec}")
-    lines.append(f"- **핵심 리스크:** {special if special!='-' else '특이사항 힌트 없음'} / {occ if occ!='-' else '점유 힌트 없음'}")
-    lines.append("")
-    lines.append(f"## 결론: **{verdict}**")
-    if verdict_reason:
-        lines.append(f"- 사유: {' / '.join(verdict_reason)}")
-    lines.append("")
-
-    lines.append("## 1) 물건 요약")
-    lines.append(f"- 사건번호: **{case_no}**")
-    if subject.get("related_case"):
-        lines.append(f"- 관련사건(중복): {subject.get('related_case')}")
-    lines.append(f"- 주소: **{address}**")
-    lines.append(f"- 전용면적: **{area if area is not None else '-'} ㎡**")
-    lines.append(f"- 감정가/최저가: **{fmt_money(appraisal)} / {fmt_money(min_price)}**")
-    lines.append(f"- 매각기일: **{auction_date}**")
-    lines.append(f"- 말소기준: **{base_right}**")
-    lines.append("")
-
-    lines.append("## 2) 권리/명도/특이사항 요약")
-    lines.append(f"- 점유 힌트: **{occ}**")
-    lines.append(f"- 특이사항 힌트: **{special}**")
-    lines.append(f"- 등기 요약: **{rights_summary}**")
-    lines.append("")
-
-    lines.append("## 3) 매도가능가(실거래 기반) — 근거")
-    lines.append(rationale_table)
-    lines.append("")
-    lines.append("## 4) 손실0 기준 요약(손실 금지 + 6개월 회전)")
-    lines.append(f"- 손실0 상한(기준 매도가 기준): **{fmt_money(loss0)}**")
-    lines.append(f"- 추천 입찰가(확률형): **{rec}**")
-    lines.append(f"- 대출(감정가 60% 가정): **{fmt_money(loan_amount)}**")
-    lines.append("")
-    lines.append("## 5) 입찰 전 체크리스트(필수)")
-    lines.append("- 매각물건명세서/현황조사서 최종 확인(임차인/점유/특별매각조건)")
-    lines.append("- 등기부 최신본 재발급(입찰 직전)")
-    lines.append("- 전입세대 열람/확정일자(숨은 점유자/임차)")
-    lines.append("- 제시외/불법 증·개축 여부 현장 확인")
-    lines.append("- 관리비/체납/공과금 확인")
-    return "\n".join(lines)
+def _list_pager(state_key: str, next_cursor):
+    stack = st.session_state.setdefault(f"{state_key}_cursors", [None])
+    c_prev, c_page, c_next = st.columns([1, 4, 1])
+    if c_prev.button("◀ 이전", key=f"{state_key}_prev", disabled=len(stack) <= 1):
+        stack.pop()
+        st.rerun()
+    c_page.caption(f"{len(stack)} 페이지")
+    if c_next.button("다음 ▶", key=f"{state_key}_next", disabled=next_cursor is None):
+        stack.append(next_cursor)
+        st.rerun()
 
 def main():
     st.set_page_config(page_title="부부 전용 경매 분석", layout="wide")
     init_db()
-    settings = get_settings()
-    cleanup_uploads(settings["delete_after_days"])
-    cleanup_old_cases(settings["case_keep_days"])
-    cleanup_old_tx_runs(30)
+    # 보관기간 정리는 백그라운드 스레드가 주기적으로 수행(리런 경로에서 제외)
+    retention.start_background_sweeper(get_settings())
 
     require_login()
 
@@ -1387,6 +821,14 @@ def main():
     st.sidebar.title("🏠 경매 분석기")
     st.sidebar.caption(f"BUILD: {BUILD_ID}")
     st.sidebar.caption(f"RUNFILE: {Path(__file__).name}")
+    swept = retention.last_swept()
+    if swept:
+        rep = swept.get("report") or {}
+        swept_at = datetime.fromtimestamp(float(swept.get("at") or 0), LOCAL_TZ).strftime("%m-%d %H:%M")
+        st.sidebar.caption(
+            f"정리: {swept_at} · 분석 {rep.get('cases', 0)} / 실거래 {rep.get('tx_runs', 0)} / "
+            f"업로드 {rep.get('uploads', 0)} / 파일 {rep.get('files', 0)} ({rep.get('elapsed_ms', '-')}ms)"
+        )
     page = st.sidebar.radio("메뉴", ["새 분석", "분석 리스트", "실거래 조회", "실거래 리스트"], key="menu_radio")
 
     
@@ -1409,15 +851,20 @@ def main():
             if c_refresh.button("🔄 새로고침"):
                 st.rerun()
             c_hint.caption("※ 사건번호를 클릭하면 해당 분석 결과로 이동합니다.")
+            case_q = st.text_input("리스트 찾기(사건번호/주소)", value="", key="case_list_search").strip()
 
             try:
-                cases = list_cases()
+                cursor, page_no = _list_cursor("case_list", case_q)
+                cases, next_cursor = query_cases(case_q, cursor, LIST_PAGE_SIZE)
             except Exception as e:
                 st.error(f"리스트 로드 오류: {e}")
                 return
 
+            if not cases and page_no > 1:
+                st.session_state["case_list_cursors"] = [None]
+                st.rerun()
             if not cases:
-                st.info("저장된 분석이 없습니다.")
+                st.info("검색 결과가 없습니다." if case_q else "저장된 분석이 없습니다.")
                 return
 
             df = pd.DataFrame(cases)
@@ -1458,6 +905,7 @@ def main():
                 row[4].write(r["추천입찰가"])
 
             st.divider()
+            _list_pager("case_list", next_cursor)
             return
 
     if page == "실거래 조회":
@@ -1487,39 +935,59 @@ def main():
             property_type = s1.selectbox("건물 유형", ["아파트", "연립다세대(빌라)"], index=0, key="tx_api_property_type")
             sido = s2.selectbox("시/도", ["서울특별시", "경기도"], index=0, key="tx_api_sido")
             months_back = s3.number_input("조회 개월수", min_value=1, max_value=36, value=12, step=1, key="tx_api_months")
+            resync_empty = st.checkbox(
+                "0건으로 저장된 달 다시 받기", value=False, key="tx_api_resync_empty",
+                help="창고에 거래 0건으로 기록된 달을 캐시 없이 다시 조회합니다(API 한도 초과 등으로 비어 저장된 달 복구).",
+            )
 
             gugun_options = SIDO_GUGUN_OPTIONS.get(sido, [])
             sigungu = st.selectbox("구/군", gugun_options, index=0 if gugun_options else None, key="tx_api_sigungu")
 
-            if st.button("1) 동/번지 후보 불러오기", key="tx_api_load_lot"):
+            region = vworld_api.region_key(sido, sigungu or "")
+            b1, b2 = st.columns([1.2, 1.0])
+            load_clicked = b1.button("1) 동/번지 후보 불러오기", key="tx_api_load_lot")
+            refresh = b2.checkbox("후보 새로 받기", value=False, key="tx_api_lot_refresh", help="저장된 후보 인덱스를 무시하고 VWORLD에서 다시 받습니다.")
+            if load_clicked:
                 if not str(sido).strip() or not str(sigungu).strip():
                     st.warning("시/도와 시/군/구를 입력하세요.")
                 else:
-                    cand, err = fetch_vworld_lot_candidates(str(sido).strip(), str(sigungu).strip())
+                    bar = st.progress(0.0, text="VWORLD 후보 불러오는 중…")
+
+                    def _on_page(done, total):
+                        bar.progress(min(1.0, done / max(1, total)), text=f"VWORLD 후보 불러오는 중… {done}/{total} 페이지")
+
+                    n_cand, err, from_index = fetch_vworld_lot_candidates(
+                        str(sido).strip(), str(sigungu).strip(), force=refresh, progress=_on_page,
+                    )
+                    bar.empty()
                     if err:
                         st.error(err)
                     else:
-                        st.session_state["tx_api_candidates"] = cand
-                        st.success(f"후보 {len(cand)}건 로드")
-
-            cands = st.session_state.get("tx_api_candidates") or []
-            if cands:
-                dongs = sorted({c["dong"] for c in cands})
-                sel_dong = st.selectbox("동 선택", dongs, key="tx_api_sel_dong")
-                bunjis = sorted({c["bunji"] for c in cands if c["dong"] == sel_dong})
+                        st.success(f"후보 {n_cand}건 " + ("(저장된 인덱스)" if from_index else "로드"))
+
+            # 동/번지 목록은 parcels 인덱스에서 바로 읽음(한 번 받은 시군구는 버튼 없이 즉시 표시)
+            lot_idx = lot_index.get_index(region) if sigungu else None
+            if lot_idx is not None and lot_idx.dongs:
+                sel_dong = st.selectbox("동 선택", lot_idx.dongs, key="tx_api_sel_dong")
+                bunji_prefix = st.text_input("번지 검색(앞자리)", value="", key="tx_api_bunji_prefix", placeholder="예: 12")
+                bunjis = lot_idx.search(sel_dong, bunji_prefix)
+                if not bunjis:
+                    st.info("해당 앞자리로 시작하는 번지가 없습니다.")
+                    bunjis = lot_idx.bunjis(sel_dong)
                 sel_bunji = st.selectbox("번지 선택", bunjis, key="tx_api_sel_bunji")
 
                 if st.button("2) 실거래 조회 실행", key="tx_api_fetch_trades"):
-                    pick = next((c for c in cands if c["dong"] == sel_dong and c["bunji"] == sel_bunji), None)
-                    if not pick:
+                    pick_pnu = lot_idx.pnu(sel_dong, sel_bunji)
+                    if not pick_pnu:
                         st.error("선택한 동/번지 후보를 찾지 못했습니다.")
                     else:
                         df_api, err = fetch_molit_trades_by_lot(
-                            pnu=pick.get("pnu"),
+                            pnu=pick_pnu,
                             dong=sel_dong,
                             bunji=sel_bunji,
                             months_back=int(months_back),
                             property_type=("아파트" if property_type == "아파트" else "연립다세대"),
+                            resync_empty=resync_empty,
                         )
                         if err:
                             st.error(err)
@@ -1527,15 +995,53 @@ def main():
                             st.session_state["tx_api_view_df"] = df_api
                             st.session_state["tx_api_query"] = f"{sido} {sigungu} {sel_dong} {sel_bunji}"
                             st.success(f"조회 완료: {len(df_api)}건")
+                            cs = df_api.attrs.get("cache_stats") or {}
+                            st.caption(
+                                f"월별 캐시: 적중 {cs.get('hit', 0)} / 미적중 {cs.get('miss', 0)} "
+                                f"(프로세스 누적 {molit_api.CACHE_STATS['hit']} / {molit_api.CACHE_STATS['miss']})"
+                            )
+                            month_errors = df_api.attrs.get("month_errors") or {}
+                            if month_errors:
+                                st.warning(f"일부 월 조회 실패({len(month_errors)}개월): " + ", ".join(sorted(month_errors)))
+
+            with st.expander("여러 지번 일괄 조회", expanded=False):
+                st.caption("한 줄에 1지번: '동 번지'(위에서 선택한 시/구) 또는 '시/도 구/군 동 번지'. 시군구·월별 데이터는 한 번만 받아 지번별로 나눕니다.")
+                if lot_idx is not None and lot_idx.dongs and st.button("현재 선택 지번 추가", key="tx_api_batch_add"):
+                    cur = st.session_state.get("tx_api_batch_text", "").rstrip()
+                    st.session_state["tx_api_batch_text"] = (cur + "\n" if cur else "") + f"{sido} {sigungu} {sel_dong} {sel_bunji}"
+                batch_text = st.text_area("지번 목록", key="tx_api_batch_text", height=140)
+                if st.button("일괄 실거래 조회", key="tx_api_batch_fetch"):
+                    lots, bad_lines = parse_lot_lines(batch_text, sido, sigungu or "")
+                    if bad_lines:
+                        st.warning("인식하지 못한 줄: " + ", ".join(bad_lines[:10]))
+                    if not lots:
+                        st.error("조회할 지번이 없습니다.")
+                    else:
+                        df_api, err, lot_errors = fetch_molit_trades_by_lots(
+                            lots,
+                            months_back=int(months_back),
+                            property_type=("아파트" if property_type == "아파트" else "연립다세대"),
+                            resync_empty=resync_empty,
+                        )
+                        if lot_errors:
+                            st.warning("지번별 확인 필요: " + "; ".join(f"{k}({v})" for k, v in list(lot_errors.items())[:10]))
+                        if err:
+                            st.error(err)
+                        else:
+                            st.session_state["tx_api_view_df"] = df_api
+                            st.session_state["tx_api_query"] = f"일괄 {len(lots)}지번: " + ", ".join(f"{l['dong']} {l['bunji']}" for l in lots[:20])
+                            cs = df_api.attrs.get("cache_stats") or {}
+                            st.success(
+                                f"조회 완료: {len(df_api)}건 · 지번 {len(lots)}개 · 시군구 {df_api.attrs.get('lawd_count', 0)}개 "
+                                f"(월별 캐시 적중 {cs.get('hit', 0)} / 미적중 {cs.get('miss', 0)})"
+                            )
+                            month_errors = df_api.attrs.get("month_errors") or {}
+                            if month_errors:
+                                st.warning(f"일부 월 조회 실패({len(month_errors)}건): " + ", ".join(sorted(month_errors)))
 
             view_api = st.session_state.get("tx_api_view_df")
             if isinstance(view_api, pd.DataFrame):
-                df_show = view_api.copy()
-                if "전용면적(㎡)" in df_show.columns:
-                    df_show["전용면적(㎡)"] = df_show["전용면적(㎡)"].map(lambda v: f"{float(v):.2f}" if pd.notna(v) else v)
-                for cnum in ["거래금액", "면적단가"]:
-                    if cnum in df_show.columns:
-                        df_show[cnum] = df_show[cnum].map(lambda v: f"{int(v):,}" if pd.notna(v) and str(v).strip() not in ("", "nan") else v)
+                df_show = format_trade_view(view_api)
                 st.markdown("#### API 조회 결과")
                 st.markdown(df_show.to_html(index=False, classes=["aa-uniform-table"], border=0), unsafe_allow_html=True)
 
@@ -1548,7 +1054,7 @@ def main():
                         "created_by": st.session_state.get("user_email"),
                         "title": f"API 실거래 조회 {now_local_str()}",
                         "query": st.session_state.get("tx_api_query") or "",
-                        "rows": df_show.to_dict(orient="records"),
+                        "rows": view_api,
                     }
                     try:
                         save_tx_run(run)
@@ -1557,12 +1063,13 @@ def main():
                         st.error(f"저장 실패: {e}")
 
         with tab_excel:
-            tx_file = st.file_uploader("실거래 엑셀 업로드", type=["xlsx", "xls"], key="tx_only_uploader")
+            tx_file = st.file_uploader("실거래 엑셀/CSV 업로드", type=["xlsx", "xls", "csv"], key="tx_only_uploader")
             if tx_file is None:
                 st.info("실거래 엑셀 파일을 업로드하세요.")
             else:
                 try:
-                    tx_df = parse_comps_view_xlsx(tx_file.getvalue())
+                    tx_bytes = tx_file.getvalue()
+                    tx_df = parse_comps_view_xlsx(tx_bytes)
                 except Exception as e:
                     st.error(f"실거래 엑셀 파싱 실패: {e}")
                     return
@@ -1580,24 +1087,32 @@ def main():
                         if col in view.columns:
                             mask = mask | view[col].astype(str).str.contains(q, na=False)
                     view = view[mask]
+                searched = view
                 if area_target > 0 and "전용면적(㎡)" in view.columns:
-                    a = pd.to_numeric(view["전용면적(㎡)"], errors="coerce")
-                    view = view[a.between(area_target - 10.0, area_target + 10.0)]
+                    # 면적 정렬 인덱스로 ±10㎡ 구간(원래 행 순서 유지)
+                    view = view.iloc[area_index.AreaIndex(view["전용면적(㎡)"]).positions(area_target, 10.0)]
                 view = view.head(int(top_n))
 
-                fmt_map = {}
-                if "거래금액" in view.columns:
-                    fmt_map["거래금액"] = lambda v: f"{int(v):,}" if pd.notna(v) and str(v).strip() not in ("", "nan") else v
-                if "면적단가" in view.columns:
-                    fmt_map["면적단가"] = lambda v: f"{int(v):,}" if pd.notna(v) and str(v).strip() not in ("", "nan") else v
-                if "전용면적(㎡)" in view.columns:
-                    fmt_map["전용면적(㎡)"] = lambda v: f"{float(v):.2f}" if pd.notna(v) and str(v).strip() not in ("", "nan") else v
-                for col, fn in fmt_map.items():
-                    if col in view.columns:
-                        view[col] = view[col].map(lambda v: fn(v))
-
                 st.markdown("#### 엑셀 조회 결과")
-                st.markdown(view.to_html(index=False, classes=["aa-uniform-table"], border=0), unsafe_allow_html=True)
+                st.markdown(format_trade_view(view).to_html(index=False, classes=["aa-uniform-table"], border=0), unsafe_allow_html=True)
+
+                if "전용면적(㎡)" in searched.columns:
+                    with st.expander("면적별 매도가능가(검색 결과의 전용면적마다 ±3/±5㎡ 분위수)", expanded=False):
+                        try:
+                            est_idx = area_index.index_for(comps.estimator_frame(comps.load_comps(tx_bytes)))
+                        except ValueError as e:
+                            st.caption(str(e))
+                        else:
+                            sizes = sorted(set(pd.to_numeric(searched["전용면적(㎡)"], errors="coerce").dropna().round(2)))[:AREA_TABLE_MAX]
+                            ranges = est_idx.estimate_many(sizes)
+                            area_tbl = pd.DataFrame([{
+                                "전용면적(㎡)": f"{a:.2f}",
+                                "표본수": r.get("n") or 0,
+                                "하단(25%)": fmt_money(r.get("low")),
+                                "기준(50%)": fmt_money(r.get("mid")),
+                                "상단(75%)": fmt_money(r.get("high")),
+                            } for a, r in zip(sizes, ranges)])
+                            st.markdown(area_tbl.to_html(index=False, classes=["aa-uniform-table"], border=0), unsafe_allow_html=True)
 
                 if st.button("💾 엑셀 조회 저장(실거래 리스트 반영)", key="save_tx_run_btn"):
                     import uuid
@@ -1608,7 +1123,7 @@ def main():
                         "created_by": st.session_state.get("user_email"),
                         "title": f"실거래 조회 {now_local_str()}",
                         "query": q_text.strip(),
-                        "rows": view.to_dict(orient="records"),
+                        "rows": view,
                     }
                     try:
                         save_tx_run(run)
@@ -1621,38 +1136,24 @@ def main():
         st.title("🗂️ 실거래 리스트")
         st.caption("저장된 실거래 조회 이력을 확인할 수 있습니다. (30일 보관)")
 
+        q = st.text_input("리스트 찾기(검색어/제목)", value="", key="tx_list_search").strip()
         try:
-            runs = list_tx_runs()
+            cursor, page_no = _list_cursor("tx_list", q)
+            runs, next_cursor = query_tx_runs(q, cursor, LIST_PAGE_SIZE)
         except Exception as e:
             st.error(f"리스트 로드 오류: {e}")
             return
+        if not runs and page_no > 1:
+            st.session_state["tx_list_cursors"] = [None]
+            st.rerun()
         if not runs:
-            st.info("저장된 실거래 조회 이력이 없습니다.")
-            return
-
-        df_runs = pd.DataFrame(runs)
-        df_runs["저장일시"] = df_runs["created_at"].apply(format_created_at_local)
-        df_runs["검색어"] = df_runs["query"].fillna("")
-        df_runs["건수"] = df_runs["count"].fillna(0)
-
-        q = st.text_input("리스트 찾기(검색어/제목)", value="", key="tx_list_search")
-        if q.strip():
-            mask = (
-                df_runs["title"].astype(str).str.contains(q, na=False)
-                | df_runs["검색어"].astype(str).str.contains(q, na=False)
-            )
-            df_runs = df_runs[mask]
-        if df_runs.empty:
-            st.info("검색 결과가 없습니다.")
+            st.info("검색 결과가 없습니다." if q else "저장된 실거래 조회 이력이 없습니다.")
             return
 
-        page_size = 20
-        total = len(df_runs)
-        pages = max(1, (total + page_size - 1) // page_size)
-        p = st.number_input("페이지", min_value=1, max_value=pages, value=1, step=1, key="tx_list_page")
-        start = (int(p) - 1) * page_size
-        end = start + page_size
-        view = df_runs.iloc[start:end]
+        view = pd.DataFrame(runs)
+        view["저장일시"] = view["created_at"].apply(format_created_at_local)
+        view["검색어"] = view["query"].fillna("")
+        view["건수"] = view["count"].fillna(0)
 
         h = st.columns([1.8, 3.0, 1.0, 1.2])
         h[0].markdown("**저장일시**")
@@ -1669,6 +1170,7 @@ def main():
             if row[3].button("보기", key=f"open_tx_{r['id']}"):
                 st.session_state["open_tx_run_id"] = r["id"]
                 st.rerun()
+        _list_pager("tx_list", next_cursor)
 
         open_tx_id = st.session_state.get("open_tx_run_id")
         if open_tx_id:
@@ -1677,9 +1179,9 @@ def main():
                 st.markdown("---")
                 st.subheader(f"📄 {run.get('title')}")
                 st.caption(f"검색어: {run.get('query') or '-'}")
-                rows = run.get("rows") or []
-                if rows:
-                    df_show = pd.DataFrame(rows)
+                frame = run.get("frame")
+                if isinstance(frame, pd.DataFrame) and not frame.empty:
+                    df_show = format_trade_view(frame)
                     st.markdown(df_show.to_html(index=False, classes=["aa-uniform-table"], border=0), unsafe_allow_html=True)
                 else:
                     st.info("저장된 행 데이터가 없습니다.")
@@ -1687,10 +1189,91 @@ def main():
     st.title("🧾 새 경매 물건 분석")
     st.caption("PDF/실거래 엑셀을 올리고, 가정값을 조정한 뒤 [분석 실행]을 누르세요.")
 
+    with st.expander("📚 일괄 스크리닝(PDF 여러 개 / zip)", expanded=bool(st.session_state.get("bulk_results"))):
+        bulk_files = st.file_uploader("경매 물건 PDF 또는 zip(여러 개 선택 가능)", type=["pdf", "zip"], accept_multiple_files=True, key="bulk_uploader")
+        if st.button("일괄 파싱", key="bulk_parse_btn", disabled=not bulk_files):
+            try:
+                items = bulk_ingest.expand_uploads([(f.name, f.getvalue()) for f in bulk_files])
+            except Exception as e:
+                items = []
+                st.error(f"업로드 파일을 읽지 못했습니다: {e}")
+            if items:
+                bar = st.progress(0.0, text="PDF 파싱 중…")
+
+                def _on_file(done, total, name):
+                    bar.progress(min(1.0, done / max(1, total)), text=f"PDF 파싱 중… {done}/{total} · {name}")
+
+                results = bulk_ingest.ingest(
+                    items,
+                    max_workers=int(_secret_get(["bulk", "max_workers"], bulk_ingest.default_workers())),
+                    progress=_on_file,
+                )
+                bar.empty()
+                st.session_state["bulk_results"] = results
+                st.session_state["bulk_pdfs"] = {it["sha256"]: (it["name"], it["bytes"]) for it in items}
+                n_err = sum(1 for r in results if r.get("error"))
+                st.success(f"{len(results)}건 파싱 완료" + (f"(오류 {n_err}건)" if n_err else ""))
+
+        bulk_results = st.session_state.get("bulk_results") or []
+        if bulk_results:
+            screen_df = bulk_ingest.screening_frame(bulk_results)
+            st.dataframe(
+                screen_df[bulk_ingest.SCREEN_COLUMNS],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "감정가": st.column_config.NumberColumn(format="%d"),
+                    "최저가": st.column_config.NumberColumn(format="%d"),
+                },
+            )
+            ok_rows = [r for r in bulk_results if r.get("subject")]
+            if ok_rows:
+                pick_i = st.selectbox(
+                    "분석으로 넘길 물건",
+                    list(range(len(ok_rows))),
+                    format_func=lambda i: f"{ok_rows[i]['subject'].get('case_no') or '-'} · {ok_rows[i]['subject'].get('address') or ok_rows[i]['name']}",
+                    key="bulk_pick",
+                )
+                if st.button("이 물건으로 분석 진행", key="bulk_promote_btn"):
+                    st.session_state["bulk_promoted"] = ok_rows[pick_i]["sha256"]
+                    st.rerun()
+
+    promoted = (st.session_state.get("bulk_pdfs") or {}).get(st.session_state.get("bulk_promoted"))
+
     left, right = st.columns([1,1])
     with left:
-        auction_pdf = st.file_uploader("1) 경매 물건 PDF 업로드", type=["pdf"])
-        comps_xlsx = st.file_uploader("2) 실거래 엑셀 업로드", type=["xlsx","xls"])
+        auction_pdf_file = st.file_uploader("1) 경매 물건 PDF 업로드", type=["pdf"])
+        if auction_pdf_file is None and promoted:
+            pc1, pc2 = st.columns([3, 1])
+            pc1.info(f"일괄 스크리닝에서 선택: {promoted[0]}")
+            if pc2.button("선택 해제", key="bulk_promote_clear"):
+                st.session_state["bulk_promoted"] = None
+                st.rerun()
+        if auction_pdf_file is not None:
+            pdf_src = (auction_pdf_file.name, auction_pdf_file.getvalue())
+        else:
+            pdf_src = promoted
+        comps_source = st.radio("2) 실거래 표본", ["엑셀 업로드", "실거래 창고(동 단위)"], horizontal=True)
+        comps_xlsx = None
+        wh_pick = None
+        if comps_source == "엑셀 업로드":
+            comps_xlsx = st.file_uploader("실거래 엑셀/CSV 업로드", type=["xlsx", "xls", "csv"])
+        else:
+            districts = trade_warehouse.synced_districts()
+            if not districts:
+                st.info("동기화된 시군구가 없습니다. 실거래 조회(API)를 먼저 실행하면 해당 시군구가 창고에 저장됩니다.")
+            else:
+                code_names = {v: k for k, v in law_code_helper.REGION_CODES.items()}
+                d_idx = st.selectbox(
+                    "시군구",
+                    list(range(len(districts))),
+                    format_func=lambda i: f"{code_names.get(districts[i][0], districts[i][0])} · {districts[i][1]} ({districts[i][2]}개월, {int(districts[i][3] or 0):,}건)",
+                )
+                wh_lawd, wh_type = districts[d_idx][0], districts[d_idx][1]
+                dongs = trade_warehouse.list_dongs(wh_lawd, wh_type)
+                wh_dong = st.selectbox("법정동", dongs) if dongs else None
+                if wh_dong:
+                    wh_pick = (wh_lawd, wh_type, wh_dong)
         st.markdown("#### 3) 평면도 업로드(선택)")
         floorplan_img = st.file_uploader("평면도 파일 업로드", type=["png","jpg","jpeg"], help="드래그&드롭 가능")
         st.caption("맥 스크린샷(Shift+Cmd+4) 후 우측 하단 썸네일을 **이 업로드 영역으로 드래그&드롭**하면 매우 빠릅니다. (브라우저 보안상 Ctrl+V 붙여넣기 업로드는 기본 Streamlit만으로 안정적으로 지원되지 않습니다)")
@@ -1710,20 +1293,24 @@ def main():
         early_repay_fee_rate = st.number_input("중도상환수수료율(%)", min_value=0.0, max_value=10.0, value=1.2, step=0.1) / 100.0
         tax_rate = st.number_input("취득세 등율(%) 가정", min_value=0.0, max_value=10.0, value=1.1, step=0.1) / 100.0
         st.subheader("5) 시나리오 표 설정")
-        bid_step = st.selectbox("입찰가 간격", [1_000_000, 2_000_000, 5_000_000], index=0, format_func=lambda x: f"{x//10_000}만원")
+        bid_step = st.selectbox("입찰가 간격", [100_000, 500_000, 1_000_000, 2_000_000, 5_000_000], index=2, format_func=lambda x: f"{x//10_000}만원")
 
-    if st.button("📊 분석 실행", type="primary", disabled=(auction_pdf is None or comps_xlsx is None)):
+    if st.button("📊 분석 실행", type="primary", disabled=(pdf_src is None or (comps_xlsx is None and wh_pick is None))):
         import uuid
         case_id = str(uuid.uuid4())
         created_at = now_local_str()
         user_email = st.session_state.user_email
 
-        pdf_bytes = auction_pdf.getvalue()
-        xlsx_bytes = comps_xlsx.getvalue()
+        pdf_name, pdf_bytes = pdf_src
+        xlsx_bytes = comps_xlsx.getvalue() if comps_xlsx is not None else None
+        xlsx_name = comps_xlsx.name if comps_xlsx is not None else None
 
         subject = parse_auction_pdf(pdf_bytes)
-        comps = parse_comps_xlsx(xlsx_bytes)
-        sale_range = estimate_sale_price_range(comps, subject.get("area_m2"))
+        if wh_pick is not None and xlsx_bytes is None:
+            # 이전 버전에서 동기화해 집계가 없는 월만 가격지수로 채움(최신이면 조회 1번)
+            price_index.refresh(wh_pick[0], wh_pick[1])
+        comps_df, comps_view_df = load_comps_for_area(xlsx_bytes, xlsx_name, wh_pick, subject.get("area_m2"))
+        sale_range = estimate_sale_price_range(comps_df, subject.get("area_m2"), market=wh_pick)
 
         st.session_state["pending"] = {
             "case_id": case_id,
@@ -1743,8 +1330,11 @@ def main():
             },
             "pdf_bytes": pdf_bytes,
             "xlsx_bytes": xlsx_bytes,
-            "pdf_name": auction_pdf.name,
-            "xlsx_name": comps_xlsx.name,
+            "pdf_name": pdf_name,
+            "xlsx_name": xlsx_name,
+            "comps_view_df": comps_view_df,
+            "comps_area": subject.get("area_m2"),
+            "market": wh_pick,
             "floorplan_name": floorplan_name,
             "floorplan_bytes": floorplan_bytes,
         }
@@ -1765,14 +1355,26 @@ def main():
             address = st.text_input("주소", value=subj.get("address") or "")
             property_type = st.text_input("물건종별(예: 빌라/아파트)", value="빌라")
             area_m2 = st.number_input("전용면적(㎡)", value=float(subj.get("area_m2") or 0.0), min_value=0.0, step=0.01)
+            subject_floor = st.number_input("층(보정용, 0=모름)", value=int(valuation.floor_from_address(subj.get("address")) or 0), min_value=0, max_value=99, step=1)
+            build_year = st.number_input("건축년도(보정용, 0=모름)", value=0, min_value=0, max_value=2100, step=1)
         with col2:
             appraisal = st.number_input("감정가(원)", value=int(subj.get("appraisal") or 0), min_value=0, step=100_000)
             min_price = st.number_input("최저가(원)", value=int(subj.get("min_price") or 0), min_value=0, step=100_000)
             auction_date = st.text_input("매각기일(YYYY.MM.DD)", value=subj.get("auction_date") or "")
             base_right = st.text_input("말소기준(있으면)", value=subj.get("base_right") or "")
 
+        comps_area = pending.get("comps_area")
+        area_changed = bool(area_m2) and (not comps_area or abs(float(area_m2) - float(comps_area)) > 1e-6)
+        comps_area_label = f"{fmt_area(comps_area)}㎡" if comps_area else "미추출"
+        if not area_m2:
+            st.warning("전용면적이 없어 유사면적 실거래 표본을 고를 수 없습니다. 면적을 입력해주세요.")
+        elif area_changed:
+            st.info(f"실거래 표본을 PDF 면적({comps_area_label}) 대신 {fmt_area(area_m2)}㎡ 기준으로 최종 생성 시 다시 읽습니다.")
+        elif (pending.get("sale_range") or {}).get("mid") is None:
+            st.warning(f"PDF 면적({comps_area_label}) 기준 유사면적 실거래가 없습니다: {(pending.get('sale_range') or {}).get('note') or ''} 면적이 맞는지 확인해주세요.")
+
         st.caption("PDF에서 자동 추출한 텍스트 일부(참고)")
-        st.code(clean_extracted_snippet(subj.get("raw_text_snippet") or ""), language="text")
+        st.code(auction_pdf.clean_extracted_snippet(subj.get("raw_text_snippet") or ""), language="text")
 
         if st.button("🚀 최종 분석 생성", type="primary"):
             import uuid
@@ -1780,172 +1382,55 @@ def main():
             case_id = str(uuid.uuid4())
             finalized_at = now_local_str()
 
+            reviewed = {
+                "case_no": case_no, "address": address, "property_type": property_type, "area_m2": area_m2,
+                "appraisal": appraisal, "min_price": min_price, "auction_date": auction_date, "base_right": base_right,
+                "floor": int(subject_floor) or None, "build_year": int(build_year) or None,
+            }
+            sale_range = pending["sale_range"]
+            # 실거래 표(원본) 샘플을 함께 저장(보기 좋게 출력용)
+            comps_raw = pending.get("comps_view_df")
+            if area_changed:
+                # 검수에서 고친 면적 기준으로 표본/매도가능가를 다시 산정(스트리밍 구간도 새 면적 중심)
+                comps_df, comps_raw = load_comps_for_area(
+                    pending.get("xlsx_bytes"), pending.get("xlsx_name"), pending.get("market"), area_m2
+                )
+                sale_range = estimate_sale_price_range(comps_df, area_m2, market=pending.get("market"))
+            if comps_raw is None and pending.get("xlsx_bytes") is not None:
+                comps_raw = comps.load_comps(pending["xlsx_bytes"])
+            try:
+                outputs, assumptions, report_md = finalize_analysis(
+                    subj, reviewed, sale_range, pending["assumptions"], comps_raw,
+                    market=pending.get("market"),
+                )
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+
             # 업로드 저장(7일 후 자동 삭제)
             class UF:
                 def __init__(self, name, buf): self.name=name; self._buf=buf
                 def getbuffer(self): return self._buf
             pdf_path = save_upload(case_id, "auction_pdf", UF(pending["pdf_name"], pending["pdf_bytes"]))
-            xlsx_path = save_upload(case_id, "comps_xlsx", UF(pending["xlsx_name"], pending["xlsx_bytes"]))
+            if pending.get("xlsx_bytes") is not None:
+                save_upload(case_id, "comps_xlsx", UF(pending["xlsx_name"], pending["xlsx_bytes"]))
 
-            
             # 평면도 이미지(선택) 저장
             if pending.get("floorplan_bytes") and pending.get("floorplan_name"):
                 floorplan_path = save_upload(case_id, "floorplan_img", UF(pending["floorplan_name"], pending["floorplan_bytes"]))
             else:
                 floorplan_path = None
-            loan_amount = int(appraisal * 0.60)
-            sr = pending["sale_range"].copy()
-
-            # 실거래 표(원본) 샘플을 함께 저장(보기 좋게 출력용)
-            comps_raw = pd.read_excel(io.BytesIO(pending["xlsx_bytes"]))
-            # 유사면적 ±10㎡ 필터
-            try:
-                sa = float(area_m2) if area_m2 else None
-            except Exception:
-                sa = None
-            comps_view = comps_raw.copy()
-            if sa is not None and "전용면적(㎡)" in comps_view.columns:
-                comps_view = comps_view[pd.to_numeric(comps_view["전용면적(㎡)"], errors="coerce").between(sa-10, sa+10)]
-            if "층" in comps_view.columns:
-                _floor_num = pd.to_numeric(comps_view["층"], errors="coerce")
-                comps_view = comps_view[_floor_num.ne(-1) | _floor_num.isna()]
-            keep_cols = [c for c in ["계약년월","시군구","번지","건물명","전용면적(㎡)","거래금액","면적단가","층","건축년도"] if c in comps_view.columns]
-            comps_view = comps_view[keep_cols].head(30)
-
-            if sr.get("low") is None:
-                st.error("실거래 엑셀에서 유사표본 매도가능가를 산출하지 못했습니다. 엑셀 컬럼을 확인해주세요.")
-                st.stop()
-
-            sale_prices = [int(sr["low"]), int(sr["mid"]), int(sr["high"])]
-            bid_start = int(min_price) if int(min_price) > 0 else int(appraisal * 0.80)
-            bid_end = (bid_start + 40_000_000) if int(min_price) <= 0 else int(min_price + 40_000_000)
-            bid_step = int(pending["assumptions"]["bid_step"])
-
-            df_matrix, cost_info = build_profit_matrix(
-                sale_prices, bid_start, bid_end, bid_step,
-                float(pending["assumptions"]["tax_rate"]),
-                loan_amount,
-                float(pending["assumptions"]["interest_rate"]),
-                int(pending["assumptions"]["holding_days"]),
-                float(pending["assumptions"]["early_repay_fee_rate"]),
-                int(pending["assumptions"]["repair_cost"]),
-                int(pending["assumptions"]["eviction_cost"]),
-            )
 
-            mid_col = f"매도가 {sale_prices[1]/100_000_000:.2f}억"
-            loss0_max_bid = None
-            ok = df_matrix[df_matrix[mid_col] >= 0]
-            if len(ok) > 0:
-                loss0_max_bid = int(ok["입찰가"].max())
-
-            recommended_bid = None
-            if loss0_max_bid:
-                lo = int(loss0_max_bid * 0.97)
-                hi = int(loss0_max_bid * 0.99)
-                def round_step(x): return int(round(x / bid_step) * bid_step)
-                recommended_bid = f"{round_step(lo):,} ~ {round_step(hi):,}원"
-
-                # 한줄 결론(진행/보류/비추천) - 화면 배너용
-                verdict = "보류"
-                verdict_reason = []
-
-                if int(min_price) <= 0:
-                    verdict = "보류"
-                    verdict_reason.append("최저가 미추출(0원) → 최저가 수동 입력 후 재분석 필요")
-                else:
-                    if loss0_max_bid and loss0_max_bid >= int(min_price):
-                        verdict = "진행 가능(조건부)"
-                        verdict_reason.append("손실0 상한이 최저가 이상(손실 금지 조건 충족)")
-                    else:
-                        verdict = "보류/비추천"
-                        verdict_reason.append("손실0 상한이 최저가 미만(손실 금지 조건 불충족)")
-
-                    sh = (subj.get("special_hint") or "")
-                    if "제시외" in sh:
-                        verdict_reason.append("제시외 건물 가능성 → 원상복구/민원 리스크 확인 필요")
-                    if "중복" in sh:
-                        verdict_reason.append("중복사건(정지) 표기 → 입찰 직전 사건 진행상태 재확인")
-
-            outputs = {
-                "sale_range": sr,
-                "sale_prices": sale_prices,
-                "matrix": df_matrix.to_dict(orient="records"),
-                "cost_info": cost_info,
-                "loan_amount": loan_amount,
-                "loss0_max_bid": loss0_max_bid,
-                "verdict": verdict,
-                "verdict_reason": verdict_reason,
-                "recommended_bid": recommended_bid,
-                "matrix_cols": list(df_matrix.columns),
-                "bid_range": {"start": bid_start, "end": bid_end, "step": bid_step},
-    "comps_sample": comps_view.to_dict(orient="records"),
-    "subject_snapshot": {
-        "case_no": case_no or None,
-        "related_case": subj.get("related_case"),
-        "address": address or None,
-        "property_type": property_type or None,
-        "area_m2": float(area_m2) if area_m2 else None,
-        "appraisal": int(appraisal) if appraisal else None,
-        "min_price": int(min_price) if min_price else None,
-        "min_price_pct": subj.get("min_price_pct"),
-        "current_round": subj.get("current_round"),
-        "prior_unsold_count": subj.get("prior_unsold_count"),
-        "auction_date": auction_date or None,
-        "base_right": base_right or None,
-        "occupancy_hint": subj.get("occupancy_hint"),
-        "special_hint": subj.get("special_hint"),
-        "rights_summary": subj.get("rights_summary"),
-        "rights_rows": subj.get("rights_rows") or [],
-    },
-}
-
-
-            assumptions = pending["assumptions"].copy()
-            assumptions.update({"loan_amount": loan_amount, "appraisal": appraisal, "min_price": min_price})
-
-            report_md = generate_report_stub(
+            case = build_case(
+                case_id, finalized_at, pending["user_email"], subj, reviewed,
                 {
-                    "case_no": case_no,
-                    "related_case": subj.get("related_case"),
-                    "address": address,
-                    "area_m2": area_m2,
-                    "appraisal": appraisal,
-                    "min_price": min_price,
-                    "auction_date": auction_date or subj.get("auction_date"),
-                    "base_right": base_right or subj.get("base_right"),
-                    "occupancy_hint": subj.get("occupancy_hint"),
-                    "special_hint": subj.get("special_hint"),
-                    "rights_rows": subj.get("rights_rows"),
-                    "rights_summary": subj.get("rights_summary"),
-                },
-                sr, outputs, assumptions
-            )
-
-            case = {
-                "id": case_id,
-                "created_at": finalized_at,
-                "created_by": pending["user_email"],
-                "status": "DONE",
-                "case_no": case_no or None,
-                "address": address or None,
-                "property_type": property_type or None,
-                "area_m2": float(area_m2) if area_m2 else None,
-                "appraisal": int(appraisal) if appraisal else None,
-                "min_price": int(min_price) if min_price else None,
-        "min_price_pct": subj.get("min_price_pct"),
-        "current_round": subj.get("current_round"),
-        "prior_unsold_count": subj.get("prior_unsold_count"),
-                "auction_date": auction_date or None,
-                "links": {
                     "raw": pending.get("links") or "",
                     "floorplan_path": floorplan_path,
                     "auction_pdf_path": pdf_path,
                     "auction_pdf_name": pending.get("pdf_name") or "auction.pdf",
                 },
-                "inputs": assumptions,
-                "outputs": outputs,
-                "report_md": report_md,
-            }
+                assumptions, outputs, report_md,
+            )
             save_case(case)
             saved_case = get_case(case_id)
             if not saved_case:
@@ -2053,20 +1538,16 @@ def main():
         if (not pdf_path) and c.get("id"):
             # 구버전 호환: uploads 테이블에서 경매 PDF 경로 조회
             try:
-                con = sqlite3.connect(DB_PATH)
-                cur = con.cursor()
-                cur.execute(
+                row = storage.fetch_one(
                     """
                     SELECT storage_path
                     FROM uploads
                     WHERE case_id=? AND file_type='auction_pdf' AND deleted_at IS NULL
-                    ORDER BY uploaded_at DESC
+                    ORDER BY uploaded_ts DESC
                     LIMIT 1
                     """,
                     (c.get("id"),),
                 )
-                row = cur.fetchone()
-                con.close()
                 if row and row[0]:
                     pdf_path = str(row[0]).strip()
             except Exception:
@@ -2663,6 +2144,49 @@ def main():
             st.write(f"- 기준(중앙값): **{fmt_money(sr.get('mid'))}**")
             st.caption(sr.get("note",""))
 
+            val = outputs.get("valuation") or {}
+            if val.get("mid") is not None:
+                st.markdown("#### 시점·층·연식 보정 매도가능가")
+                val_ci = val.get("ci") or {}
+                v1, v2, v3 = st.columns(3)
+                for col, key, label in ((v1, "low", "하단(25%)"), (v2, "mid", "기준(50%)"), (v3, "high", "상단(75%)")):
+                    rng_ci = val_ci.get(key)
+                    col.metric(label, fmt_money(val.get(key)), delta=(f"95% {rng_ci[0]/1e8:.2f}~{rng_ci[1]/1e8:.2f}억" if rng_ci else None), delta_color="off")
+                val_model = val.get("model") or {}
+                if val_model.get("estimate"):
+                    m_ci = val_model.get("ci") or [None, None]
+                    st.write(f"- 모형 추정가: **{fmt_money(val_model.get('estimate'))}** (95% {fmt_money(m_ci[0])} ~ {fmt_money(m_ci[1])}, R² {val_model.get('r2')})")
+                st.caption(val.get("note", ""))
+                if val.get("time_index"):
+                    ti = pd.Series(val["time_index"], name="시점지수(최신월=1)")
+                    st.line_chart(ti)
+            elif (val or {}).get("error"):
+                st.caption(f"보정 매도가능가: {val['error']}")
+
+            market = outputs.get("market_index") or {}
+            if market.get("trend"):
+                st.markdown("#### 지역 가격지수 추이(월별 ㎡당 가격)")
+                m1, m2, m3 = st.columns(3)
+                m1.metric("최근 12개월 ㎡당 중앙값", fmt_money(market.get("ppm_12m")), delta=f"{market.get('n_12m') or 0}건", delta_color="off")
+                yoy = market.get("yoy_pct")
+                m2.metric("전년 동기 대비", "-" if yoy is None else f"{yoy:+.1f}%")
+                m_est = market.get("estimate") or {}
+                m3.metric("가격지수 환산 기준가", fmt_money(m_est.get("mid")))
+                trend = pd.DataFrame(market["trend"])
+                x = pd.to_datetime(trend["deal_ym"].astype(str), format="%Y%m")
+                fig = go.Figure([
+                    go.Scatter(x=x, y=trend["p75_ppm"], mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"),
+                    go.Scatter(x=x, y=trend["p25_ppm"], mode="lines", line=dict(width=0), fill="tonexty",
+                               fillcolor="rgba(99,110,250,0.18)", name="25~75%"),
+                    go.Scatter(x=x, y=trend["median_ppm"], mode="lines+markers", name="중앙값",
+                               customdata=trend["n"], hovertemplate="%{x|%Y-%m}<br>%{y:,.0f}원/㎡<br>%{customdata}건<extra></extra>"),
+                ])
+                fig.update_layout(height=320, margin=dict(l=10, r=10, t=10, b=10), yaxis_title="원/㎡", legend=dict(orientation="h"))
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"{market.get('dong') or '시군구 전체'} · {market.get('area_bucket')} · {market.get('ref_month')} 기준. {m_est.get('note') or ''}")
+            elif market.get("error"):
+                st.caption(f"지역 가격지수: {market['error']}")
+
             st.subheader("입찰 시나리오(직접 입력)")
             sale_prices = outputs.get("sale_prices") or []
             sale_mid_default = int(sale_prices[1]) if len(sale_prices) >= 2 else int((sr.get("mid") or 0))
@@ -2749,6 +2273,55 @@ def main():
             else:
                 st.caption("근거: 손실0 상한을 산출하지 못해 추천가 근거를 표시할 수 없습니다. (최저가/매도가능가/가정값 확인 필요)")
 
+            st.subheader("입찰가별 손실확률(몬테카를로)")
+            sim_saved = outputs.get("simulation") or {}
+            sim_defaults = bid_sim.default_ranges(inp)
+            sim_defaults.update({k: tuple(v) for k, v in (sim_saved.get("ranges") or {}).items()})
+            sim_prices = bid_sim.sale_sample_from_outputs(outputs)
+            if len(sale_prices) >= 3 and bid_rng.get("start") is not None:
+                with st.expander("분포 범위 조정", expanded=False):
+                    s1, s2 = st.columns(2)
+                    with s1:
+                        sim_days = st.slider("보유기간(일)", 1, 730, tuple(min(730, max(1, int(x))) for x in sim_defaults["holding_days"]), key=f"sim_days_{c.get('id')}")
+                        sim_rate = st.slider(
+                            "금리(연, %)", 0.0, 20.0,
+                            tuple(min(20.0, round(float(x) * 100.0, 1)) for x in sim_defaults["interest_rate"]),
+                            step=0.1, key=f"sim_rate_{c.get('id')}",
+                        )
+                        sim_max_loss = st.slider("허용 손실확률(%)", 1, 50, int(float(sim_saved.get("max_loss_prob") or bid_sim.DEFAULT_MAX_LOSS_PROB) * 100), key=f"sim_maxloss_{c.get('id')}")
+                    with s2:
+                        sim_repair = st.slider("수리비(만원)", 0, 5_000, tuple(min(5_000, int(x) // 10_000) for x in sim_defaults["repair_cost"]), step=10, key=f"sim_repair_{c.get('id')}")
+                        sim_evict = st.slider("명도비(만원)", 0, 5_000, tuple(min(5_000, int(x) // 10_000) for x in sim_defaults["eviction_cost"]), step=10, key=f"sim_evict_{c.get('id')}")
+                        sim_n = st.select_slider("시나리오 수", [10_000, 50_000, 100_000, 200_000, 500_000], value=int(sim_saved.get("n") or bid_sim.DEFAULT_SCENARIOS), key=f"sim_n_{c.get('id')}")
+                sim_ranges = {
+                    "holding_days": sim_days,
+                    "interest_rate": (sim_rate[0] / 100.0, sim_rate[1] / 100.0),
+                    "repair_cost": (sim_repair[0] * 10_000, sim_repair[1] * 10_000),
+                    "eviction_cost": (sim_evict[0] * 10_000, sim_evict[1] * 10_000),
+                }
+                sim_bids = bid_grid(bid_rng["start"], bid_rng["end"], bid_rng.get("step") or 1_000_000)
+                sim_table = bid_sim.simulate(
+                    sim_bids, float(inp.get("tax_rate", 0.0)), int(outputs.get("loan_amount") or loan_amount),
+                    float(inp.get("early_repay_fee_rate", 0.0)), sim_ranges,
+                    prices=sim_prices, quartiles=sale_prices, n=sim_n, seed=0,
+                )
+                sim_max_bid = bid_sim.max_bid_for_loss_prob(sim_table, sim_max_loss / 100.0)
+                st.write(f"손실확률 {sim_max_loss}% 이하 최대 입찰가: **{fmt_money(sim_max_bid)}**")
+                st.line_chart(sim_table.set_index("입찰가")[["손실확률(%)"]])
+                sim_disp = sim_table.iloc[::max(1, len(sim_table) // 40)].copy()
+                for k in ["입찰가", "기대손익", "하위5%", "중앙값", "상위95%"]:
+                    sim_disp[k] = sim_disp[k].map(lambda v: f"{int(v):,}")
+                st.markdown(
+                    _uniform_df_table_html(sim_disp, show_index=False, right_align_cols=set(bid_sim.TABLE_COLUMNS)),
+                    unsafe_allow_html=True,
+                )
+                st.caption(
+                    f"매도가: {'유사면적 실거래 ' + str(len(sim_prices)) + '건 부트스트랩' if sim_prices else '하/중/상 분위수 기반 정규분포'} · "
+                    f"보유기간/금리/수리비/명도비: 범위 내 균등분포 · 시나리오 {sim_n:,}개"
+                )
+            else:
+                st.caption("매도가능가/입찰 범위가 없는 케이스라 시뮬레이션을 표시할 수 없습니다.")
+
             st.markdown("#### 직접 메모")
             def _auto_textarea_height(text: str, min_h: int = 180, max_h: int = 680) -> int:
                 t = str(text or "")
@@ -2813,6 +2386,8 @@ def main():
                 }
                 try:
                     save_case(new_case)
+                    if c.get("id"):
+                        copy_upload_refs(c.get("id"), new_case_id)
                     st.session_state["last_saved_case_id"] = new_case_id
                     st.success(f"저장 완료: {new_case_id[:8]} (분석 리스트에 반영)")
                 except Exception as e:
@@ -0,0 +1,106 @@
+"""전용면적 정렬 인덱스 + 분위수 일괄 계산.
+
+실거래 표를 면적순으로 한 번 정렬해 두고, ±3/±5/±10㎡ 같은 면적 구간은
+searchsorted(이진 탐색)로 연속 구간을 바로 찾습니다. estimate_sale_price_range와 같은 규칙의
+하/중/상(25/50/75) 계산을 여러 대상면적에 대해 한 번에 할 수 있습니다.
+같은 표(DataFrame)에 대한 인덱스는 프로세스 캐시에 둡니다.
+"""
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+NEAR_DELTA = 3.0
+WIDE_DELTA = 5.0
+MIN_NEAR_N = 8
+MIN_FILTERED_N = 5
+OUTLIER_LOW, OUTLIER_HIGH = 0.5, 1.7
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class AreaIndex:
+    def __init__(self, areas, prices=None):
+        a = pd.to_numeric(pd.Series(areas), errors="coerce").to_numpy(dtype=np.float64)
+        valid = ~np.isnan(a)
+        if prices is not None:
+            p = pd.to_numeric(pd.Series(prices), errors="coerce").to_numpy(dtype=np.float64)
+            valid &= ~np.isnan(p)
+        pos = np.flatnonzero(valid)
+        # 같은 면적은 원래 행 순서를 유지(stable)
+        order = pos[np.argsort(a[pos], kind="stable")]
+        self.order = order
+        self.areas = a[order]
+        self.prices = p[order] if prices is not None else None
+        self.size = len(order)
+
+    @classmethod
+    def from_comps(cls, comps: pd.DataFrame):
+        """estimate_sale_price_range 입력(area_m2, price) → 인덱스."""
+        return cls(comps["area_m2"].to_numpy(), comps["price"].to_numpy())
+
+    def bounds(self, lo, hi):
+        """lo <= 면적 <= hi 인 정렬 구간 [i, j). lo/hi는 배열도 됩니다."""
+        return (np.searchsorted(self.areas, lo, side="left"),
+                np.searchsorted(self.areas, hi, side="right"))
+
+    def positions(self, center: float, delta: float) -> np.ndarray:
+        """center±delta 안의 원래 행 위치(원래 순서로 정렬)."""
+        i, j = self.bounds(float(center) - float(delta), float(center) + float(delta))
+        return np.sort(self.order[i:j])
+
+    def _range_from_window(self, prices: np.ndarray, delta_used: int) -> dict:
+        med = float(np.median(prices))
+        # 이상치 필터(중앙값 대비 과도한 값 제거)
+        kept = prices[(prices >= med * OUTLIER_LOW) & (prices <= med * OUTLIER_HIGH)]
+        if len(kept) >= MIN_FILTERED_N:
+            prices = kept
+        q25, q50, q75 = np.quantile(prices, (0.25, 0.50, 0.75))
+        n = len(prices)
+        return {
+            "low": int(q25),
+            "mid": int(q50),
+            "high": int(q75),
+            "n": int(n),
+            "prices": np.sort(prices).astype(np.int64).tolist(),  # 몬테카를로 매도가 표본(bid_sim)
+            "note": f"유사면적 표본 {n}건 기반(±{delta_used}㎡, 분위수 25/50/75, 이상치 필터 적용)",
+        }
+
+    def estimate_many(self, subject_areas):
+        """대상면적 목록 → estimate_sale_price_range와 같은 dict 목록(구간 탐색은 한 번에)."""
+        s = np.asarray([float(x) for x in subject_areas], dtype=np.float64)
+        i3, j3 = self.bounds(s - NEAR_DELTA, s + NEAR_DELTA)
+        i5, j5 = self.bounds(s - WIDE_DELTA, s + WIDE_DELTA)
+        out = []
+        for k in range(len(s)):
+            if j3[k] - i3[k] >= MIN_NEAR_N:
+                window, delta_used = self.prices[i3[k]:j3[k]], 3
+            else:
+                window, delta_used = self.prices[i5[k]:j5[k]], 5
+            if len(window) == 0:
+                out.append({"low": None, "mid": None, "high": None, "note": "유사면적 표본이 부족합니다(±5㎡ 내 거래 없음)"})
+            else:
+                out.append(self._range_from_window(window, delta_used))
+        return out
+
+    def estimate(self, subject_area: float) -> dict:
+        return self.estimate_many([subject_area])[0]
+
+
+def index_for(df: pd.DataFrame, area_col: str = "area_m2", price_col: str = "price") -> AreaIndex:
+    """같은 DataFrame 객체에 대한 인덱스를 재사용합니다(제자리 수정하지 않는 표 전용, 객체가 사라지면 캐시에서도 빠짐)."""
+    key = (id(df), area_col, price_col)
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None and hit[0]() is df:
+            return hit[1]
+    idx = AreaIndex(df[area_col].to_numpy(), df[price_col].to_numpy() if price_col in df.columns else None)
+    try:
+        ref = weakref.ref(df, lambda _r, k=key: _CACHE.pop(k, None))
+    except TypeError:
+        return idx
+    with _CACHE_LOCK:
+        _CACHE[key] = (ref, idx)
+    return idx
@@ -0,0 +1,469 @@
+"""옥션원 경매 PDF 파서(텍스트 추출 + 필드 추출 규칙 + 주소/스니펫 정리).
+
+추출 규칙은 모듈 로드 시 한 번 컴파일한 RULES 표에 모여 있습니다.
+규칙을 바꾸면 PARSER_VERSION을 올려주세요(app.db의 PDF 파싱 캐시가 무효화됩니다).
+
+규칙별 소요시간 측정:
+    python auction_pdf.py 샘플1.pdf 샘플2.pdf ... [--repeat 20]
+"""
+import io
+import re
+import sys
+import time
+
+from PyPDF2 import PdfReader
+
+PARSER_VERSION = "1"
+
+MAX_PAGES = 6
+
+_DATE = r"\d{4}[\.-]\d{2}[\.-]\d{2}"
+_MONEY = r"([0-9]{1,3}(?:,[0-9]{3})+)"
+_CASE_NO = r"(\d{4}\s*타경\s*\d+)"
+
+RULES = {
+    # 공백 정리
+    "ws": re.compile(r"\s+"),
+    # 사건번호/관련사건
+    "case_no_near_date": re.compile(r"매각기일[^\n]{0,150}" + _CASE_NO),
+    "case_no_after_court": re.compile(r"(?:지방법원|지원)[^0-9]{0,80}" + _CASE_NO),
+    "case_no_any": re.compile(_CASE_NO),
+    "related_case": re.compile(r"관련사건\s*" + _CASE_NO),
+    # 일자
+    "auction_date": re.compile(r"매각기일\s*[:：]?\s*(" + _DATE + ")"),
+    "base_right": re.compile(r"말소기준권리\s*[:：]?\s*(" + _DATE + ")"),
+    # 주소 반복 토큰 축약(첫 글자가 모두 달라 순차 적용과 결과가 같음)
+    "addr_fixed_repeat": re.compile(r"(서울특별시|중랑구|길|비동|층|호)\1+"),
+    "addr_token_repeat": re.compile(r"([가-힣0-9]{1,6})\1{1,}"),
+    "addr_spaced_repeat": re.compile(r"(서울특별시|중랑구)(?:\s*\1)+"),
+    "addr_seoul_repeat": re.compile(r"(서울특별시)\1+"),
+    "addr_dong_repeat": re.compile(r"([가-힣]{1,12}(?:동|읍|면|리))\1+"),
+    "jibun_full": re.compile(
+        r"((?:서울특별시|부산광역시|대구광역시|인천광역시|광주광역시|대전광역시|울산광역시|세종특별자치시|[가-힣]+도)"
+        r"\s+[가-힣]+(?:시|군|구)\s+[가-힣0-9]+(?:동|읍|면|리)\s*\d+(?:-\d+)?)"
+    ),
+    "jibun_short": re.compile(r"([가-힣]+(?:시|군|구)\s+[가-힣0-9]+(?:동|읍|면|리)\s*\d+(?:-\d+)?)"),
+    # 면적/금액
+    "area_m2": re.compile(r"건물면적\s*([0-9]+(?:\.[0-9]+)?)\s*㎡"),
+    "money": re.compile(_MONEY),
+    "appraisal": re.compile(r"감\s*정\s*가\s*" + _MONEY + r"\s*원"),
+    "appraisal_label": re.compile(r"감\s*정\s*가|감정가"),
+    # 최저가: PDF 텍스트 추출 시 '원' 글자가 'ਗ'처럼 깨질 수 있어, '원' 없이도 잡히도록 구성
+    "min_price_80": re.compile(r"최\s*저\s*가\s*\(\s*80\s*%\s*\)\s*" + _MONEY),
+    "min_price_round2": re.compile(r"2차\s*" + _DATE + r"\s*" + _MONEY),
+    "min_price_pct_after": re.compile(_MONEY + r"\s*[^0-9]{0,3}\(\s*80\s*%\s*\)"),
+    "min_price_label": re.compile(r"최\s*저\s*가|최저가|최\s*저\s*매\s*각\s*가\s*격"),
+    "min_price_pct": re.compile(r"최\s*저\s*가\s*\(\s*([0-9]{2,3})\s*%\s*\)"),
+    # 점유/특이사항
+    "no_tenant": re.compile(r"임차인이\s*없"),
+    "owner_occupied": re.compile(r"소유자가\s*점유"),
+    "move_in_cert": re.compile(r"전입세대확인서"),
+    "extra_building": re.compile(r"제시외\s*건물"),
+    "dup_case_stopped": re.compile(r"\(중복\)\s*-\s*정지|중복\)\-정지"),
+    # 등기부/차수
+    "rights_row": re.compile(
+        r"(\d+)\((갑|을)\d+\)\s*(\d{4}\.\d{2}\.\d{2})\s*([가-힣]+)\s*([^0-9]+?)\s*" + _MONEY
+        + r"\s*원\s*(말소기준등기)?\s*(소멸|인수|존속)?"
+    ),
+    "round_row": re.compile(r"(\d)차\s*(" + _DATE + r")\s*" + _MONEY),
+    # 스니펫/주소 정리
+    "snippet_header_repeat": re.compile(r"(매각물건현황|임차인현황|등기부현황|매각사례분석)\1+"),
+    "token_repeat": re.compile(r"([가-힣0-9]{1,8})\1{1,}"),
+    "newlines": re.compile(r"\n+"),
+    "comma": re.compile(r"[，,]"),
+}
+
+# 순서가 결과에 영향을 주므로(예: '묵동'과 '동') 한 패턴으로 합치지 않고 순서대로 적용
+_ADDR_SPACED_TOKENS = ["서울특별시", "중랑구", "묵동", "현진월드빌", "비동", "동", "층", "호"]
+for _i, _tok in enumerate(_ADDR_SPACED_TOKENS):
+    RULES[f"addr_spaced_{_i}_{_tok}"] = re.compile(rf"(?:{re.escape(_tok)})\s+(?:{re.escape(_tok)})")
+
+# '관련사건번호'처럼 라벨끼리 겹칠 수 있어 순서대로 치환
+_SNIPPET_LABELS = ["사건번호", "소 재 지", "새 주 소", "감 정 가", "최 저 가", "매각기일", "말소기준권리", "관련사건"]
+
+_ADDR_STOPS = ["물건종별", "감 정 가", "감정가", "평당", "대 지 권", "대지권", "최저매각", "최 저 가"]
+
+
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    pages = []
+    for page in reader.pages[:MAX_PAGES]:
+        try:
+            pages.append(page.extract_text() or "")
+        except Exception:
+            pages.append("")
+    return "\n".join(pages)
+
+
+def _norm_date(s: str):
+    return s.replace("-", ".").replace("/", ".")
+
+
+def _to_int_money(s: str):
+    return int(s.replace(",", ""))
+
+
+def _dedupe_tokens(s: str):
+    toks = RULES["ws"].split(s.strip())
+    out = []
+    for t in toks:
+        if not out or out[-1] != t:
+            out.append(t)
+    return RULES["addr_spaced_repeat"].sub(r"\1", " ".join(out)).strip()
+
+
+def _extract_address(flat: str):
+    # 주소(옥션원): 텍스트 추출 시 토큰 반복(서울특별시서울특별시, 길길길길, 층층층층 등)이 흔합니다.
+    # '새 주소' 또는 '소재지' 위치를 찾고, 다음 키워드 전까지만 짧게 잘라냅니다.
+    def _slice_after(label: str, max_len: int = 140):
+        i = flat.find(label)
+        if i < 0:
+            return None
+        seg = flat[i + len(label): i + len(label) + max_len]
+        for stop in _ADDR_STOPS:
+            j = seg.find(stop)
+            if j > 5:
+                seg = seg[:j]
+                break
+        return seg.strip()
+
+    # 요청사항: 구주소(소재지) 우선 사용
+    addr = _slice_after("소 재 지")
+    if not addr:
+        addr = _slice_after("새 주 소")
+    if not addr:
+        return None
+
+    address = RULES["ws"].sub(" ", addr).strip()
+    # 반복 토큰 축약
+    address = RULES["addr_fixed_repeat"].sub(r"\1", address)
+    address = RULES["addr_token_repeat"].sub(r"\1", address)
+    try:
+        address = _dedupe_tokens(address)
+    except Exception:
+        pass
+
+    # 소재지에서 지번 주소(시/구/군/동/번지) 우선 추출
+    raw = RULES["ws"].sub(" ", address.replace(",", " ")).strip()
+    raw = RULES["addr_seoul_repeat"].sub(r"\1", raw)
+    raw = RULES["addr_dong_repeat"].sub(r"\1", raw)
+
+    jibun = None
+    for name in ("jibun_full", "jibun_short"):
+        m = RULES[name].search(raw)
+        if m:
+            jibun = m.group(1)
+            break
+    if jibun:
+        jibun = RULES["ws"].sub(" ", jibun).strip()
+        address = RULES["addr_dong_repeat"].sub(r"\1", jibun)
+    return address
+
+
+def _money_near(flat: str, label_rule: str, width: int):
+    cands = []
+    for mm in RULES[label_rule].finditer(flat):
+        seg = flat[mm.end():mm.end() + width]
+        cands.extend(_to_int_money(m1.group(1)) for m1 in RULES["money"].finditer(seg))
+    return cands
+
+
+def parse_auction_text(text: str) -> dict:
+    """옥션원 PDF 전용 파서(안정화).
+    - 본 사건번호와 관련사건(중복)을 구분
+    - 최저가(80%) / 2차 금액을 우선 추출
+    - 새주소 우선 추출 + 반복 토큰 정리
+    """
+    R = RULES
+    flat = R["ws"].sub(" ", text).strip()
+
+    # 사건번호: '매각기일' 라인 근처 우선
+    case_no = None
+    m = R["case_no_near_date"].search(text) or R["case_no_after_court"].search(flat)
+    if m:
+        case_no = m.group(1).replace(" ", "")
+    if not case_no:
+        for mm in R["case_no_any"].finditer(flat):
+            span = flat[max(0, mm.start() - 40):mm.end() + 40]
+            if "관련사건" in span:
+                continue
+            case_no = mm.group(1).replace(" ", "")
+            break
+
+    related_case = None
+    m = R["related_case"].search(flat)
+    if m:
+        related_case = m.group(1).replace(" ", "")
+
+    auction_date = None
+    m = R["auction_date"].search(flat)
+    if m:
+        auction_date = _norm_date(m.group(1))
+
+    base_right = None
+    m = R["base_right"].search(flat)
+    if m:
+        base_right = _norm_date(m.group(1))
+
+    address = _extract_address(flat)
+
+    area_m2 = None
+    m = R["area_m2"].search(flat)
+    if m:
+        area_m2 = float(m.group(1))
+
+    m = R["appraisal"].search(flat)
+    if m:
+        appraisal = _to_int_money(m.group(1))
+    else:
+        cands = _money_near(flat, "appraisal_label", 200)
+        appraisal = max(cands) if cands else None
+
+    # 최저가: (80%) 표기 → 2차 금액 → 'NNN (80%)' → 키워드 주변 후보(감정가 이하 중 최대)
+    min_price = None
+    for name in ("min_price_80", "min_price_round2", "min_price_pct_after"):
+        m = R[name].search(flat)
+        if m:
+            min_price = _to_int_money(m.group(1))
+        if min_price:
+            break
+    if not min_price:
+        cands = _money_near(flat, "min_price_label", 260)
+        if cands:
+            if appraisal:
+                under = [x for x in cands if x <= appraisal]
+                min_price = max(under) if under else max(cands)
+            else:
+                min_price = max(cands)
+
+    occupancy_hint = []
+    if R["no_tenant"].search(flat):
+        occupancy_hint.append("임차인 없음")
+    if R["owner_occupied"].search(flat):
+        occupancy_hint.append("소유자 점유")
+    if R["move_in_cert"].search(flat):
+        occupancy_hint.append("전입세대확인서 언급")
+
+    special = []
+    if R["extra_building"].search(flat):
+        special.append("제시외 건물 포함")
+    if R["dup_case_stopped"].search(flat):
+        special.append("중복사건(정지) 표기")
+
+    rights_rows = []
+    for mm in R["rights_row"].finditer(flat):
+        rights_rows.append({
+            "no": mm.group(1),
+            "ab": mm.group(2),
+            "date": mm.group(3),
+            "kind": mm.group(4).strip(),
+            "holder": R["ws"].sub(" ", mm.group(5)).strip(),
+            "amount": _to_int_money(mm.group(6)),
+            "is_base": True if mm.group(7) else False,
+            "status": (mm.group(8) or "").strip(),
+        })
+    rights_summary = None
+    if rights_rows:
+        base_row = next((r for r in rights_rows if r.get("is_base")), None)
+        if base_row:
+            rights_summary = f"말소기준등기: {base_row['date']} {base_row['kind']}({base_row['holder']})"
+            if not base_right:
+                base_right = base_row["date"]
+        else:
+            rights_summary = f"등기 표 파싱 {len(rights_rows)}건(말소기준등기 표기 미발견)"
+
+    # --- 최저가 정보(저감율/차수/유찰횟수) ---
+    min_price_pct = None
+    m = R["min_price_pct"].search(flat)
+    if m:
+        min_price_pct = float(int(m.group(1)))
+    elif appraisal and min_price:
+        try:
+            min_price_pct = round((float(min_price) / float(appraisal)) * 100.0, 1)
+        except Exception:
+            min_price_pct = None
+
+    rounds = []
+    for mm in R["round_row"].finditer(flat):
+        tail = flat[mm.end():mm.end() + 20]
+        status = "유찰" if "유찰" in tail else ("변경" if "변경" in tail else "")
+        rounds.append({
+            "round": int(mm.group(1)),
+            "date": mm.group(2).replace("-", "."),
+            "price": int(mm.group(3).replace(",", "")),
+            "status": status,
+        })
+
+    current_round = None
+    current_status = None
+    if auction_date and rounds:
+        for r in rounds:
+            if r["date"] == auction_date:
+                current_round = r["round"]
+                current_status = r["status"] or None
+                break
+
+    if current_round is None and min_price and rounds:
+        same = [r for r in rounds if r["price"] == int(min_price)]
+        if same:
+            same_sorted = sorted(same, key=lambda x: x["round"])
+            current_round = same_sorted[0]["round"]
+            current_status = same_sorted[0]["status"] or None
+
+    prior_unsold_count = None
+    if current_round and rounds:
+        prior_unsold_count = sum(1 for r in rounds if r["round"] < current_round and r["status"] == "유찰")
+
+    return {
+        "case_no": case_no,
+        "related_case": related_case,
+        "address": address,
+        "appraisal": appraisal,
+        "min_price": min_price,
+        "min_price_pct": min_price_pct,
+        "current_round": current_round,
+        "prior_unsold_count": prior_unsold_count,
+        "current_status": current_status,
+        "area_m2": area_m2,
+        "auction_date": auction_date,
+        "base_right": base_right,
+        "occupancy_hint": " / ".join(occupancy_hint) if occupancy_hint else None,
+        "special_hint": " / ".join(special) if special else None,
+        "rights_rows": rights_rows,
+        "rights_summary": rights_summary,
+        "raw_text_snippet": text[:1200],
+    }
+
+
+def normalize_address(addr: str) -> str:
+    """옥션원 PDF 텍스트 추출로 생기는 중복 토큰을 최대한 정리합니다."""
+    if not addr:
+        return ""
+    R = RULES
+    a = R["ws"].sub(" ", addr).strip()
+
+    # 토큰 내부 반복(중랑구중랑구, 비동비동, 5층층층 등)
+    a = R["token_repeat"].sub(r"\1", a)
+
+    # 쉼표/특수기호를 공백으로 통일 후 단어 단위 중복 제거
+    tmp = R["ws"].sub(" ", R["comma"].sub(" ", a)).strip()
+    cleaned = []
+    prev = None
+    for p in tmp.split(" "):
+        if not p:
+            continue
+        # 또 한번 내부 반복 축약
+        p2 = R["token_repeat"].sub(r"\1", p)
+        if p2 == prev:
+            continue
+        cleaned.append(p2)
+        prev = p2
+
+    a2 = " ".join(cleaned)
+    # 흔한 반복 토큰 추가 정리(필요 시)
+    for i, token in enumerate(_ADDR_SPACED_TOKENS):
+        a2 = R[f"addr_spaced_{i}_{token}"].sub(token, a2)
+    return a2.strip()
+
+
+def clean_extracted_snippet(s: str) -> str:
+    """PDF에서 추출한 텍스트(참고용)를 보기 좋게 정리합니다."""
+    if not s:
+        return ""
+    R = RULES
+    t = R["ws"].sub(" ", s).strip()
+
+    # 주소/지명 중복 정리(참고용)
+    t = normalize_address(t)
+
+    # 자주 반복되는 헤더 토큰 축약(옥션원). 예: '매각물건현황매각물건현황...' → 1회
+    t = R["snippet_header_repeat"].sub(r"\1", t)
+
+    # 일반 반복 토큰 축약(길길길길, 층층층층 등)
+    t = R["token_repeat"].sub(r"\1", t)
+
+    # 가독성 위해 주요 라벨 앞에 줄바꿈 삽입
+    for label in _SNIPPET_LABELS:
+        t = t.replace(label, f"\n{label}")
+    t = R["newlines"].sub("\n", t).strip()
+
+    # 너무 길면 앞부분만
+    if len(t) > 700:
+        t = t[:700] + "\n…(생략)"
+    return t
+
+
+class _TimedRule:
+    """profile_rules용: 컴파일된 패턴을 감싸 호출 횟수/소요시간을 기록."""
+
+    def __init__(self, name, pattern, stats):
+        self._name = name
+        self._pattern = pattern
+        self._stats = stats
+
+    def _timed(self, method, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            out = getattr(self._pattern, method)(*args, **kwargs)
+            if method == "finditer":
+                out = list(out)
+            return out
+        finally:
+            st = self._stats.setdefault(self._name, [0, 0.0])
+            st[0] += 1
+            st[1] += time.perf_counter() - t0
+
+    def search(self, *a, **k):
+        return self._timed("search", *a, **k)
+
+    def finditer(self, *a, **k):
+        return self._timed("finditer", *a, **k)
+
+    def sub(self, *a, **k):
+        return self._timed("sub", *a, **k)
+
+    def split(self, *a, **k):
+        return self._timed("split", *a, **k)
+
+
+def profile_rules(texts, repeat: int = 1):
+    """텍스트 목록에 파서를 돌려 규칙별 {name: (호출 수, 누적 초)}를 반환합니다."""
+    stats = {}
+    original = dict(RULES)
+    RULES.update({name: _TimedRule(name, pat, stats) for name, pat in original.items()})
+    try:
+        for _ in range(max(1, int(repeat))):
+            for text in texts:
+                subject = parse_auction_text(text)
+                clean_extracted_snippet(subject.get("raw_text_snippet") or "")
+    finally:
+        RULES.update(original)
+    return {name: (calls, secs) for name, (calls, secs) in stats.items()}
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="경매 PDF 추출 규칙별 소요시간 측정")
+    ap.add_argument("pdfs", nargs="+", help="샘플 PDF 경로")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    texts = []
+    for path in args.pdfs:
+        with open(path, "rb") as f:
+            texts.append(extract_pdf_text(f.read()))
+    extract_sec = time.perf_counter() - t0
+
+    stats = profile_rules(texts, args.repeat)
+    total = sum(secs for _, secs in stats.values()) or 1e-12
+    print(f"PDF {len(texts)}개, 텍스트 추출 {extract_sec * 1000:.1f}ms (1회), 파싱 x{args.repeat}")
+    print(f"{'rule':<32}{'calls':>8}{'total ms':>12}{'share':>8}")
+    for name, (calls, secs) in sorted(stats.items(), key=lambda kv: -kv[1][1]):
+        print(f"{name:<32}{calls:>8}{secs * 1000:>12.2f}{secs / total:>8.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
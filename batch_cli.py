@@ -0,0 +1,252 @@
+"""경매 PDF 폴더를 화면 없이 일괄 분석합니다(야간 배치용).
+
+    python batch_cli.py ./pdfs --comps comps.xlsx --csv summary.csv
+    python batch_cli.py ./pdfs --warehouse 11260:연립다세대 --workers 6
+
+PDF 파싱은 bulk_ingest 프로세스 풀에서, 손익 계산/저장은 analysis 모듈로 새 분석 화면과
+같은 규칙을 적용합니다. DB 쓰기는 이 프로세스에서만 합니다.
+"""
+import argparse
+import csv
+import re
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import storage
+import bulk_ingest
+import comps
+import price_index
+import trade_warehouse
+import valuation
+from analysis import estimate_sale_price_range, finalize_analysis, build_case, save_case
+
+LOCAL_TZ = ZoneInfo("Asia/Seoul")
+SUMMARY_COLUMNS = [
+    "case_id", "file", "case_no", "address", "area_m2", "appraisal", "min_price",
+    "sale_mid", "loss0_max_bid", "recommended_bid", "verdict", "error",
+]
+_DONG_RE = re.compile(r"([가-힣0-9]+동)")
+# 전용면적이 이 범위 밖이면 PDF 추출 오류로 보고 실거래 표본을 고르지 않음(주거용 경매 물건 기준)
+PLAUSIBLE_AREA_M2 = (5.0, 500.0)
+
+
+def area_problem(area_m2):
+    """유사면적 표본을 고를 수 없는 면적이면 사유 문자열, 아니면 None."""
+    if not area_m2:
+        return "전용면적 미추출(실거래 표본을 고를 수 없어 건너뜀)"
+    lo, hi = PLAUSIBLE_AREA_M2
+    if not (lo < float(area_m2) <= hi):
+        return f"전용면적 비정상({float(area_m2):g}㎡, 허용 {lo:g}~{hi:g}㎡) — PDF 확인 필요"
+    return None
+
+
+def _now_local_str():
+    return datetime.now(LOCAL_TZ).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _pdf_paths(root: Path):
+    if root.is_file():
+        return [root]
+    return sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() == ".pdf")
+
+
+def _warehouse_spec(spec: str):
+    """'11260:연립다세대[:묵동]' → (lawd_cd, property_type, dong 또는 None)"""
+    parts = [p.strip() for p in str(spec).split(":")]
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        raise argparse.ArgumentTypeError("--warehouse 형식: LAWD_CD:유형[:동] (예: 11260:연립다세대:묵동)")
+    return parts[0], parts[1], (parts[2] if len(parts) > 2 and parts[2] else None)
+
+
+def _comps_source(args):
+    """(PDF 주소, 면적) → (estimator, comps_raw, market, err). 엑셀은 한 번만 읽고, 창고는 동별로 한 번만 조회합니다.
+
+    market은 창고 모드의 (lawd_cd, property_type, 저장된 동 이름)으로, 가격지수 조회에 씁니다(엑셀은 None).
+    """
+    if args.comps:
+        path = Path(args.comps)
+        if comps.should_stream(path.stat().st_size, path.name):
+            # 대용량/CSV는 전체를 올리지 않고 PDF마다 면적 구간만 스트리밍(area는 analyze_one에서 전달)
+            def _stream(address, area_m2=None):
+                problem = area_problem(area_m2)
+                if problem:
+                    return None, None, None, problem
+                streamed = comps.stream_comps(path, area_m2)
+                return comps.estimator_frame(streamed), comps.view_frame(streamed), None, None
+            return _stream
+        comps_raw = comps.load_comps(path.read_bytes())
+        estimator = comps.estimator_frame(comps_raw)
+        return lambda address, area_m2=None: (estimator, comps_raw, None, None)
+
+    lawd_cd, property_type, fixed_dong = args.warehouse
+    price_index.refresh(lawd_cd, property_type)
+    by_dong = {}
+
+    def _lookup(address, area_m2=None):
+        dong = fixed_dong
+        if not dong:
+            m = _DONG_RE.search(address or "")
+            if not m:
+                return None, None, None, "주소에서 동을 찾지 못했습니다(--warehouse에 동을 지정하세요)."
+            dong = m.group(1)
+        if dong not in by_dong:
+            view = trade_warehouse.query_dong(lawd_cd, property_type, dong)
+            stored = trade_warehouse.resolve_dong(lawd_cd, property_type, dong)
+            by_dong[dong] = (
+                trade_warehouse.view_to_comps(view),
+                trade_warehouse.view_in_won(view),
+                (lawd_cd, property_type, stored) if stored else None,
+            )
+        estimator, comps_raw, market = by_dong[dong]
+        return estimator, comps_raw, market, None
+
+    return _lookup
+
+
+def analyze_one(result: dict, path: str, comps_for, assumptions: dict, property_type: str, created_by: str):
+    """파싱 결과 1건 → 저장된 케이스 요약 행(dict). 실패는 error 칸에 남깁니다."""
+    subj = result.get("subject") or {}
+    row = {
+        "case_id": None,
+        "file": result.get("name"),
+        "case_no": subj.get("case_no"),
+        "address": subj.get("address"),
+        "area_m2": subj.get("area_m2"),
+        "appraisal": int(subj.get("appraisal") or 0),
+        "min_price": int(subj.get("min_price") or 0),
+        "sale_mid": None,
+        "loss0_max_bid": None,
+        "recommended_bid": None,
+        "verdict": None,
+        "error": result.get("error"),
+    }
+    if result.get("subject") is None:
+        row["error"] = row["error"] or "PDF 파싱 실패"
+        return row
+
+    problem = area_problem(subj.get("area_m2"))
+    if problem:
+        row["error"] = problem
+        return row
+    estimator, comps_raw, market, err = comps_for(subj.get("address"), subj.get("area_m2"))
+    if err:
+        row["error"] = err
+        return row
+    if (estimator is None or estimator.empty) and market is None:
+        row["error"] = f"실거래 표본 없음(대상면적 {float(subj['area_m2']):g}㎡ 주변 거래 없음)"
+        return row
+
+    reviewed = {
+        "case_no": subj.get("case_no") or "",
+        "address": subj.get("address") or "",
+        "property_type": property_type,
+        "area_m2": float(subj.get("area_m2") or 0.0),
+        "appraisal": row["appraisal"],
+        "min_price": row["min_price"],
+        "auction_date": subj.get("auction_date") or "",
+        "base_right": subj.get("base_right") or "",
+        "floor": valuation.floor_from_address(subj.get("address")),
+        "build_year": None,
+    }
+    sale_range = estimate_sale_price_range(estimator, subj.get("area_m2"), market=market)
+    try:
+        outputs, inputs, report_md = finalize_analysis(subj, reviewed, sale_range, assumptions, comps_raw, market=market)
+    except ValueError as e:
+        row["error"] = str(e)
+        return row
+
+    case_id = str(uuid.uuid4())
+    links = {
+        "raw": "",
+        "floorplan_path": None,
+        "auction_pdf_path": str(path),
+        "auction_pdf_name": result.get("name") or "auction.pdf",
+    }
+    save_case(build_case(case_id, _now_local_str(), created_by, subj, reviewed, links, inputs, outputs, report_md))
+    row.update({
+        "case_id": case_id,
+        "sale_mid": (outputs.get("sale_range") or {}).get("mid"),
+        "loss0_max_bid": outputs.get("loss0_max_bid"),
+        "recommended_bid": outputs.get("recommended_bid"),
+        "verdict": outputs.get("verdict"),
+    })
+    return row
+
+
+def write_summary(rows, out_path):
+    with open(out_path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        w.writeheader()
+        for r in rows:
+            w.writerow({k: r.get(k) for k in SUMMARY_COLUMNS})
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="경매 PDF 폴더 일괄 분석(결과는 cases에 저장)")
+    ap.add_argument("pdf_dir", help="PDF 폴더(하위 폴더 포함) 또는 PDF 파일")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--comps", help="실거래 엑셀/CSV(거래금액=원, '거래금액(만원)' 컬럼은 환산)")
+    src.add_argument("--warehouse", type=_warehouse_spec, help="실거래 창고 LAWD_CD:유형[:동] (동 생략 시 PDF 주소에서 추출)")
+    ap.add_argument("--property-type", default="빌라", help="물건종별(기본: 빌라)")
+    ap.add_argument("--interest-rate", type=float, default=5.0, help="금리(연, %%)")
+    ap.add_argument("--holding-days", type=int, default=90)
+    ap.add_argument("--repair-cost", type=int, default=3_000_000)
+    ap.add_argument("--eviction-cost", type=int, default=2_000_000)
+    ap.add_argument("--early-repay-fee-rate", type=float, default=1.2, help="중도상환수수료율(%%)")
+    ap.add_argument("--tax-rate", type=float, default=1.1, help="취득세 등율(%%)")
+    ap.add_argument("--bid-step", type=int, default=1_000_000)
+    ap.add_argument("--workers", type=int, default=None, help="파싱 프로세스 수(기본: CPU-1, 최대 8)")
+    ap.add_argument("--db", default=str(storage.DB_PATH), help="app.db 경로")
+    ap.add_argument("--csv", help="요약 CSV 경로(기본: pdf_dir/batch_summary_YYYYmmdd_HHMMSS.csv)")
+    ap.add_argument("--created-by", default="batch")
+    args = ap.parse_args(argv)
+
+    root = Path(args.pdf_dir)
+    paths = _pdf_paths(root)
+    if not paths:
+        print(f"PDF가 없습니다: {root}", file=sys.stderr)
+        return 1
+
+    Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+    storage.configure(args.db)
+    storage.ensure_schema()
+
+    assumptions = {
+        "interest_rate": args.interest_rate / 100.0,
+        "holding_days": int(args.holding_days),
+        "repair_cost": int(args.repair_cost),
+        "eviction_cost": int(args.eviction_cost),
+        "early_repay_fee_rate": args.early_repay_fee_rate / 100.0,
+        "tax_rate": args.tax_rate / 100.0,
+        "bid_step": int(args.bid_step),
+    }
+    comps_for = _comps_source(args)
+
+    t0 = time.perf_counter()
+    items = bulk_ingest.items_from_paths(paths)
+
+    def _progress(done, total, name):
+        print(f"[{done}/{total}] {name}", file=sys.stderr)
+
+    results = bulk_ingest.ingest(items, max_workers=args.workers, progress=_progress)
+    parse_sec = time.perf_counter() - t0
+
+    rows = [
+        analyze_one(r, it["path"], comps_for, assumptions, args.property_type, args.created_by)
+        for it, r in zip(items, results)
+    ]
+    out_path = args.csv or str((root if root.is_dir() else root.parent) / f"batch_summary_{datetime.now(LOCAL_TZ):%Y%m%d_%H%M%S}.csv")
+    write_summary(rows, out_path)
+
+    saved = sum(1 for r in rows if r["case_id"])
+    print(f"PDF {len(paths)}개(중복 제외 {len(items)}개), 저장 {saved}건, 오류 {len(items) - saved}건, "
+          f"파싱 {parse_sec:.1f}s, 전체 {time.perf_counter() - t0:.1f}s → {out_path}")
+    return 0 if saved == len(items) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""분석 리스트 조회: outputs_json 전체 디코드(기존 list_cases) vs 요약 컬럼 프로젝션.
+
+    python benchmarks/bench_case_list.py --cases 10000
+
+임시 DB에 손익 매트릭스·실거래 표본이 든 케이스를 채운 뒤, 지연(중앙값)과 tracemalloc 최대 메모리를 비교합니다.
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import storage  # noqa: E402
+
+REPEAT = 5
+PAGE = 20
+LIST_SQL = """SELECT created_ts, rowid, id, created_at, case_no, address, status, auction_date,
+                     verdict, loss0_max_bid, recommended_bid
+              FROM cases"""
+
+
+def _outputs(i: int) -> dict:
+    """finalize_analysis 결과와 비슷한 크기(입찰가 41행 매트릭스 + 실거래 30건)."""
+    bids = [240_000_000 + k * 1_000_000 for k in range(41)]
+    return {
+        "sale_range": {"low": 280_000_000, "mid": 300_000_000 + i, "high": 320_000_000, "n": 40},
+        "sale_prices": [280_000_000, 300_000_000 + i, 320_000_000],
+        "matrix": [{"입찰가": b, "하": 280_000_000 - b, "중": 300_000_000 - b, "상": 320_000_000 - b} for b in bids],
+        "loss0_max_bid": 270_000_000 + i,
+        "recommended_bid": "262,000,000 ~ 267,000,000원",
+        "verdict": "진행 가능(조건부)",
+        "verdict_reason": ["손실0 상한이 최저가 이상(손실 금지 조건 충족)"],
+        "comps_sample": [{"계약년월": "202401", "시군구": "묵동", "번지": str(k), "전용면적(㎡)": 59.9,
+                          "거래금액": 30_000 + k, "층": 3, "건축년도": 2005} for k in range(30)],
+    }
+
+
+def seed(n: int):
+    def _rows():
+        for i in range(n):
+            outputs = _outputs(i)
+            summ = storage.case_summary(outputs)
+            yield (str(uuid.uuid4()), "2024-01-01 00:00:00", "작성자", "분석완료", f"2024타경{i}", f"서울 중랑구 묵동 {i}",
+                   "2024-02-01", json.dumps(outputs, ensure_ascii=False), 1_700_000_000 + i,
+                   *(summ[c] for c in storage.CASE_SUMMARY_COLUMNS))
+
+    storage.transaction(lambda cur: cur.executemany(
+        """INSERT INTO cases(id, created_at, created_by, status, case_no, address, auction_date, outputs_json, created_ts,
+                             verdict, loss0_max_bid, recommended_bid, sale_mid, sale_n)
+           VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?)""", _rows()))
+
+
+def list_decode():
+    """기존 list_cases: outputs_json을 모두 읽어 json.loads."""
+    out = []
+    for rowid, rid, created_at, case_no, address, status, auction_date, outputs_json in storage.fetch_all(
+            """SELECT rowid, id, created_at, case_no, address, status, auction_date, outputs_json FROM cases ORDER BY rowid DESC"""):
+        o = json.loads(outputs_json) if outputs_json else {}
+        out.append({"rowid": rowid, "id": rid, "created_at": created_at, "case_no": case_no, "address": address,
+                    "status": status, "auction_date": auction_date,
+                    "loss0_max_bid": o.get("loss0_max_bid"), "recommended_bid": o.get("recommended_bid")})
+    return out
+
+
+def list_projection():
+    """요약 컬럼만(전체 행)."""
+    return storage.fetch_all(LIST_SQL + " ORDER BY created_ts DESC, rowid DESC")
+
+
+def list_first_page():
+    """분석 리스트 화면이 실제로 읽는 키셋 1페이지."""
+    return storage.keyset_page(LIST_SQL, [], [], None, PAGE)[0]
+
+
+def measure(fn):
+    times = []
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times) * 1000, peak / 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--cases", type=int, default=10_000)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(Path(tmp) / "app.db")
+        storage.ensure_schema()
+        seed(args.cases)
+        results = {
+            "decode outputs_json": measure(list_decode),
+            "summary projection": measure(list_projection),
+            f"keyset page ({PAGE})": measure(list_first_page),
+        }
+
+    print(f"{args.cases:,} cases")
+    print(f"{'':22} {'median(ms)':>11} {'peak(MB)':>9}")
+    for name, (ms, mb) in results.items():
+        print(f"{name:22} {ms:11.2f} {mb:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""동/번지 후보 조회: 목록 스캔(기존 실거래 조회 화면) vs LotIndex(bisect).
+
+    python benchmarks/bench_lot_index.py --parcels 50000
+
+rerun 한 번 = 동 목록 + 선택 동의 번지 목록 + (동, 번지) → PNU. 인덱스는 번지 앞자리 검색도 함께 잽니다.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lot_index import LotIndex  # noqa: E402
+
+LOOKUPS = 200
+N_DONGS = 40
+
+
+def make_parcels(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    rows = set()
+    while len(rows) < n:
+        d = rng.randrange(N_DONGS)
+        main, sub = rng.randrange(1, 2_000), rng.randrange(0, 30)
+        bunji = f"{main}-{sub}" if sub else str(main)
+        rows.add((f"동{d:02d}동", bunji, f"11260{d:05d}1{main:04d}{sub:04d}"))
+    return sorted(rows)
+
+
+def rerun_scan(cands, dong, bunji):
+    """기존: 매 rerun마다 후보 목록 전체를 세 번 훑음."""
+    dongs = sorted({c["dong"] for c in cands})
+    bunjis = sorted({c["bunji"] for c in cands if c["dong"] == dong})
+    pick = next((c for c in cands if c["dong"] == dong and c["bunji"] == bunji), None)
+    return dongs, bunjis, pick["pnu"]
+
+
+def rerun_index(idx, dong, bunji):
+    return idx.dongs, idx.bunjis(dong), idx.pnu(dong, bunji)
+
+
+def per_call_us(fn, picks):
+    times = []
+    for dong, bunji in picks:
+        t0 = time.perf_counter()
+        fn(dong, bunji)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--parcels", type=int, default=50_000)
+    args = ap.parse_args(argv)
+
+    rows = make_parcels(args.parcels)
+    cands = [{"dong": d, "bunji": b, "pnu": p} for d, b, p in rows]
+    picks = [(d, b) for d, b, _ in random.Random(1).sample(rows, LOOKUPS)]
+
+    t0 = time.perf_counter()
+    idx = LotIndex(rows)
+    build_ms = (time.perf_counter() - t0) * 1000
+    for dong, bunji in picks:
+        assert rerun_index(idx, dong, bunji)[2] == rerun_scan(cands, dong, bunji)[2]
+
+    scan = per_call_us(lambda d, b: rerun_scan(cands, d, b), picks)
+    indexed = per_call_us(lambda d, b: rerun_index(idx, d, b), picks)
+    pnu_only = per_call_us(idx.pnu, picks)
+    prefix = per_call_us(lambda d, b: idx.search(d, b[:2], limit=50), picks)
+
+    print(f"{args.parcels:,} parcels in {N_DONGS} dongs (index build {build_ms:.0f} ms)")
+    print(f"{'':28} {'median(µs)':>11}")
+    for name, us in (("rerun: list scan", scan), ("rerun: LotIndex", indexed),
+                     ("PNU lookup (bisect)", pnu_only), ("번지 prefix search (2 chars)", prefix)):
+        print(f"{name:28} {us:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""MOLIT 응답 파싱: ET.fromstring 전체 트리(기존) vs iterparse 스트리밍(molit_api.iter_items).
+
+    python benchmarks/bench_molit_parse.py --items 20000
+    python benchmarks/bench_molit_parse.py --xml recorded_response.xml --items 0
+
+기본 입력은 tests/fixtures/molit의 응답 페이지(연립다세대, 60건)이며, --items만큼 item을 반복해 늘립니다
+(헤더·필드 순서·공백/콤마 패딩은 그대로, totalCount만 맞춤). --items 0이면 파일 그대로 씁니다.
+rows/sec(중앙값)와 tracemalloc 최대 메모리(응답 바이트 자체는 제외)를 비교하고,
+같은 폴더의 오류 응답(게이트웨이 cmmMsgHeader, resultCode 오류)이 0건이 아니라 오류로 잡히는지 확인합니다.
+"""
+import argparse
+import io
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import molit_api  # noqa: E402
+
+REPEAT = 5
+FIXTURES = ROOT / "tests" / "fixtures" / "molit"
+DEFAULT_XML = FIXTURES / "rh_trade_202301_p1.xml"
+ERROR_XML = ("gateway_error.xml", "unregistered_key.xml", "result_code_error.xml")
+_ITEMS_RE = re.compile(rb"<items>(.*)</items>", re.S)
+_ITEM_RE = re.compile(rb"<item>.*?</item>", re.S)
+
+
+def tile_items(raw: bytes, n: int) -> bytes:
+    """응답의 item들을 n건이 될 때까지 반복(그 밖의 바이트는 그대로)."""
+    m = _ITEMS_RE.search(raw)
+    items = _ITEM_RE.findall(m.group(1)) if m else []
+    if not n or not items:
+        return raw
+    body = b"".join(items[i % len(items)] for i in range(n))
+    out = raw[:m.start(1)] + body + raw[m.end(1):]
+    return re.sub(rb"<totalCount>\d+</totalCount>", b"<totalCount>%d</totalCount>" % n, out)
+
+
+def parse_tree(raw: bytes):
+    """기존 _molit_fetch_month: r.text → ET.fromstring → .//item마다 findtext."""
+    root = ET.fromstring(raw.decode("utf-8"))
+    rows = []
+    for it in root.findall(".//item"):
+        def t(tag):
+            v = it.findtext(tag)
+            return (v or "").strip()
+        rows.append({
+            "계약년월": f"{t('년')}{t('월').zfill(2)}",
+            "시군구": t("법정동"),
+            "번지": t("지번"),
+            "건물명": t("건물명"),
+            "전용면적(㎡)": t("전용면적"),
+            "거래금액": (t("거래금액") or "").replace(",", ""),
+            "층": t("층"),
+            "건축년도": t("건축년도"),
+        })
+    return rows
+
+
+def parse_stream(raw: bytes):
+    return list(molit_api.iter_items(io.BytesIO(raw)))
+
+
+def measure(fn, raw):
+    times = []
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        n = len(fn(raw))
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(raw)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return n / statistics.median(times), peak / 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--items", type=int, default=20_000, help="item 반복 후 건수(0=파일 그대로)")
+    ap.add_argument("--xml", default=str(DEFAULT_XML), help="MOLIT 응답 XML 파일")
+    args = ap.parse_args(argv)
+
+    raw = tile_items(Path(args.xml).read_bytes(), args.items)
+    n = len(parse_stream(raw))
+    assert n == len(parse_tree(raw))
+    print(f"{n:,} items, {len(raw) / 1e6:.1f} MB response")
+    print(f"{'':22} {'rows/sec':>10} {'peak(MB)':>9}")
+    for name, fn in (("ET.fromstring (tree)", parse_tree), ("iterparse (stream)", parse_stream)):
+        rate, mb = measure(fn, raw)
+        print(f"{name:22} {rate:10,.0f} {mb:9.1f}")
+
+    for name in ERROR_XML:
+        meta = {}
+        n = len(list(molit_api.iter_items(io.BytesIO((FIXTURES / name).read_bytes()), meta)))
+        try:
+            molit_api.check_header(meta)
+            verdict = "NOT DETECTED"
+        except RuntimeError as e:
+            verdict = f"error: {e}"
+        print(f"{name:24} {n} items, {verdict}")
+
+
+if __name__ == "__main__":
+    main()
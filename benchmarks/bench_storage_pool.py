@@ -0,0 +1,144 @@
+"""동시 세션 rerun 지연: 호출마다 sqlite3.connect(기존) vs storage 풀(WAL).
+
+    python benchmarks/bench_storage_pool.py --sessions 20 --reruns 50
+
+세션(스레드)마다 rerun 한 번 = 분석 리스트 1페이지 + 케이스 1건 + 메타 조회 + (가끔) 저장.
+임시 폴더의 DB 두 개(기본 저널 / WAL 풀)에 같은 부하를 걸어 p50/p95/최대 지연과 lock 오류 수를 비교합니다.
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import storage  # noqa: E402
+
+SEED_CASES = 2_000
+WRITE_EVERY = 10  # rerun 10번에 1번꼴로 저장
+
+
+def _seed(path: Path):
+    storage.configure(path)
+    storage.ensure_schema()
+    rows = [(str(uuid.uuid4()), "2024-01-01 00:00:00", f"2024타경{i}", f"서울 중랑구 묵동 {i}", 1_700_000_000 + i, "{}")
+            for i in range(SEED_CASES)]
+    storage.transaction(lambda cur: cur.executemany(
+        """INSERT INTO cases(id, created_at, case_no, address, created_ts, outputs_json) VALUES(?,?,?,?,?,?)""", rows))
+    return [r[0] for r in rows]
+
+
+class ConnectPerCall:
+    """기존 app.py 방식: 헬퍼마다 connect → 실행 → close(기본 rollback 저널).
+
+    시드 DB(풀이 열어 둔 WAL 파일)를 새 파일로 복사한 뒤 저널 모드를 되돌려 씁니다.
+    """
+
+    def __init__(self, seeded_path, path):
+        self.path = str(path)
+        src, dst = sqlite3.connect(str(seeded_path)), sqlite3.connect(self.path)
+        src.backup(dst)
+        dst.execute("PRAGMA journal_mode=DELETE")
+        src.close()
+        dst.close()
+
+    def fetch_all(self, sql, params=()):
+        con = sqlite3.connect(self.path)
+        try:
+            return con.execute(sql, params).fetchall()
+        finally:
+            con.close()
+
+    def execute(self, sql, params=()):
+        con = sqlite3.connect(self.path)
+        try:
+            con.execute(sql, params)
+            con.commit()
+        finally:
+            con.close()
+
+
+class Pooled:
+    def __init__(self, seeded_path):
+        storage.configure(seeded_path)
+
+    def fetch_all(self, sql, params=()):
+        return storage.fetch_all(sql, params)
+
+    def execute(self, sql, params=()):
+        storage.execute(sql, params)
+
+
+def _rerun(db, ids, rng, write):
+    db.fetch_all("""SELECT created_ts, rowid, id, case_no, address FROM cases
+                    ORDER BY created_ts DESC, rowid DESC LIMIT 21""")
+    db.fetch_all("""SELECT * FROM cases WHERE id=?""", (rng.choice(ids),))
+    db.fetch_all("""SELECT value FROM app_meta WHERE key=?""", ("retention_last_run",))
+    if write:
+        db.execute("""INSERT INTO cases(id, created_at, case_no, address, created_ts, outputs_json) VALUES(?,?,?,?,?,?)""",
+                   (str(uuid.uuid4()), "2024-01-02 00:00:00", "2024타경0", "서울", int(time.time()), "{}"))
+
+
+def run(db, ids, sessions, reruns):
+    lat, errors = [], []
+    lock = threading.Lock()
+
+    def _session(k):
+        rng = random.Random(k)
+        mine, errs = [], 0
+        for i in range(reruns):
+            t0 = time.perf_counter()
+            try:
+                _rerun(db, ids, rng, write=(i + k) % WRITE_EVERY == 0)
+            except sqlite3.OperationalError:
+                errs += 1
+            mine.append(time.perf_counter() - t0)
+        with lock:
+            lat.extend(mine)
+            errors.append(errs)
+
+    threads = [threading.Thread(target=_session, args=(k,)) for k in range(sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    lat.sort()
+    return {
+        "p50_ms": statistics.median(lat) * 1000,
+        "p95_ms": lat[int(len(lat) * 0.95) - 1] * 1000,
+        "max_ms": lat[-1] * 1000,
+        "wall_s": wall,
+        "lock_errors": sum(errors),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--reruns", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = Path(tmp) / "pool.db"
+        ids = _seed(seeded)
+        results = {
+            "connect-per-call": run(ConnectPerCall(seeded, Path(tmp) / "plain.db"), ids, args.sessions, args.reruns),
+            "storage pool": run(Pooled(seeded), ids, args.sessions, args.reruns),
+        }
+
+    print(f"{args.sessions} sessions × {args.reruns} reruns")
+    print(f"{'':18} {'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9} {'wall(s)':>8} {'lock err':>9}")
+    for name, r in results.items():
+        print(f"{name:18} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['max_ms']:9.2f} {r['wall_s']:8.2f} {r['lock_errors']:9d}")
+
+
+if __name__ == "__main__":
+    main()
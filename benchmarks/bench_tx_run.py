@@ -0,0 +1,87 @@
+"""실거래 조회 저장본(tx_run): 포맷된 JSON 텍스트(기존) vs 압축 컬럼 블롭(columnar).
+
+    python benchmarks/bench_tx_run.py --rows 50000
+
+같은 표를 두 형식으로 만들어 저장 크기, 전체 로드, 한 컬럼만 로드 시간(중앙값)을 비교합니다.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import columnar  # noqa: E402
+
+REPEAT = 7
+ONE_COLUMN = "거래금액"
+
+
+def make_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    """molit_api 행과 같은 타입(면적 float, 금액/층/건축년도 int, 층 일부 결측)."""
+    rng = np.random.default_rng(seed)
+    dongs = np.array(["묵동", "중화동", "상봉동", "면목동", "신내동", "망우동"])
+    floor = pd.array(rng.integers(-1, 15, n), dtype="Int64")
+    floor[rng.random(n) < 0.02] = pd.NA
+    return pd.DataFrame({
+        "계약년월": [f"2023{m:02d}" for m in rng.integers(1, 13, n)],
+        "시군구": dongs[rng.integers(0, len(dongs), n)],
+        "번지": [f"{a}-{b}" for a, b in zip(rng.integers(1, 999, n), rng.integers(1, 50, n))],
+        "건물명": [f"빌라{k}" for k in rng.integers(0, 3_000, n)],
+        "전용면적(㎡)": np.round(rng.uniform(20, 120, n), 2),
+        "거래금액": rng.integers(10_000, 120_000, n),
+        "층": floor,
+        "건축년도": rng.integers(1985, 2024, n),
+    })
+
+
+def to_legacy_json(df: pd.DataFrame) -> bytes:
+    """기존 save_tx_run: 숫자를 콤마 문자열로 바꾼 레코드 목록 JSON."""
+    view = df.astype(object).where(df.notna(), "")
+    for c in ("거래금액", "건축년도", "층"):
+        view[c] = [f"{int(v):,}" if v != "" else "" for v in view[c]]
+    view["전용면적(㎡)"] = [f"{float(v):,.2f}" for v in view["전용면적(㎡)"]]
+    return json.dumps(view.to_dict(orient="records"), ensure_ascii=False).encode("utf-8")
+
+
+def timed(fn):
+    times = []
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=50_000)
+    args = ap.parse_args(argv)
+
+    df = make_frame(args.rows)
+    legacy = to_legacy_json(df)
+    blob = columnar.encode_frame(df)
+    back = columnar.decode_frame(blob)
+    assert back.shape == df.shape and back[ONE_COLUMN].tolist() == df[ONE_COLUMN].tolist()
+
+    rows = [
+        ("JSON text", len(legacy),
+         timed(lambda: pd.DataFrame(json.loads(legacy.decode("utf-8")))),
+         timed(lambda: pd.DataFrame(json.loads(legacy.decode("utf-8")))[[ONE_COLUMN]])),
+        ("columnar blob", len(blob),
+         timed(lambda: columnar.decode_frame(blob)),
+         timed(lambda: columnar.decode_frame(blob, columns=[ONE_COLUMN]))),
+    ]
+    print(f"{args.rows:,} rows (encode: {timed(lambda: columnar.encode_frame(df)):.1f} ms)")
+    print(f"{'':14} {'size(MB)':>9} {'full load(ms)':>14} {'1 column(ms)':>13}")
+    for name, size, full, one in rows:
+        print(f"{name:14} {size / 1e6:9.2f} {full:14.1f} {one:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""입찰가별 손익 몬테카를로 시뮬레이션.
+
+매도가(유사면적 실거래 표본 부트스트랩), 보유기간, 금리, 수리비, 명도비를 범위에서 뽑아
+시나리오별 '입찰가와 무관한 부분'(base = 매도가 - 고정비)을 한 번만 계산합니다.
+입찰가 b의 손익은 base - b × (1 + 세율)이므로, 정렬된 base 하나로 모든 입찰가의
+손실확률(searchsorted)·기대손익·분위수를 바로 구합니다(입찰가 수 × 시나리오 수 행렬을 만들지 않음).
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_SCENARIOS = 100_000
+DEFAULT_MAX_LOSS_PROB = 0.10
+PERCENTILES = (5, 50, 95)
+TABLE_COLUMNS = ["입찰가", "손실확률(%)", "기대손익", "하위5%", "중앙값", "상위95%"]
+SAVED_SAMPLE_MAX = 200
+
+
+def default_ranges(inputs: dict) -> dict:
+    """분석 가정값을 중심으로 한 기본 분포 범위(균등분포 lo~hi)."""
+    days = int(inputs.get("holding_days") or 90)
+    rate = float(inputs.get("interest_rate") or 0.0)
+    repair = int(inputs.get("repair_cost") or 0)
+    eviction = int(inputs.get("eviction_cost") or 0)
+    return {
+        "holding_days": (max(1, int(days * 0.7)), int(days * 2)),
+        "interest_rate": (round(max(0.0, rate - 0.005), 4), round(rate + 0.01, 4)),
+        "repair_cost": (int(repair * 0.5), int(repair * 2)),
+        "eviction_cost": (int(eviction * 0.5), int(eviction * 2.5)),
+    }
+
+
+def compact_sample(prices, k: int = SAVED_SAMPLE_MAX):
+    """케이스에 저장할 매도가 표본: k건 이하면 그대로, 넘으면 등간격 분위수 위치의 실거래 k건(정렬)."""
+    p = np.sort(np.asarray(prices, dtype=np.float64))
+    if len(p) > k:
+        p = p[((np.arange(k) + 0.5) * len(p) / k).astype(np.int64)]
+    return p.astype(np.int64).tolist()
+
+
+def sale_sample_from_outputs(outputs: dict):
+    """저장된 케이스에서 매도가 표본을 꺼냅니다(구버전 케이스는 None)."""
+    prices = ((outputs or {}).get("sale_range") or {}).get("prices")
+    return [int(p) for p in prices] if prices else None
+
+
+def sample_sale_prices(rng, n: int, prices=None, quartiles=None) -> np.ndarray:
+    """실거래 표본 부트스트랩 + 커널 평활(표본이 적어도 계단형 분포가 되지 않게).
+
+    표본이 없으면 (하, 중, 상) 분위수로 맞춘 정규분포를 씁니다.
+    """
+    if prices is not None and len(prices) >= 2:
+        p = np.asarray(prices, dtype=np.float64)
+        # Silverman 대역폭
+        h = 1.06 * p.std(ddof=1) * len(p) ** (-1 / 5)
+        return p[rng.integers(0, len(p), n)] + rng.normal(0.0, h, n)
+    low, mid, high = (float(q) for q in quartiles)
+    sigma = max(high - low, 1.0) / 1.349
+    return rng.normal(mid, sigma, n)
+
+
+def scenario_base(n: int, ranges: dict, loan_amount, early_repay_fee_rate, prices=None, quartiles=None, seed=None) -> np.ndarray:
+    """시나리오별 (매도가 - 수리비 - 명도비 - 이자 - 중도상환수수료), 오름차순 정렬."""
+    rng = np.random.default_rng(seed)
+    sale = sample_sale_prices(rng, n, prices, quartiles)
+    days = rng.uniform(*ranges["holding_days"], n)
+    rate = rng.uniform(*ranges["interest_rate"], n)
+    repair = rng.uniform(*ranges["repair_cost"], n)
+    eviction = rng.uniform(*ranges["eviction_cost"], n)
+    interest = loan_amount * rate * (days / 365.0)
+    base = sale - repair - eviction - interest - loan_amount * early_repay_fee_rate
+    base.sort()
+    return base
+
+
+def bid_table(base: np.ndarray, bids, tax_rate) -> pd.DataFrame:
+    """정렬된 base → 입찰가별 손실확률/기대손익/분위수 표."""
+    bids = np.asarray(bids, dtype=np.int64)
+    cost = bids * (1.0 + tax_rate)
+    n = len(base)
+    loss_prob = np.searchsorted(base, cost, side="left") / n
+    pct = np.percentile(base, PERCENTILES)
+    return pd.DataFrame({
+        "입찰가": bids,
+        "손실확률(%)": np.round(loss_prob * 100.0, 1),
+        "기대손익": np.rint(base.mean() - cost).astype(np.int64),
+        "하위5%": np.rint(pct[0] - cost).astype(np.int64),
+        "중앙값": np.rint(pct[1] - cost).astype(np.int64),
+        "상위95%": np.rint(pct[2] - cost).astype(np.int64),
+    }, columns=TABLE_COLUMNS)
+
+
+def max_bid_for_loss_prob(table: pd.DataFrame, max_loss_prob: float = DEFAULT_MAX_LOSS_PROB):
+    """손실확률이 max_loss_prob 이하인 최대 입찰가(없으면 None)."""
+    ok = table[table["손실확률(%)"] <= max_loss_prob * 100.0]
+    return int(ok["입찰가"].max()) if len(ok) else None
+
+
+def simulate(bids, tax_rate, loan_amount, early_repay_fee_rate, ranges: dict,
+             prices=None, quartiles=None, n: int = DEFAULT_SCENARIOS, seed=None) -> pd.DataFrame:
+    base = scenario_base(int(n), ranges, float(loan_amount), float(early_repay_fee_rate), prices, quartiles, seed)
+    return bid_table(base, bids, float(tax_rate))
@@ -0,0 +1,149 @@
+"""경매 PDF 일괄 스크리닝(여러 PDF 또는 zip).
+
+PyPDF2 텍스트 추출이 GIL에 묶이지 않도록 프로세스 풀에서 파싱하고,
+결과는 PDF 파싱 캐시(pdf_cache)에 넣어 단건 분석으로 넘길 때 다시 파싱하지 않습니다.
+DB 접근은 부모 프로세스에서만 합니다(워커는 순수 파싱만).
+"""
+import hashlib
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path, PurePosixPath
+
+import pandas as pd
+
+import auction_pdf
+import pdf_cache
+
+MAX_ZIP_MEMBERS = 500
+HASH_CHUNK = 1 << 20
+SCREEN_COLUMNS = ["파일", "사건번호", "주소", "전용면적(㎡)", "감정가", "최저가", "최저가율(%)", "차수", "매각기일", "오류"]
+
+
+def default_workers() -> int:
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+def expand_uploads(files):
+    """[(name, bytes)] → PDF 목록(zip은 내부 PDF로 펼침). 같은 내용은 한 번만."""
+    out = []
+    seen = set()
+
+    def _add(name, data):
+        digest = pdf_cache.content_hash(data)
+        if digest in seen:
+            return
+        seen.add(digest)
+        out.append({"name": name, "sha256": digest, "bytes": data})
+
+    for name, data in files:
+        if str(name).lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                members = [m for m in zf.infolist() if not m.is_dir() and m.filename.lower().endswith(".pdf")]
+                for m in members[:MAX_ZIP_MEMBERS]:
+                    if PurePosixPath(m.filename).name.startswith("._"):
+                        continue  # macOS 리소스 포크
+                    _add(PurePosixPath(m.filename).name, zf.read(m))
+        else:
+            _add(name, data)
+    return out
+
+
+def _file_hash(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def items_from_paths(paths):
+    """디스크의 PDF 경로들 → ingest 입력(바이트는 워커가 직접 읽음). 같은 내용은 한 번만."""
+    out = []
+    seen = set()
+    for p in paths:
+        p = Path(p)
+        digest = _file_hash(p)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        out.append({"name": p.name, "sha256": digest, "path": str(p)})
+    return out
+
+
+def _parse_worker(pdf_bytes, text=None, path=None):
+    """워커 프로세스: (text, subject, err). path를 주면 워커에서 파일을 읽습니다."""
+    try:
+        if text is None:
+            if pdf_bytes is None and path:
+                with open(path, "rb") as f:
+                    pdf_bytes = f.read()
+            text = auction_pdf.extract_pdf_text(pdf_bytes)
+        return text, auction_pdf.parse_auction_text(text), None
+    except Exception as e:
+        return text, None, str(e)
+
+
+def ingest(items, max_workers: int = None, progress=None):
+    """PDF들을 병렬 파싱합니다. 반환: [{"name", "sha256", "subject", "error"}] (입력 순서)
+
+    items는 expand_uploads(바이트) 또는 items_from_paths(경로) 결과입니다.
+
+    캐시 적중(같은 파서 버전)은 풀에 보내지 않습니다.
+    progress(done, total, name)를 넘기면 파일마다 호출됩니다.
+    """
+    results = [None] * len(items)
+    todo = []
+    done = 0
+    for i, it in enumerate(items):
+        text, subject = pdf_cache.get(it["sha256"], auction_pdf.PARSER_VERSION)
+        if subject is not None:
+            results[i] = {"name": it["name"], "sha256": it["sha256"], "subject": subject, "error": None}
+            done += 1
+            if progress:
+                progress(done, len(items), it["name"])
+        else:
+            todo.append((i, text))
+
+    if todo:
+        workers = max(1, min(int(max_workers or default_workers()), len(todo)))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futs = {ex.submit(_parse_worker, items[i].get("bytes"), text, items[i].get("path")): i for i, text in todo}
+            for fut in as_completed(futs):
+                i = futs[fut]
+                it = items[i]
+                try:
+                    text, subject, err = fut.result()
+                except Exception as e:
+                    text, subject, err = None, None, str(e)
+                if subject is not None:
+                    try:
+                        pdf_cache.put(it["sha256"], auction_pdf.PARSER_VERSION, text, subject)
+                    except Exception:
+                        pass
+                results[i] = {"name": it["name"], "sha256": it["sha256"], "subject": subject, "error": err}
+                done += 1
+                if progress:
+                    progress(done, len(items), it["name"])
+    return results
+
+
+def screening_frame(results) -> pd.DataFrame:
+    rows = []
+    for r in results:
+        s = r.get("subject") or {}
+        rows.append({
+            "파일": r.get("name"),
+            "사건번호": s.get("case_no"),
+            "주소": s.get("address"),
+            "전용면적(㎡)": s.get("area_m2"),
+            "감정가": s.get("appraisal"),
+            "최저가": s.get("min_price"),
+            "최저가율(%)": s.get("min_price_pct"),
+            "차수": s.get("current_round"),
+            "매각기일": s.get("auction_date"),
+            "오류": r.get("error"),
+            "sha256": r.get("sha256"),
+        })
+    return pd.DataFrame(rows, columns=SCREEN_COLUMNS + ["sha256"])
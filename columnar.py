@@ -0,0 +1,114 @@
+"""실거래 표(DataFrame) ↔ 압축 컬럼 블롭 변환.
+
+형식: MAGIC + 헤더 길이(4바이트) + 헤더 JSON + 컬럼별 zlib 세그먼트
+- 정수 컬럼: int64 원시 바이트(+ 결측 마스크)
+- 실수 컬럼: float64 원시 바이트(결측은 NaN)
+- 그 외: JSON 리스트
+헤더에 세그먼트 오프셋이 있어 필요한 컬럼만 골라 압축 해제할 수 있습니다.
+"""
+import json
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"TXC1"
+COMPRESS_LEVEL = 6
+
+
+def _json_value(v):
+    if v is None:
+        return None
+    try:
+        if pd.isna(v):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(v, "item"):
+        return v.item()
+    return v
+
+
+def encode_frame(df: pd.DataFrame) -> bytes:
+    cols_meta = []
+    segments = []
+    offset = 0
+
+    def _add(raw: bytes):
+        nonlocal offset
+        comp = zlib.compress(raw, COMPRESS_LEVEL)
+        seg = (offset, len(comp))
+        segments.append(comp)
+        offset += len(comp)
+        return seg
+
+    for name in df.columns:
+        s = df[name]
+        meta = {"name": str(name)}
+        if pd.api.types.is_bool_dtype(s):
+            meta["kind"] = "str"
+            meta["data"] = _add(json.dumps([_json_value(v) for v in s], ensure_ascii=False).encode("utf-8"))
+        elif pd.api.types.is_integer_dtype(s):
+            mask = s.isna().to_numpy()
+            meta["kind"] = "i8"
+            meta["data"] = _add(s.fillna(0).to_numpy(dtype=np.int64).tobytes())
+            if mask.any():
+                meta["mask"] = _add(np.packbits(mask).tobytes())
+        elif pd.api.types.is_float_dtype(s):
+            meta["kind"] = "f8"
+            meta["data"] = _add(s.to_numpy(dtype=np.float64).tobytes())
+        else:
+            meta["kind"] = "str"
+            meta["data"] = _add(
+                json.dumps([_json_value(v) for v in s], ensure_ascii=False, default=str).encode("utf-8")
+            )
+        cols_meta.append(meta)
+
+    header = json.dumps({"n": int(len(df)), "columns": cols_meta}, ensure_ascii=False).encode("utf-8")
+    return MAGIC + struct.pack("<I", len(header)) + header + b"".join(segments)
+
+
+def _read_header(blob: bytes):
+    if not blob or blob[:4] != MAGIC:
+        raise ValueError("columnar 블롭 형식이 아닙니다.")
+    (hlen,) = struct.unpack("<I", blob[4:8])
+    header = json.loads(blob[8:8 + hlen].decode("utf-8"))
+    return header, 8 + hlen
+
+
+def frame_columns(blob: bytes) -> list:
+    header, _ = _read_header(blob)
+    return [c["name"] for c in header["columns"]]
+
+
+def decode_frame(blob: bytes, columns=None) -> pd.DataFrame:
+    """블롭 → DataFrame. columns를 주면 해당 컬럼 세그먼트만 압축 해제합니다."""
+    header, base = _read_header(blob)
+    n = int(header["n"])
+    want = None if columns is None else set(columns)
+
+    def _seg(span):
+        off, ln = span
+        return zlib.decompress(blob[base + off: base + off + ln])
+
+    data = {}
+    for meta in header["columns"]:
+        name = meta["name"]
+        if want is not None and name not in want:
+            continue
+        kind = meta["kind"]
+        if kind == "i8":
+            arr = np.frombuffer(_seg(meta["data"]), dtype=np.int64, count=n)
+            if "mask" in meta:
+                mask = np.unpackbits(np.frombuffer(_seg(meta["mask"]), dtype=np.uint8))[:n].astype(bool)
+                data[name] = pd.array(np.where(mask, 0, arr), dtype="Int64")
+                data[name][mask] = pd.NA
+            else:
+                data[name] = arr.copy()
+        elif kind == "f8":
+            data[name] = np.frombuffer(_seg(meta["data"]), dtype=np.float64, count=n).copy()
+        else:
+            data[name] = json.loads(_seg(meta["data"]).decode("utf-8"))
+    order = [m["name"] for m in header["columns"] if m["name"] in data]
+    return pd.DataFrame(data, columns=order)
@@ -0,0 +1,262 @@
+"""실거래 엑셀 1회 읽기 + 내용 해시 캐시.
+
+워크북을 openpyxl read-only 모드로 한 번만 훑으며 필요한 컬럼만 꺼내 타입을 맞춘 표를 만들고,
+SHA-256으로 프로세스 캐시에 둡니다. 매도가능가 추정(area_m2/price), 결과 화면 표본,
+실거래 조회 표는 모두 이 표에서 파생합니다(같은 파일을 다시 파싱하지 않음).
+
+구/시 단위 대용량 내보내기(수십만 행, CSV 포함)는 stream_comps로 행을 읽는 즉시
+면적 구간·지하층을 걸러 필요한 표본만 남깁니다. 앞쪽 안내문 줄과 '거래금액(만원)' 컬럼도 처리합니다.
+"""
+import csv
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import chain
+
+import pandas as pd
+
+VIEW_COLUMNS = ["계약년월", "시군구", "번지", "건물명", "전용면적(㎡)", "거래금액", "면적단가", "층", "건축년도"]
+NUMERIC_COLUMNS = {"전용면적(㎡)", "거래금액", "면적단가", "층", "건축년도"}
+AREA_NAMES = ("전용면적(㎡)", "전용면적")
+PRICE_NAMES = ("거래금액", "거래금액(원)", "매매금액")
+MAX_CACHED = 8
+HEADER_SCAN_ROWS = 30
+CSV_ENCODINGS = ("utf-8-sig", "cp949")
+CSV_SNIFF_BYTES = 64 * 1024
+STREAM_MIN_BYTES = 10 * 1024 * 1024
+STREAM_BAND_M2 = 10.0
+CHUNK_ROWS = 20_000
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _find_columns(names):
+    """헤더 → {"area": i, "price": i, 보기컬럼: i} (parse_comps_xlsx와 같은 우선순위)."""
+    pos = {}
+    for i, n in enumerate(names):
+        pos.setdefault(n, i)
+    found = {c: pos[c] for c in VIEW_COLUMNS if c in pos}
+
+    area = next((pos[n] for n in AREA_NAMES if n in pos), None)
+    price = next((pos[n] for n in PRICE_NAMES if n in pos), None)
+    # 안전장치: 유사 키워드로라도 찾기
+    for i, k in enumerate(names):
+        if area is None and ("전용" in k and "면적" in k):
+            area = i
+        if price is None and ("거래" in k and ("금액" in k or "가격" in k)):
+            price = i
+    if area is not None:
+        found["area_m2"] = area
+    if price is not None:
+        found["price"] = price
+    return found
+
+
+def _to_number(s: pd.Series) -> pd.Series:
+    if not pd.api.types.is_numeric_dtype(s):
+        s = s.map(lambda v: v.replace(",", "").strip() if isinstance(v, str) else v)
+    return pd.to_numeric(s, errors="coerce")
+
+
+def _scalar_number(v):
+    if v is None or isinstance(v, (int, float)):
+        return v
+    try:
+        t = str(v).replace(",", "").strip()
+        return float(t) if t else None
+    except ValueError:
+        return None
+
+
+def _price_scale(name: str) -> int:
+    """'거래금액(만원)'처럼 만원 단위 컬럼이면 원으로 환산."""
+    return 10_000 if "만원" in str(name) else 1
+
+
+@contextmanager
+def _open_binary(source):
+    """bytes 또는 파일 경로 → 바이너리 파일 객체."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        with open(source, "rb") as f:
+            yield f
+
+
+def _csv_encoding(f) -> str:
+    head = f.read(CSV_SNIFF_BYTES)
+    f.seek(0)
+    for enc in CSV_ENCODINGS:
+        try:
+            head.decode(enc)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return CSV_ENCODINGS[-1]
+
+
+def _iter_rows(source):
+    """첫 시트(또는 CSV)의 행을 튜플로 하나씩 yield 합니다. xlsx/CSV는 파일 전체를 표로 만들지 않습니다."""
+    with _open_binary(source) as f:
+        magic = f.read(8)
+        f.seek(0)
+        if magic[:2] == b"PK":
+            from openpyxl import load_workbook
+
+            wb = load_workbook(f, read_only=True, data_only=True)
+            try:
+                yield from wb.worksheets[0].iter_rows(values_only=True)
+            finally:
+                wb.close()
+        elif magic == _OLE_MAGIC:
+            # 구형 .xls는 스트리밍 리더가 없어 pandas 엔진으로 읽습니다
+            df = pd.read_excel(f, header=None)
+            for row in df.itertuples(index=False, name=None):
+                yield tuple(None if (isinstance(v, float) and v != v) else v for v in row)
+        else:
+            text = io.TextIOWrapper(f, encoding=_csv_encoding(f), newline="")
+            try:
+                for row in csv.reader(text):
+                    yield tuple(v if v != "" else None for v in row)
+            finally:
+                text.detach()
+
+
+def _split_header(rows):
+    """앞쪽 안내문 줄을 건너뛰고 면적/금액 컬럼이 있는 줄을 헤더로 씁니다(없으면 첫 줄)."""
+    buffered = []
+    for row in rows:
+        buffered.append(row)
+        names = [str(h).strip() if h is not None else f"Unnamed: {i}" for i, h in enumerate(row)]
+        found = _find_columns(names)
+        if "area_m2" in found and "price" in found:
+            return names, rows
+        if len(buffered) >= HEADER_SCAN_ROWS:
+            break
+    if not buffered:
+        return [], iter(())
+    first = buffered[0]
+    names = [str(h).strip() if h is not None else f"Unnamed: {i}" for i, h in enumerate(first)]
+    return names, chain(buffered[1:], rows)
+
+
+def _collect(source, area_m2=None, band=None, drop_basement=False):
+    """필요한 컬럼만 모아 타입 지정된 표를 만듭니다.
+
+    area_m2/band를 주면 면적 구간 밖 행, drop_basement면 지하층(층=-1) 행을 읽는 즉시 버립니다.
+    """
+    names, rows = _split_header(_iter_rows(source))
+    wanted = _find_columns(names)
+    if not wanted:
+        wanted = {n: i for i, n in enumerate(names)}
+    picks = list(wanted.items())
+    width = len(names)
+    i_area = wanted.get("area_m2")
+    i_floor = wanted.get("층")
+    lo = hi = None
+    if area_m2 is not None and band is not None:
+        lo, hi = float(area_m2) - float(band), float(area_m2) + float(band)
+    scale = _price_scale(names[wanted["price"]]) if "price" in wanted else 1
+
+    def _typed(cols):
+        part = pd.DataFrame(cols, columns=list(cols))
+        for c in part.columns:
+            if c in NUMERIC_COLUMNS or c in ("area_m2", "price"):
+                part[c] = _to_number(part[c])
+        if scale != 1:
+            part["price"] = part["price"] * scale
+        return part
+
+    # 남은 행도 CHUNK_ROWS마다 타입 지정된 조각으로 바꿔 파이썬 객체 리스트가 쌓이지 않게 합니다
+    parts = []
+    cols = {name: [] for name in wanted}
+    pending = 0
+    for row in rows:
+        if row is None or not any(v is not None for v in row[:width]):
+            continue  # 빈 줄(서식만 남은 행)
+        n = len(row)
+        if lo is not None:
+            a = _scalar_number(row[i_area]) if i_area is not None and i_area < n else None
+            if a is None or not (lo <= a <= hi):
+                continue
+        if drop_basement and i_floor is not None and i_floor < n and _scalar_number(row[i_floor]) == -1:
+            continue
+        for name, i in picks:
+            cols[name].append(row[i] if i < n else None)
+        pending += 1
+        if pending >= CHUNK_ROWS:
+            parts.append(_typed(cols))
+            cols = {name: [] for name in wanted}
+            pending = 0
+    if pending or not parts:
+        parts.append(_typed(cols))
+
+    df = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+    if "price" in wanted and "거래금액" not in df.columns:
+        df["거래금액"] = df["price"]
+    if "area_m2" in wanted and "전용면적(㎡)" not in df.columns:
+        df["전용면적(㎡)"] = df["area_m2"]
+    df.attrs["source_columns"] = names
+    return df
+
+
+def read_comps(source) -> pd.DataFrame:
+    """실거래 엑셀/CSV → 타입 지정된 표(보기 컬럼 + area_m2/price=원). 수정하지 말고 복사해서 쓰세요."""
+    return _collect(source)
+
+
+def stream_comps(source, area_m2, band: float = STREAM_BAND_M2) -> pd.DataFrame:
+    """대용량 실거래 파일에서 대상면적 ±band㎡, 지상층 행만 남긴 표(read_comps와 같은 컬럼).
+
+    행을 읽는 즉시 걸러서 메모리는 파일 크기가 아니라 남는 표본 수에 비례합니다.
+    estimator_frame/comps_sample_view(±10㎡)에 그대로 넘길 수 있습니다.
+    """
+    return _collect(source, area_m2=area_m2, band=band, drop_basement=True)
+
+
+def should_stream(size_bytes: int, name: str = "") -> bool:
+    """CSV이거나 STREAM_MIN_BYTES 이상이면 면적 구간 스트리밍으로 읽습니다."""
+    return str(name).lower().endswith(".csv") or int(size_bytes) >= STREAM_MIN_BYTES
+
+
+def load_comps(xlsx_bytes: bytes) -> pd.DataFrame:
+    """read_comps + SHA-256 캐시(같은 파일은 한 번만 파싱)."""
+    digest = hashlib.sha256(xlsx_bytes).hexdigest()
+    with _CACHE_LOCK:
+        df = _CACHE.get(digest)
+        if df is not None:
+            _CACHE.move_to_end(digest)
+            return df
+    df = read_comps(xlsx_bytes)
+    with _CACHE_LOCK:
+        _CACHE[digest] = df
+        while len(_CACHE) > MAX_CACHED:
+            _CACHE.popitem(last=False)
+    return df
+
+
+def estimator_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """estimate_sale_price_range 입력(area_m2, price=원, 잡음/지하층 제거)."""
+    if "area_m2" not in df.columns or "price" not in df.columns:
+        raise ValueError(f"실거래 엑셀에서 필수 컬럼을 찾지 못했습니다. 컬럼={df.attrs.get('source_columns') or list(df.columns)}")
+    out = df
+    if "층" in out.columns:
+        out = out[out["층"].ne(-1) | out["층"].isna()]
+    out = out[["area_m2", "price"]].dropna(subset=["area_m2", "price"])
+    return out[(out["area_m2"] > 5) & (out["price"] > 10_000_000)]
+
+
+def view_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """실거래 조회/결과 표본용 표(면적단가 보충, 지하층 제외)."""
+    keep_cols = [c for c in VIEW_COLUMNS if c in df.columns]
+    out = df[keep_cols].copy() if keep_cols else df.drop(columns=["area_m2", "price"], errors="ignore").copy()
+    if "면적단가" not in out.columns and {"거래금액", "전용면적(㎡)"} <= set(out.columns):
+        out["면적단가"] = (out["거래금액"] / out["전용면적(㎡)"]).round()
+        out = out[[c for c in VIEW_COLUMNS if c in out.columns]]
+    if "층" in out.columns:
+        out = out[out["층"].ne(-1) | out["층"].isna()]
+    return out
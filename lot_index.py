@@ -0,0 +1,72 @@
+"""동/번지 후보 메모리 인덱스(동 → 정렬된 번지 → PNU).
+
+parcels 테이블을 시군구 단위로 한 번 읽어 만들고, 프로세스 캐시에 둡니다.
+인덱스는 parcel_sync.fetched_ts가 바뀌면(후보 새로 받기) 다시 만들어집니다.
+번지 조회/앞자리 검색은 bisect로 O(log n)입니다.
+"""
+import threading
+from bisect import bisect_left
+
+import storage
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class LotIndex:
+    def __init__(self, rows):
+        by_dong = {}
+        for dong, bunji, pnu in rows:
+            by_dong.setdefault(dong, {}).setdefault(bunji, pnu)
+        self.dongs = sorted(by_dong)
+        self._bunjis = {}
+        self._pnus = {}
+        for dong, m in by_dong.items():
+            keys = sorted(m)
+            self._bunjis[dong] = keys
+            self._pnus[dong] = [m[k] for k in keys]
+        self.size = sum(len(v) for v in self._bunjis.values())
+
+    def bunjis(self, dong: str):
+        return self._bunjis.get(dong, [])
+
+    def pnu(self, dong: str, bunji: str):
+        keys = self._bunjis.get(dong)
+        if not keys:
+            return None
+        i = bisect_left(keys, bunji)
+        if i < len(keys) and keys[i] == bunji:
+            return self._pnus[dong][i]
+        return None
+
+    def search(self, dong: str, prefix: str, limit: int = None):
+        """앞자리가 prefix인 번지 목록(정렬 순서)."""
+        keys = self._bunjis.get(dong, [])
+        prefix = str(prefix or "").strip()
+        if not prefix:
+            return keys if limit is None else keys[:limit]
+        lo = bisect_left(keys, prefix)
+        hi = bisect_left(keys, prefix + "\uffff", lo)
+        if limit is not None:
+            hi = min(hi, lo + int(limit))
+        return keys[lo:hi]
+
+
+def build_index(region: str) -> LotIndex:
+    return LotIndex(storage.fetch_all(
+        """SELECT dong, bunji, pnu FROM parcels WHERE region=?""", (region,)
+    ))
+
+
+def get_index(region: str) -> LotIndex:
+    """프로세스 캐시에서 인덱스를 꺼냅니다(적재 시각이 바뀌었으면 재생성)."""
+    row = storage.fetch_one("""SELECT fetched_ts FROM parcel_sync WHERE region=?""", (region,))
+    stamp = row[0] if row else None
+    with _CACHE_LOCK:
+        hit = _CACHE.get(region)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+    idx = build_index(region)
+    with _CACHE_LOCK:
+        _CACHE[region] = (stamp, idx)
+    return idx
@@ -0,0 +1,322 @@
+"""국토부(MOLIT) 실거래 API 클라이언트.
+
+- keep-alive 세션 1개를 프로세스 전체에서 공유(요청마다 TCP/TLS 핸드셰이크 반복 방지)
+- 월별 조회를 스레드 풀로 병렬 수행(max_in_flight) + 호스트별 초당 요청 제한
+- 결과는 월 순서대로 병합하고, 월별 오류는 따로 모아 반환
+- 월별 응답은 app.db(molit_cache)에 캐시: 정산된 과거 월은 불변, 최근 월은 짧은 TTL
+- 응답은 iterparse로 스트리밍 파싱(item 단위로 비움) + numOfRows/pageNo 페이지 순회
+"""
+import io
+import json
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import storage
+
+MOLIT_BASE_URL = "https://openapi.molit.go.kr/OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc"
+MOLIT_ENDPOINTS = {
+    "아파트": "getRTMSDataSvcAptTradeDev",
+    "연립다세대": "getRTMSDataSvcRHTrade",
+}
+REQUEST_TIMEOUT = 15
+DEFAULT_MAX_IN_FLIGHT = 6
+DEFAULT_RATE_PER_SEC = 8.0
+POOL_MAXSIZE = 16
+PAGE_SIZE = 1000
+_OK_CODES = {"00", "000"}
+_HEADER_TAGS = {"resultCode", "resultMsg", "totalCount", "numOfRows", "pageNo"}
+# data.go.kr 게이트웨이 오류 봉투(OpenAPI_ServiceResponse/cmmMsgHeader): HTTP 200에 resultCode 없이 옴
+_ERROR_TAGS = {"errMsg", "returnAuthMsg", "returnReasonCode"}
+# 계약 후 신고 기한(30일) 때문에 최근 월은 계속 바뀝니다. 이보다 오래된 월은 불변으로 취급
+DEFAULT_SETTLE_MONTHS = 2
+DEFAULT_RECENT_TTL_SEC = 6 * 3600
+
+CACHE_STATS = {"hit": 0, "miss": 0}
+_STATS_LOCK = threading.Lock()
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """프로세스 공용 keep-alive 세션."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _SESSION = s
+    return _SESSION
+
+
+class RateLimiter:
+    """토큰 버킷(초당 rate개, 최대 burst개)."""
+
+    def __init__(self, rate_per_sec: float, burst: int = None):
+        self.rate = max(0.1, float(rate_per_sec))
+        self.capacity = float(burst or max(1, int(self.rate)))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_limiter(url: str, rate_per_sec: float) -> RateLimiter:
+    host = urlsplit(url).netloc
+    with _LIMITERS_LOCK:
+        lim = _LIMITERS.get(host)
+        if lim is None or lim.rate != max(0.1, float(rate_per_sec)):
+            lim = RateLimiter(rate_per_sec)
+            _LIMITERS[host] = lim
+        return lim
+
+
+def endpoint_url(property_type: str, base_url: str = None) -> str:
+    name = MOLIT_ENDPOINTS.get(property_type) or MOLIT_ENDPOINTS["연립다세대"]
+    return f"{(base_url or MOLIT_BASE_URL).rstrip('/')}/{name}"
+
+
+def _int(v):
+    try:
+        v = (v or "").replace(",", "").strip()
+        return int(float(v)) if v else None
+    except ValueError:
+        return None
+
+
+def _float(v):
+    try:
+        v = (v or "").replace(",", "").strip()
+        return float(v) if v else None
+    except ValueError:
+        return None
+
+
+def _typed_row(f: dict) -> dict:
+    return {
+        "계약년월": f"{f.get('년', '')}{f.get('월', '').zfill(2)}",
+        "시군구": f.get("법정동", ""),
+        "번지": f.get("지번", ""),
+        "건물명": f.get("건물명", ""),
+        "전용면적(㎡)": _float(f.get("전용면적")),
+        "거래금액": _int(f.get("거래금액")),  # 만원
+        "층": _int(f.get("층")),
+        "건축년도": _int(f.get("건축년도")),
+    }
+
+
+def iter_items(stream, meta: dict = None):
+    """응답 바이트 스트림을 item 단위로 파싱해 타입 변환된 행을 yield 합니다.
+
+    끝난 item은 부모에서 바로 떼어내 트리가 커지지 않게 하고,
+    헤더/바디의 resultCode·totalCount 등은 meta(dict)에 채웁니다.
+    """
+    meta = meta if meta is not None else {}
+    parent = None
+    fields = None
+    for event, el in ET.iterparse(stream, events=("start", "end")):
+        tag = el.tag
+        if event == "start":
+            if tag == "items":
+                parent = el
+            elif tag == "item":
+                fields = {}
+            continue
+        if tag == "item":
+            yield _typed_row(fields)
+            fields = None
+            el.clear()
+            if parent is not None:
+                parent.clear()
+        elif fields is not None:
+            fields[tag] = (el.text or "").strip()
+        elif tag in _HEADER_TAGS or tag in _ERROR_TAGS:
+            meta[tag] = (el.text or "").strip()
+
+
+def parse_items(xml_text):
+    """응답 전체(문자열/바이트) → 행 목록."""
+    if isinstance(xml_text, str):
+        xml_text = xml_text.encode("utf-8")
+    return list(iter_items(io.BytesIO(xml_text)))
+
+
+def check_header(meta: dict):
+    """정상 헤더(resultCode 00/000)가 확인되지 않은 페이지는 RuntimeError.
+
+    게이트웨이 오류 봉투(한도 초과, 미등록 키 등)는 item이 없어 0건으로 읽히므로,
+    그대로 두면 빈 달이 캐시/창고에 확정값으로 남습니다.
+    """
+    if any(meta.get(t) for t in _ERROR_TAGS):
+        reason = meta.get("returnReasonCode") or ""
+        msg = meta.get("returnAuthMsg") or meta.get("errMsg") or ""
+        raise RuntimeError(f"{reason} {msg}".strip())
+    code = meta.get("resultCode")
+    if not code:
+        raise RuntimeError("응답 헤더(resultCode) 없음")
+    if code not in _OK_CODES:
+        raise RuntimeError(f"{code} {meta.get('resultMsg') or ''}".strip())
+
+
+def _fetch_pages(url: str, params: dict, rate_per_sec: float):
+    """pageNo를 올려가며 totalCount만큼 받습니다(페이지마다 스트리밍 파싱)."""
+    rows = []
+    page = 1
+    while True:
+        meta = {}
+        get_limiter(url, rate_per_sec).acquire()
+        with get_session().get(
+            url, params={**params, "pageNo": page, "numOfRows": PAGE_SIZE}, timeout=REQUEST_TIMEOUT, stream=True,
+        ) as r:
+            r.raise_for_status()
+            r.raw.decode_content = True
+            n_before = len(rows)
+            rows.extend(iter_items(r.raw, meta))
+        check_header(meta)
+        total = _int(meta.get("totalCount")) or 0
+        if len(rows) == n_before or len(rows) >= total:
+            return rows
+        page += 1
+
+
+def months_ago(yyyymm: str, today=None) -> int:
+    today = today or datetime.now()
+    return (today.year - int(yyyymm[:4])) * 12 + (today.month - int(yyyymm[4:6]))
+
+
+def is_settled(yyyymm: str, settle_months: int = DEFAULT_SETTLE_MONTHS, today=None) -> bool:
+    return months_ago(yyyymm, today) >= int(settle_months)
+
+
+def is_fresh(yyyymm: str, fetched_ts, settle_months: int = DEFAULT_SETTLE_MONTHS,
+             recent_ttl_sec: int = DEFAULT_RECENT_TTL_SEC, now: float = None) -> bool:
+    """받아 둔 월 응답을 다시 받지 않아도 되는지.
+
+    정산 여부는 오늘이 아니라 받은 시점(fetched_ts) 기준입니다. 최근 월일 때 받은 응답은
+    나중에 그 월이 정산 구간으로 넘어가도 늦게 신고된 거래가 빠져 있으므로 TTL로 만료시킵니다.
+    """
+    fetched_ts = float(fetched_ts or 0)
+    if is_settled(yyyymm, settle_months, today=datetime.fromtimestamp(fetched_ts)):
+        return True
+    now = time.time() if now is None else now
+    return now - fetched_ts <= recent_ttl_sec
+
+
+def _count(key: str, stats: dict = None):
+    with _STATS_LOCK:
+        CACHE_STATS[key] += 1
+        if stats is not None:
+            stats[key] = stats.get(key, 0) + 1
+
+
+def cache_get(lawd_cd: str, yyyymm: str, property_type: str,
+              settle_months: int = DEFAULT_SETTLE_MONTHS, recent_ttl_sec: int = DEFAULT_RECENT_TTL_SEC):
+    """캐시된 월 응답(rows) 또는 None(없음/만료)."""
+    row = storage.fetch_one(
+        """SELECT fetched_ts, rows_z FROM molit_cache WHERE lawd_cd=? AND deal_ym=? AND property_type=?""",
+        (lawd_cd, yyyymm, property_type),
+    )
+    if not row:
+        return None
+    fetched_ts, rows_z = row
+    if not is_fresh(yyyymm, fetched_ts, settle_months, recent_ttl_sec):
+        return None
+    try:
+        return json.loads(zlib.decompress(rows_z).decode("utf-8")) if rows_z else []
+    except Exception:
+        return None
+
+
+def cache_put(lawd_cd: str, yyyymm: str, property_type: str, rows):
+    rows_z = zlib.compress(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+    storage.execute(
+        """INSERT OR REPLACE INTO molit_cache(lawd_cd, deal_ym, property_type, fetched_ts, row_count, rows_z)
+           VALUES(?,?,?,?,?,?)""",
+        (lawd_cd, yyyymm, property_type, int(time.time()), len(rows), rows_z),
+    )
+
+
+def fetch_month(lawd_cd: str, yyyymm: str, property_type: str, service_key: str,
+                base_url: str = None, rate_per_sec: float = DEFAULT_RATE_PER_SEC,
+                use_cache: bool = True, settle_months: int = DEFAULT_SETTLE_MONTHS,
+                recent_ttl_sec: int = DEFAULT_RECENT_TTL_SEC, stats: dict = None):
+    """한 달치 조회(캐시 우선). 반환: (rows, err)"""
+    if use_cache:
+        try:
+            cached = cache_get(lawd_cd, yyyymm, property_type, settle_months, recent_ttl_sec)
+        except Exception:
+            cached = None
+        if cached is not None:
+            _count("hit", stats)
+            return cached, None
+        _count("miss", stats)
+    if not service_key:
+        return [], "MOLIT_SERVICE_KEY가 설정되지 않았습니다."
+    url = endpoint_url(property_type, base_url)
+    params = {"serviceKey": service_key, "LAWD_CD": lawd_cd, "DEAL_YMD": yyyymm}
+    try:
+        rows = _fetch_pages(url, params, rate_per_sec)
+    except Exception as e:
+        return [], f"MOLIT 조회 실패({yyyymm}): {e}"
+    if use_cache:
+        try:
+            cache_put(lawd_cd, yyyymm, property_type, rows)
+        except Exception:
+            pass
+    return rows, None
+
+
+def fetch_months(lawd_cd: str, yms, property_type: str, service_key: str,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, rate_per_sec: float = DEFAULT_RATE_PER_SEC,
+                 base_url: str = None, use_cache: bool = True, settle_months: int = DEFAULT_SETTLE_MONTHS,
+                 recent_ttl_sec: int = DEFAULT_RECENT_TTL_SEC, stats: dict = None):
+    """여러 달을 병렬 조회합니다. 반환: (월 순서대로 병합된 rows, {yyyymm: err})
+
+    stats(dict)를 넘기면 이번 호출의 캐시 hit/miss 수가 기록됩니다.
+    """
+    yms = list(yms)
+    if not yms:
+        return [], {}
+    workers = max(1, min(int(max_in_flight), len(yms)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="molit") as ex:
+        results = list(ex.map(
+            lambda ym: fetch_month(
+                lawd_cd, ym, property_type, service_key, base_url=base_url, rate_per_sec=rate_per_sec,
+                use_cache=use_cache, settle_months=settle_months, recent_ttl_sec=recent_ttl_sec, stats=stats,
+            ),
+            yms,
+        ))
+    all_rows = []
+    errors = {}
+    for ym, (rows, err) in zip(yms, results):
+        if err:
+            errors[ym] = err
+            continue
+        all_rows.extend(rows)
+    return all_rows, errors
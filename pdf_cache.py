@@ -0,0 +1,61 @@
+"""경매 PDF 파싱 캐시(app.db의 pdf_parse_cache 테이블).
+
+키는 PDF 바이트의 SHA-256입니다. 추출 텍스트는 파서 버전과 무관하게 재사용하고,
+파싱 결과(subject)는 저장 당시 파서 버전이 같을 때만 돌려줍니다.
+"""
+import hashlib
+import json
+import time
+import zlib
+
+import storage
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def get(digest: str, parser_version: str):
+    """반환: (text 또는 None, subject 또는 None)"""
+    try:
+        row = storage.fetch_one(
+            """SELECT parser_version, text_z, subject_json FROM pdf_parse_cache WHERE sha256=?""",
+            (digest,),
+        )
+    except Exception:
+        return None, None
+    if not row:
+        return None, None
+    version, text_z, subject_json = row
+    try:
+        text = zlib.decompress(text_z).decode("utf-8") if text_z is not None else None
+    except Exception:
+        return None, None
+    subject = None
+    if version == parser_version and subject_json:
+        try:
+            subject = json.loads(subject_json)
+        except Exception:
+            subject = None
+    if subject is not None:
+        try:
+            storage.execute("""UPDATE pdf_parse_cache SET used_ts=? WHERE sha256=?""", (int(time.time()), digest))
+        except Exception:
+            pass
+    return text, subject
+
+
+def put(digest: str, parser_version: str, text: str, subject: dict):
+    now = int(time.time())
+    storage.execute(
+        """INSERT OR REPLACE INTO pdf_parse_cache(sha256, parser_version, text_z, subject_json, created_ts, used_ts)
+           VALUES(?,?,?,?,?,?)""",
+        (
+            digest,
+            parser_version,
+            zlib.compress((text or "").encode("utf-8")),
+            json.dumps(subject, ensure_ascii=False),
+            now,
+            now,
+        ),
+    )
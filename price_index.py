@@ -0,0 +1,218 @@
+"""동·면적대별 월간 ㎡당 가격지수(app.db의 price_index 테이블).
+
+실거래 창고(trades)를 (시군구, 유형, 동, 면적대, 계약월) 단위로 미리 집계해 둡니다.
+trade_sync.synced_ts와 집계 시점의 기록(price_index_sync.source_ts)을 비교해
+새로 받았거나 다시 받은 월만 다시 집계합니다. 동 이름이 빈 행('')은 시군구 전체 집계입니다.
+
+매도가능가 보조 추정·보고서·추이 차트는 원본 행을 다시 훑지 않고 이 집계(월 수만큼의 행)만 읽습니다.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+import storage
+
+# (하한 이상, 상한 미만, 이름) — 주택 규모 구분(40/60/85/135㎡)
+AREA_BUCKETS = [(0, 40, "~40㎡"), (40, 60, "40~60㎡"), (60, 85, "60~85㎡"), (85, 135, "85~135㎡"), (135, None, "135㎡~")]
+ALL_DONGS = ""
+RECENT_MONTHS = 12
+TREND_MONTHS = 36
+MIN_INDEX_N = 5
+_EDGES = np.array([lo for lo, _, _ in AREA_BUCKETS[1:]], dtype=np.float64)
+
+
+def area_bucket(area_m2) -> str:
+    """전용면적 → 면적대 이름."""
+    return AREA_BUCKETS[int(np.searchsorted(_EDGES, float(area_m2), side="right"))][2]
+
+
+def _shift_ym(ym: str, months: int) -> str:
+    k = int(ym[:4]) * 12 + int(ym[4:6]) - 1 + months
+    return f"{k // 12}{k % 12 + 1:02d}"
+
+
+def stale_months(lawd_cd: str, property_type: str):
+    """동기화 이후 아직 집계하지 않은(또는 다시 받은) 월 목록."""
+    return [r[0] for r in storage.fetch_all(
+        """SELECT s.deal_ym FROM trade_sync s
+           LEFT JOIN price_index_sync p
+             ON p.lawd_cd=s.lawd_cd AND p.property_type=s.property_type AND p.deal_ym=s.deal_ym
+           WHERE s.lawd_cd=? AND s.property_type=? AND (p.source_ts IS NULL OR p.source_ts < s.synced_ts)
+           ORDER BY s.deal_ym""",
+        (lawd_cd, property_type),
+    )]
+
+
+_STAT_COLUMNS = ["p25_ppm", "median_ppm", "p75_ppm", "n"]
+
+
+def _aggregate(frame: pd.DataFrame, keys) -> pd.DataFrame:
+    if frame.empty:
+        # 빈 그룹(예: 동 이름이 모두 빈 달)은 quantile().unstack()이 열 없는 표를 돌려줌
+        return pd.DataFrame(columns=[*keys, *_STAT_COLUMNS])
+    g = frame.groupby(keys, sort=False)["ppm"]
+    out = g.quantile([0.25, 0.50, 0.75]).unstack()
+    out.columns = ["p25_ppm", "median_ppm", "p75_ppm"]
+    out["n"] = g.size()
+    return out.reset_index()
+
+
+def build_rows(rows) -> pd.DataFrame:
+    """trades 행(deal_ym, dong, area_m2, price_man) → 월·동·면적대 집계(동별 + 시군구 전체)."""
+    cols = ["deal_ym", "dong", "area_bucket", "n", "p25_ppm", "median_ppm", "p75_ppm"]
+    df = pd.DataFrame(rows, columns=["deal_ym", "dong", "area_m2", "price_man"])
+    df["area_m2"] = pd.to_numeric(df["area_m2"], errors="coerce")
+    df["price_man"] = pd.to_numeric(df["price_man"], errors="coerce")
+    df = df[(df["area_m2"] > 5) & (df["price_man"] * 10_000 > 10_000_000)]
+    if df.empty:
+        return pd.DataFrame(columns=cols)
+    df = df.assign(
+        dong=df["dong"].fillna("").astype(str),
+        ppm=df["price_man"] * 10_000 / df["area_m2"],
+        area_bucket=[AREA_BUCKETS[i][2] for i in np.searchsorted(_EDGES, df["area_m2"].to_numpy(), side="right")],
+    )
+    by_dong = _aggregate(df[df["dong"] != ALL_DONGS], ["deal_ym", "dong", "area_bucket"])
+    whole = _aggregate(df, ["deal_ym", "area_bucket"]).assign(dong=ALL_DONGS)
+    out = pd.concat([part for part in (by_dong, whole) if not part.empty], ignore_index=True)[cols]
+    out["n"] = out["n"].astype(np.int64)
+    for c in ("p25_ppm", "median_ppm", "p75_ppm"):
+        out[c] = out[c].round().astype(np.int64)
+    return out
+
+
+def refresh(lawd_cd: str, property_type: str, yms=None) -> list:
+    """지정 월(없으면 stale_months)만 다시 집계해 교체 저장합니다. 반환: 집계한 월 목록."""
+    yms = sorted(set(yms)) if yms is not None else stale_months(lawd_cd, property_type)
+    if not yms:
+        return []
+    marks = ",".join("?" for _ in yms)
+    # 동기화 시각을 먼저 읽어 둬야 집계 도중 다시 받은 월이 다음 refresh에서 stale로 잡힙니다
+    source_ts = dict(storage.fetch_all(
+        f"""SELECT deal_ym, synced_ts FROM trade_sync WHERE lawd_cd=? AND property_type=? AND deal_ym IN ({marks})""",
+        [lawd_cd, property_type, *yms],
+    ))
+    rows = storage.fetch_all(
+        f"""SELECT deal_ym, dong, area_m2, price_man FROM trades
+            WHERE lawd_cd=? AND property_type=? AND deal_ym IN ({marks})
+              AND (floor IS NULL OR floor<>-1)""",
+        [lawd_cd, property_type, *yms],
+    )
+    agg = build_rows(rows)
+    params = [
+        (lawd_cd, property_type, dong, bucket, ym, int(n), int(p25), int(med), int(p75))
+        for ym, dong, bucket, n, p25, med, p75 in agg.itertuples(index=False, name=None)
+    ]
+    now = int(time.time())
+
+    def _tx(cur):
+        cur.execute(
+            f"""DELETE FROM price_index WHERE lawd_cd=? AND property_type=? AND deal_ym IN ({marks})""",
+            [lawd_cd, property_type, *yms],
+        )
+        cur.executemany(
+            """INSERT INTO price_index(lawd_cd, property_type, dong, area_bucket, deal_ym, n, p25_ppm, median_ppm, p75_ppm)
+               VALUES(?,?,?,?,?,?,?,?,?)""",
+            params,
+        )
+        cur.executemany(
+            """INSERT OR REPLACE INTO price_index_sync(lawd_cd, property_type, deal_ym, source_ts, built_ts)
+               VALUES(?,?,?,?,?)""",
+            [(lawd_cd, property_type, ym, int(source_ts.get(ym) or now), now) for ym in yms],
+        )
+
+    storage.transaction(_tx)
+    return yms
+
+
+def series(lawd_cd: str, property_type: str, dong: str, bucket: str, since_ym: str = None) -> pd.DataFrame:
+    """월별 집계(deal_ym 오름차순): deal_ym, n, p25_ppm, median_ppm, p75_ppm (원/㎡)."""
+    sql = """SELECT deal_ym, n, p25_ppm, median_ppm, p75_ppm FROM price_index
+             WHERE lawd_cd=? AND property_type=? AND dong=? AND area_bucket=?"""
+    params = [lawd_cd, property_type, dong or ALL_DONGS, bucket]
+    if since_ym:
+        sql += " AND deal_ym>=?"
+        params.append(since_ym)
+    sql += " ORDER BY deal_ym"
+    return pd.DataFrame(storage.fetch_all(sql, params), columns=["deal_ym", "n", "p25_ppm", "median_ppm", "p75_ppm"])
+
+
+def latest_month(lawd_cd: str, property_type: str):
+    row = storage.fetch_one(
+        """SELECT MAX(deal_ym) FROM price_index_sync WHERE lawd_cd=? AND property_type=?""",
+        (lawd_cd, property_type),
+    )
+    return row[0] if row and row[0] else None
+
+
+def _weighted(df: pd.DataFrame) -> dict:
+    w = df["n"].to_numpy(dtype=np.float64)
+    return {c: float(np.average(df[c].to_numpy(dtype=np.float64), weights=w)) for c in ("p25_ppm", "median_ppm", "p75_ppm")}
+
+
+def estimate(lawd_cd: str, property_type: str, dong: str, subject_area, months: int = RECENT_MONTHS) -> dict:
+    """최근 months개월 월별 ㎡당 분위수(건수 가중 평균) × 대상면적 → estimate_sale_price_range와 같은 형태.
+
+    동·면적대 거래가 MIN_INDEX_N건 미만이면 시군구 전체 면적대 집계를 씁니다.
+    """
+    if not subject_area:
+        return {"low": None, "mid": None, "high": None, "note": "대상면적 없음"}
+    ref = latest_month(lawd_cd, property_type)
+    if ref is None:
+        return {"low": None, "mid": None, "high": None, "note": "가격지수 집계 없음(실거래 동기화 필요)"}
+    bucket = area_bucket(subject_area)
+    since = _shift_ym(ref, -(int(months) - 1))
+    for scope in (dong, ALL_DONGS) if dong else (ALL_DONGS,):
+        recent = series(lawd_cd, property_type, scope, bucket, since)
+        n = int(recent["n"].sum())
+        if n >= MIN_INDEX_N:
+            break
+    if n == 0:
+        return {"low": None, "mid": None, "high": None, "note": f"가격지수 표본 없음({bucket}, 최근 {months}개월)"}
+    w = _weighted(recent)
+    area = float(subject_area)
+    return {
+        "low": int(w["p25_ppm"] * area),
+        "mid": int(w["median_ppm"] * area),
+        "high": int(w["p75_ppm"] * area),
+        "n": n,
+        "source": "price_index",
+        "note": (
+            f"가격지수 기반({scope or '시군구 전체'} {bucket}, {since}~{ref} {n}건, "
+            f"월별 ㎡당 25/50/75 분위수의 건수 가중 평균 × 대상면적)"
+        ),
+    }
+
+
+def market_summary(lawd_cd: str, property_type: str, dong: str, subject_area) -> dict:
+    """결과 화면/보고서용: 최근 TREND_MONTHS개월 추이 + 최근 12개월 ㎡당 중앙값 + 전년 대비 변화율."""
+    bucket = area_bucket(subject_area) if subject_area else None
+    ref = latest_month(lawd_cd, property_type)
+    if bucket is None or ref is None:
+        return {"error": "가격지수 집계 없음(실거래 동기화 필요)"}
+    trend = series(lawd_cd, property_type, dong, bucket, _shift_ym(ref, -(TREND_MONTHS - 1)))
+    scope = dong or ALL_DONGS
+    if int(trend["n"].sum()) < MIN_INDEX_N and scope != ALL_DONGS:
+        trend, scope = series(lawd_cd, property_type, ALL_DONGS, bucket, _shift_ym(ref, -(TREND_MONTHS - 1))), ALL_DONGS
+    if trend.empty:
+        return {"error": f"가격지수 표본 없음({bucket})"}
+
+    recent_from = _shift_ym(ref, -(RECENT_MONTHS - 1))
+    prior_from = _shift_ym(ref, -(2 * RECENT_MONTHS - 1))
+    recent = trend[trend["deal_ym"] >= recent_from]
+    prior = trend[(trend["deal_ym"] >= prior_from) & (trend["deal_ym"] < recent_from)]
+    ppm_recent = _weighted(recent)["median_ppm"] if len(recent) else None
+    ppm_prior = _weighted(prior)["median_ppm"] if len(prior) else None
+    yoy = round((ppm_recent / ppm_prior - 1.0) * 100.0, 1) if ppm_recent and ppm_prior else None
+    return {
+        "lawd_cd": lawd_cd,
+        "property_type": property_type,
+        "dong": scope,
+        "area_bucket": bucket,
+        "ref_month": ref,
+        "ppm_12m": int(ppm_recent) if ppm_recent else None,
+        "n_12m": int(recent["n"].sum()),
+        "yoy_pct": yoy,
+        "estimate": estimate(lawd_cd, property_type, dong, subject_area),
+        "trend": trend.to_dict(orient="records"),
+    }
@@ -0,0 +1,154 @@
+"""보관기간 만료 데이터 정리(백그라운드 스위퍼).
+
+리런마다 전체 테이블을 훑던 cleanup_* 대신, 프로세스당 스레드 1개가
+주기적으로 SQL 범위 삭제를 수행하고 결과를 app_meta에 기록합니다.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import storage
+
+SWEEP_INTERVAL_SEC = 3600
+POLL_SEC = 60
+MARKER_KEY = "retention_last_swept"
+
+_SWEEP_LOCK = threading.Lock()
+_START_LOCK = threading.Lock()
+_THREAD = None
+_SETTINGS = {}
+
+
+def last_swept():
+    """마지막 정리 기록({"at": epoch, "report": {...}}) 또는 None."""
+    raw = storage.get_meta(MARKER_KEY)
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except Exception:
+        return None
+
+
+def _unlink(path) -> bool:
+    try:
+        p = Path(path)
+        if p.exists():
+            p.unlink()
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def _has_live_ref(cur, path) -> bool:
+    cur.execute("""SELECT 1 FROM uploads WHERE storage_path=? AND deleted_at IS NULL LIMIT 1""", (path,))
+    return cur.fetchone() is not None
+
+
+def sweep(delete_after_days: int, case_keep_days: int, tx_keep_days: int = 30, interval_sec: int = 0):
+    """만료 행을 범위 삭제하고 {행/파일 수, 소요시간} 리포트를 반환합니다.
+
+    interval_sec > 0이면 DB 쓰기 잠금 안에서 마지막 정리 시각을 다시 확인해,
+    여러 프로세스가 동시에 돌더라도 주기당 1회만 실행됩니다(이 경우 None 반환).
+    """
+    t0 = time.perf_counter()
+    now_ts = time.time()
+    deleted_at = datetime.utcnow().isoformat()
+    # epoch 컬럼(created_ts / delete_after_ts) 인덱스 범위 조건
+    case_cutoff = int(now_ts - int(case_keep_days) * 86400)
+    tx_cutoff = int(now_ts - int(tx_keep_days) * 86400)
+    upload_cutoff = int(now_ts)
+
+    def _tx(cur):
+        if interval_sec:
+            cur.execute("""SELECT value FROM app_meta WHERE key=?""", (MARKER_KEY,))
+            row = cur.fetchone()
+            try:
+                prev_at = json.loads(row[0]).get("at") if row and row[0] else None
+            except Exception:
+                prev_at = None
+            if prev_at and now_ts - float(prev_at) < interval_sec:
+                return None
+
+        cur.execute(
+            """SELECT storage_path FROM uploads WHERE deleted_at IS NULL AND delete_after_ts <= ?""",
+            (upload_cutoff,),
+        )
+        paths = [r[0] for r in cur.fetchall()]
+        n_uploads = cur.execute(
+            """UPDATE uploads SET deleted_at=? WHERE deleted_at IS NULL AND delete_after_ts <= ?""",
+            (deleted_at, upload_cutoff),
+        ).rowcount
+
+        cur.execute(
+            """SELECT storage_path FROM uploads WHERE case_id IN (SELECT id FROM cases WHERE created_ts < ?)""",
+            (case_cutoff,),
+        )
+        paths.extend(r[0] for r in cur.fetchall())
+        n_uploads += cur.execute(
+            """DELETE FROM uploads WHERE case_id IN (SELECT id FROM cases WHERE created_ts < ?)""",
+            (case_cutoff,),
+        ).rowcount
+        n_cases = cur.execute("""DELETE FROM cases WHERE created_ts < ?""", (case_cutoff,)).rowcount
+        n_tx = cur.execute("""DELETE FROM tx_runs WHERE created_ts < ?""", (tx_cutoff,)).rowcount
+        # PDF 파싱 캐시는 분석 보관기간 동안 쓰이지 않은 항목만 정리
+        n_pdf = cur.execute(
+            """DELETE FROM pdf_parse_cache WHERE COALESCE(used_ts, created_ts) < ?""", (case_cutoff,)
+        ).rowcount
+
+        report = {"cases": n_cases, "tx_runs": n_tx, "uploads": n_uploads, "pdf_cache": n_pdf}
+        storage.set_meta(cur, MARKER_KEY, json.dumps({"at": now_ts, "report": report}))
+        # 내용 주소 파일은 여러 케이스가 공유하므로, 남은 참조가 없는 경로만 지웁니다
+        return report, [p for p in set(paths) if p and not _has_live_ref(cur, p)]
+
+    res = storage.transaction(_tx)
+    if res is None:
+        return None
+    report, paths = res
+
+    # 파일 삭제는 커밋 이후(롤백 시 파일만 사라지는 일 방지). 참조 확인과 삭제를 같은 쓰기 잠금 안에서 해야
+    # save_upload가 그 사이에 참조를 넣고(파일이 아직 있어 쓰기를 건너뛰고) 지워진 파일을 가리키는 일이 없습니다
+    report["files"] = storage.transaction(
+        lambda cur: sum(1 for p in paths if not _has_live_ref(cur, p) and _unlink(p))
+    )
+    report["elapsed_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+    storage.transaction(lambda cur: storage.set_meta(cur, MARKER_KEY, json.dumps({"at": now_ts, "report": report})))
+    return report
+
+
+def maybe_sweep(settings: dict, interval_sec: int = SWEEP_INTERVAL_SEC, force: bool = False):
+    """주기(interval_sec)가 지났을 때만 정리합니다. 다른 스레드가 정리 중이면 건너뜁니다."""
+    if not _SWEEP_LOCK.acquire(blocking=False):
+        return None
+    try:
+        return sweep(
+            settings.get("delete_after_days", 30),
+            settings.get("case_keep_days", 30),
+            settings.get("tx_keep_days", 30),
+            interval_sec=0 if force else interval_sec,
+        )
+    finally:
+        _SWEEP_LOCK.release()
+
+
+def _loop(interval_sec: int):
+    while True:
+        try:
+            maybe_sweep(dict(_SETTINGS), interval_sec)
+        except Exception:
+            pass
+        time.sleep(min(POLL_SEC, interval_sec))
+
+
+def start_background_sweeper(settings: dict, interval_sec: int = SWEEP_INTERVAL_SEC):
+    """프로세스당 1개의 데몬 스레드를 띄웁니다(이미 실행 중이면 설정만 갱신)."""
+    global _THREAD
+    with _START_LOCK:
+        _SETTINGS.update(settings)
+        if _THREAD is not None and _THREAD.is_alive():
+            return
+        _THREAD = threading.Thread(target=_loop, args=(int(interval_sec),), name="retention-sweeper", daemon=True)
+        _THREAD.start()
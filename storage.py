@@ -0,0 +1,682 @@
+"""app.db 저장소 계층.
+
+- 프로세스 단위 커넥션 풀(세션/리런마다 connect/close 하지 않음)
+- WAL 저널 + 튜닝된 PRAGMA
+- 'database is locked' / busy 오류는 지수 백오프로 재시도
+- PRAGMA user_version 기반 스키마 마이그레이션
+"""
+import json
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+DB_PATH = Path(__file__).parent / "data" / "app.db"
+
+POOL_SIZE = 8
+POOL_WAIT_SEC = 30
+BUSY_TIMEOUT_MS = 5000
+RETRY_MAX = 6
+RETRY_BASE_DELAY = 0.05
+RETRY_MAX_DELAY = 1.0
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=67108864",
+)
+
+
+class _Pool:
+    """DB 파일 하나에 대한 커넥션 풀(스레드 간 공유)."""
+
+    def __init__(self, path, size: int):
+        self.path = str(path)
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def _open(self):
+        con = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT_MS / 1000.0,
+            check_same_thread=False,
+            isolation_level=None,  # 트랜잭션은 transaction()에서 명시적으로 시작
+        )
+        for p in PRAGMAS:
+            con.execute(p)
+        return con
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._open()
+                except Exception:
+                    self._created -= 1
+                    raise
+        return self._idle.get(timeout=POOL_WAIT_SEC)
+
+    def release(self, con):
+        try:
+            if con.in_transaction:
+                con.rollback()
+        except Exception:
+            # 롤백이 안 되는 커넥션은 풀에 돌려놓지 않고 닫아서 버립니다
+            with self._lock:
+                self._created -= 1
+            try:
+                con.close()
+            except Exception:
+                pass
+            return
+        self._idle.put(con)
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def configure(db_path):
+    """사용할 DB 경로를 지정합니다(앱 시작 시 1회)."""
+    global DB_PATH
+    DB_PATH = Path(db_path)
+    Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+
+
+def _pool():
+    key = str(DB_PATH)
+    p = _POOLS.get(key)
+    if p is None:
+        with _POOLS_LOCK:
+            p = _POOLS.get(key)
+            if p is None:
+                p = _Pool(key, POOL_SIZE)
+                _POOLS[key] = p
+    return p
+
+
+def _is_busy(e: Exception) -> bool:
+    msg = str(e).lower()
+    return "locked" in msg or "busy" in msg
+
+
+def with_retry(fn):
+    """busy/locked 오류만 지수 백오프(+지터)로 재시도합니다."""
+    delay = RETRY_BASE_DELAY
+    for attempt in range(RETRY_MAX):
+        try:
+            return fn()
+        except sqlite3.OperationalError as e:
+            if not _is_busy(e) or attempt == RETRY_MAX - 1:
+                raise
+            time.sleep(delay + random.uniform(0, delay))
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+
+
+@contextmanager
+def connection():
+    """풀에서 커넥션을 빌려오고 반납합니다(autocommit 모드)."""
+    pool = _pool()
+    con = pool.acquire()
+    try:
+        yield con
+    finally:
+        pool.release(con)
+
+
+def transaction(fn):
+    """fn(cur)을 BEGIN IMMEDIATE ~ COMMIT 안에서 실행하고 결과를 반환합니다."""
+    def _run():
+        with connection() as con:
+            cur = con.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(cur)
+                con.commit()
+                return result
+            except Exception:
+                con.rollback()
+                raise
+    return with_retry(_run)
+
+
+def execute(sql: str, params=()):
+    """단일 쓰기 쿼리. 영향받은 행 수를 반환합니다."""
+    return transaction(lambda cur: cur.execute(sql, params).rowcount)
+
+
+def fetch_all(sql: str, params=()):
+    def _run():
+        with connection() as con:
+            return con.execute(sql, params).fetchall()
+    return with_retry(_run)
+
+
+def fetch_one(sql: str, params=()):
+    def _run():
+        with connection() as con:
+            return con.execute(sql, params).fetchone()
+    return with_retry(_run)
+
+
+LOCAL_TZ = ZoneInfo("Asia/Seoul")
+
+
+def parse_local_dt(v):
+    """저장된 시각 문자열을 LOCAL_TZ datetime으로 해석합니다(naive는 로컬 시각으로 간주)."""
+    if v is None:
+        return None
+    s = str(v).strip()
+    if not s:
+        return None
+    s = s.replace("Z", "+00:00")
+    try:
+        dt = datetime.fromisoformat(s)
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=LOCAL_TZ)
+        return dt.astimezone(LOCAL_TZ)
+    except Exception:
+        try:
+            return datetime.strptime(s[:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=LOCAL_TZ)
+        except Exception:
+            return None
+
+
+def to_epoch(v, naive_utc: bool = False):
+    """시각 문자열 → epoch 초(int). naive_utc=True면 tz 없는 값을 UTC로 봅니다(datetime.utcnow() 저장분)."""
+    if v is None:
+        return None
+    s = str(v).strip()
+    if naive_utc and s and not s.endswith("Z") and "+" not in s[10:]:
+        s = s + "Z"
+    dt = parse_local_dt(s)
+    return int(dt.timestamp()) if dt else None
+
+
+# ---------------------------------------------------------------------------
+# 스키마 마이그레이션(PRAGMA user_version 기준, 순서대로 1회씩 적용)
+# ---------------------------------------------------------------------------
+
+def _columns(cur, table: str):
+    return {r[1] for r in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def _add_column(cur, table: str, column: str, decl: str):
+    if column not in _columns(cur, table):
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _m001_base_tables(cur):
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS cases(
+        id TEXT PRIMARY KEY,
+        created_at TEXT,
+        created_by TEXT,
+        status TEXT,
+        case_no TEXT,
+        address TEXT,
+        property_type TEXT,
+        area_m2 REAL,
+        appraisal INTEGER,
+        min_price INTEGER,
+        auction_date TEXT,
+        links TEXT,
+        inputs_json TEXT,
+        outputs_json TEXT,
+        report_md TEXT
+    )""")
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS uploads(
+        id TEXT PRIMARY KEY,
+        case_id TEXT,
+        file_type TEXT,
+        storage_path TEXT,
+        uploaded_at TEXT,
+        delete_after TEXT,
+        deleted_at TEXT
+    )""")
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS tx_runs(
+        id TEXT PRIMARY KEY,
+        created_at TEXT,
+        created_by TEXT,
+        title TEXT,
+        query TEXT,
+        rows_json TEXT
+    )""")
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS app_meta(
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )""")
+
+
+def _m002_epoch_timestamps(cur):
+    """TEXT 시각 컬럼 옆에 epoch(int) 컬럼을 추가하고 백필 + 인덱스 생성."""
+    _add_column(cur, "cases", "created_ts", "INTEGER")
+    _add_column(cur, "tx_runs", "created_ts", "INTEGER")
+    _add_column(cur, "uploads", "uploaded_ts", "INTEGER")
+    _add_column(cur, "uploads", "delete_after_ts", "INTEGER")
+
+    for table in ("cases", "tx_runs"):
+        rows = cur.execute(f"SELECT rowid, created_at FROM {table}").fetchall()
+        cur.executemany(
+            f"UPDATE {table} SET created_ts=? WHERE rowid=?",
+            [(to_epoch(created_at), rowid) for rowid, created_at in rows],
+        )
+    # uploads 시각은 datetime.utcnow().isoformat()으로 저장되어 왔으므로 UTC로 해석
+    rows = cur.execute("SELECT rowid, uploaded_at, delete_after FROM uploads").fetchall()
+    cur.executemany(
+        "UPDATE uploads SET uploaded_ts=?, delete_after_ts=? WHERE rowid=?",
+        [(to_epoch(up, naive_utc=True), to_epoch(da, naive_utc=True), rowid) for rowid, up, da in rows],
+    )
+
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_cases_created_ts ON cases(created_ts)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tx_runs_created_ts ON tx_runs(created_ts)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_uploads_case_type ON uploads(case_id, file_type)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_uploads_expiry ON uploads(deleted_at, delete_after_ts)")
+
+
+def case_summary(outputs: dict) -> dict:
+    """outputs에서 리스트 화면용 요약 컬럼 값을 뽑습니다."""
+    o = outputs or {}
+    sr = o.get("sale_range") or {}
+
+    def _int(v):
+        try:
+            return int(v) if v is not None else None
+        except Exception:
+            return None
+
+    return {
+        "verdict": o.get("verdict"),
+        "loss0_max_bid": _int(o.get("loss0_max_bid")),
+        "recommended_bid": o.get("recommended_bid"),
+        "sale_mid": _int(sr.get("mid")),
+        "sale_n": _int(sr.get("n")),
+    }
+
+
+CASE_SUMMARY_COLUMNS = ("verdict", "loss0_max_bid", "recommended_bid", "sale_mid", "sale_n")
+
+
+def _m003_case_summary_columns(cur):
+    """리스트 조회(query_cases)가 outputs_json을 디코딩하지 않도록 요약 컬럼 추가 + 백필."""
+    _add_column(cur, "cases", "verdict", "TEXT")
+    _add_column(cur, "cases", "loss0_max_bid", "INTEGER")
+    _add_column(cur, "cases", "recommended_bid", "TEXT")
+    _add_column(cur, "cases", "sale_mid", "INTEGER")
+    _add_column(cur, "cases", "sale_n", "INTEGER")
+
+    rows = cur.execute("SELECT rowid, outputs_json FROM cases").fetchall()
+    params = []
+    for rowid, outputs_json in rows:
+        try:
+            o = json.loads(outputs_json) if outputs_json else {}
+        except Exception:
+            o = {}
+        summ = case_summary(o)
+        params.append(tuple(summ[c] for c in CASE_SUMMARY_COLUMNS) + (rowid,))
+    cur.executemany(
+        "UPDATE cases SET verdict=?, loss0_max_bid=?, recommended_bid=?, sale_mid=?, sale_n=? WHERE rowid=?",
+        params,
+    )
+
+
+# FTS5 외부 콘텐츠 테이블: (테이블, FTS 테이블, 검색 컬럼)
+FTS_TABLES = (
+    ("cases", "cases_fts", ("case_no", "address")),
+    ("tx_runs", "tx_runs_fts", ("title", "query")),
+)
+
+
+def _create_fts(cur, table: str, fts: str, cols):
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    # trigram: 토큰 경계와 무관한 부분 문자열 검색(예: '12345' → '2024타경12345')
+    cur.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({col_list}, content='{table}', content_rowid='rowid', tokenize='trigram')"
+    )
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts}(rowid, {col_list}) VALUES (new.rowid, {new_vals});
+    END""")
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.rowid, {old_vals});
+    END""")
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.rowid, {old_vals});
+        INSERT INTO {fts}(rowid, {col_list}) VALUES (new.rowid, {new_vals});
+    END""")
+    cur.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _drop_fts(cur, fts: str):
+    for suffix in ("ai", "ad", "au"):
+        cur.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+    cur.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def _fts_unavailable(e: Exception) -> bool:
+    """FTS5 또는 trigram 토크나이저(SQLite 3.34+)가 없는 빌드."""
+    msg = str(e).lower()
+    return "fts5" in msg or "tokenizer" in msg
+
+
+def _m004_search_and_counts(cur):
+    """리스트 검색용 FTS5 인덱스 + tx_runs 행 수 컬럼."""
+    _add_column(cur, "tx_runs", "row_count", "INTEGER")
+    rows = cur.execute("SELECT rowid, rows_json FROM tx_runs WHERE row_count IS NULL").fetchall()
+    params = []
+    for rowid, rows_json in rows:
+        try:
+            n = len(json.loads(rows_json)) if rows_json else 0
+        except Exception:
+            n = 0
+        params.append((n, rowid))
+    cur.executemany("UPDATE tx_runs SET row_count=? WHERE rowid=?", params)
+
+    for table, fts, cols in FTS_TABLES:
+        try:
+            _create_fts(cur, table, fts, cols)
+        except sqlite3.OperationalError as e:
+            # FTS5/trigram 미포함 SQLite 빌드: 검색은 LIKE로 대체(has_fts 참고)
+            if not _fts_unavailable(e):
+                raise
+
+
+def _legacy_rows_frame(records):
+    """예전 rows_json(천단위 콤마 문자열) → 원시 숫자 타입 DataFrame."""
+    import pandas as pd
+
+    df = pd.DataFrame(records or [])
+    for col in ("거래금액", "면적단가", "전용면적(㎡)"):
+        if col not in df.columns:
+            continue
+        raw = df[col]
+        num = pd.to_numeric(raw.astype(str).str.replace(",", "", regex=False).str.strip(), errors="coerce")
+        # 전부 숫자로 해석될 때만 변환(텍스트가 섞여 있으면 원본 유지)
+        if num.notna().sum() == raw.notna().sum():
+            if col != "전용면적(㎡)" and num.dropna().mod(1).eq(0).all():
+                num = num.round().astype("Int64")
+            df[col] = num
+    return df
+
+
+def _m005_tx_rows_blob(cur):
+    """tx_runs 행 데이터를 JSON 텍스트 → 압축 컬럼 블롭(columnar)으로 이전."""
+    import columnar
+
+    _add_column(cur, "tx_runs", "rows_blob", "BLOB")
+    rows = cur.execute("SELECT rowid, rows_json FROM tx_runs WHERE rows_json IS NOT NULL").fetchall()
+    for rowid, rows_json in rows:
+        try:
+            records = json.loads(rows_json) if rows_json else []
+        except Exception:
+            records = []
+        blob = columnar.encode_frame(_legacy_rows_frame(records))
+        cur.execute("UPDATE tx_runs SET rows_blob=?, rows_json=NULL WHERE rowid=?", (blob, rowid))
+
+
+def _m006_molit_cache(cur):
+    """MOLIT 월별 응답 캐시((시군구코드, 계약년월, 유형) 단위)."""
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS molit_cache(
+        lawd_cd TEXT NOT NULL,
+        deal_ym TEXT NOT NULL,
+        property_type TEXT NOT NULL,
+        fetched_ts INTEGER NOT NULL,
+        row_count INTEGER,
+        rows_z BLOB,
+        PRIMARY KEY(lawd_cd, deal_ym, property_type)
+    )""")
+
+
+def _m007_trade_warehouse(cur):
+    """정규화된 MOLIT 실거래 창고 + 월별 동기화 기록."""
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS trades(
+        lawd_cd TEXT NOT NULL,
+        property_type TEXT NOT NULL,
+        deal_ym TEXT NOT NULL,
+        dong TEXT,
+        jibun TEXT,
+        building TEXT,
+        area_m2 REAL,
+        price_man INTEGER,
+        floor INTEGER,
+        build_year INTEGER
+    )""")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_trades_lot ON trades(lawd_cd, property_type, dong, jibun, deal_ym, area_m2)"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_trades_month ON trades(lawd_cd, property_type, deal_ym)")
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS trade_sync(
+        lawd_cd TEXT NOT NULL,
+        property_type TEXT NOT NULL,
+        deal_ym TEXT NOT NULL,
+        synced_ts INTEGER NOT NULL,
+        row_count INTEGER,
+        PRIMARY KEY(lawd_cd, property_type, deal_ym)
+    )""")
+
+
+def _m008_parcel_index(cur):
+    """VWORLD 지번 후보 인덱스(시군구 단위, PNU 기준 중복 제거)."""
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS parcels(
+        region TEXT NOT NULL,
+        pnu TEXT NOT NULL,
+        dong TEXT NOT NULL,
+        bunji TEXT NOT NULL,
+        address TEXT,
+        PRIMARY KEY(region, pnu)
+    )""")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_parcels_lot ON parcels(region, dong, bunji)")
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS parcel_sync(
+        region TEXT PRIMARY KEY,
+        fetched_ts INTEGER NOT NULL,
+        row_count INTEGER
+    )""")
+
+
+def _m009_pdf_parse_cache(cur):
+    """경매 PDF 파싱 캐시(SHA-256 내용 해시 → 추출 텍스트 + 파싱 결과)."""
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS pdf_parse_cache(
+        sha256 TEXT PRIMARY KEY,
+        parser_version TEXT,
+        text_z BLOB,
+        subject_json TEXT,
+        created_ts INTEGER NOT NULL,
+        used_ts INTEGER
+    )""")
+
+
+def _m010_upload_content_hash(cur):
+    """업로드 내용 해시(중복 파일 1회 저장) + 경로별 참조 조회 인덱스."""
+    _add_column(cur, "uploads", "content_hash", "TEXT")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_uploads_path ON uploads(storage_path, deleted_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_uploads_hash ON uploads(content_hash)")
+
+
+def _m011_price_index(cur):
+    """동·면적대별 월간 ㎡당 가격지수 + 월별 집계 기록(trade_sync 대비 갱신 판단)."""
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS price_index(
+        lawd_cd TEXT NOT NULL,
+        property_type TEXT NOT NULL,
+        dong TEXT NOT NULL,
+        area_bucket TEXT NOT NULL,
+        deal_ym TEXT NOT NULL,
+        n INTEGER NOT NULL,
+        p25_ppm INTEGER,
+        median_ppm INTEGER,
+        p75_ppm INTEGER,
+        PRIMARY KEY(lawd_cd, property_type, dong, area_bucket, deal_ym)
+    )""")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_price_index_month ON price_index(lawd_cd, property_type, deal_ym)")
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS price_index_sync(
+        lawd_cd TEXT NOT NULL,
+        property_type TEXT NOT NULL,
+        deal_ym TEXT NOT NULL,
+        source_ts INTEGER NOT NULL,
+        built_ts INTEGER NOT NULL,
+        PRIMARY KEY(lawd_cd, property_type, deal_ym)
+    )""")
+
+
+def _m012_fts_trigram(cur):
+    """검색 인덱스를 trigram 토크나이저로 다시 만듦(unicode61 토큰 접두 검색은 부분 문자열을 못 찾음)."""
+    for table, fts, cols in FTS_TABLES:
+        row = cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (fts,)).fetchone()
+        if row and "trigram" in str(row[0]):
+            continue
+        _drop_fts(cur, fts)
+        try:
+            _create_fts(cur, table, fts, cols)
+        except sqlite3.OperationalError as e:
+            # 가상 테이블 생성(첫 문장)에서 실패하므로 트리거는 남지 않음 → LIKE 검색
+            if not _fts_unavailable(e):
+                raise
+
+
+MIGRATIONS = [
+    _m001_base_tables,
+    _m002_epoch_timestamps,
+    _m003_case_summary_columns,
+    _m004_search_and_counts,
+    _m005_tx_rows_blob,
+    _m006_molit_cache,
+    _m007_trade_warehouse,
+    _m008_parcel_index,
+    _m009_pdf_parse_cache,
+    _m010_upload_content_hash,
+    _m011_price_index,
+    _m012_fts_trigram,
+]
+
+
+def schema_version() -> int:
+    row = fetch_one("PRAGMA user_version")
+    return int(row[0]) if row else 0
+
+
+def migrate():
+    """미적용 마이그레이션을 하나씩 트랜잭션으로 적용하고 user_version을 올립니다."""
+    applied = []
+    for version, fn in enumerate(MIGRATIONS, start=1):
+        def _tx(cur, version=version, fn=fn):
+            current = int(cur.execute("PRAGMA user_version").fetchone()[0])
+            if current >= version:
+                return False
+            fn(cur)
+            cur.execute(f"PRAGMA user_version={version}")
+            return True
+        if transaction(_tx):
+            applied.append(fn.__name__)
+    return applied
+
+
+_SCHEMA_READY = set()
+_SCHEMA_LOCK = threading.Lock()
+
+
+def ensure_schema():
+    """마이그레이션은 프로세스·DB 경로당 1회만 확인합니다."""
+    key = str(DB_PATH)
+    if key in _SCHEMA_READY:
+        return
+    with _SCHEMA_LOCK:
+        if key in _SCHEMA_READY:
+            return
+        migrate()
+        _SCHEMA_READY.add(key)
+
+
+def has_fts(fts_table: str) -> bool:
+    row = fetch_one("""SELECT 1 FROM sqlite_master WHERE type='table' AND name=?""", (fts_table,))
+    return bool(row)
+
+
+FTS_MIN_CHARS = 3
+
+
+def fts_query(text: str):
+    """사용자 검색어 → trigram FTS5 MATCH 식(검색어 전체를 부분 문자열로).
+
+    trigram은 3글자 미만을 찾지 못하므로 그때는 None(호출부에서 LIKE 사용).
+    """
+    q = str(text or "").strip()
+    if len(q) < FTS_MIN_CHARS:
+        return None
+    return '"' + q.replace('"', '""') + '"'
+
+
+def search_where(fts_table: str, cols, text: str):
+    """리스트 검색 조건: 예전 str.contains(검색어)와 같은 부분 문자열 일치. 반환: (where 절, params)"""
+    q = str(text or "").strip()
+    match = fts_query(q) if has_fts(fts_table) else None
+    if match is not None:
+        return f"rowid IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)", [match]
+    like = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return "(" + " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in cols) + ")", [like] * len(cols)
+
+
+def keyset_page(select_sql: str, where: list, params: list, cursor, limit: int):
+    """(created_ts DESC, rowid DESC) 키셋 페이지네이션.
+
+    select_sql의 첫 두 컬럼은 created_ts, rowid여야 합니다.
+    cursor는 직전 페이지 마지막 행의 (created_ts, rowid) 또는 None.
+    반환: (rows, next_cursor) — 다음 페이지가 없으면 next_cursor=None.
+    """
+    where = list(where)
+    params = list(params)
+    if cursor is not None:
+        ts, rid = cursor
+        if ts is None:
+            where.append("(created_ts IS NULL AND rowid < ?)")
+            params.append(rid)
+        else:
+            where.append("(created_ts < ? OR (created_ts = ? AND rowid < ?) OR created_ts IS NULL)")
+            params.extend([ts, ts, rid])
+    sql = select_sql
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY created_ts DESC, rowid DESC LIMIT ?"
+    params.append(int(limit) + 1)
+    rows = fetch_all(sql, params)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (rows[-1][0], rows[-1][1])
+    return rows, None
+
+
+def get_meta(key: str, default=None):
+    row = fetch_one("""SELECT value FROM app_meta WHERE key=?""", (key,))
+    return row[0] if row else default
+
+
+def set_meta(cur, key: str, value: str):
+    cur.execute("""INSERT OR REPLACE INTO app_meta(key, value) VALUES(?,?)""", (key, value))
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import storage  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """테스트마다 새 app.db(마이그레이션 적용)."""
+    prev = storage.DB_PATH
+    storage.configure(tmp_path / "app.db")
+    storage.ensure_schema()
+    yield storage
+    storage.configure(prev)
+
+
+class MolitStub:
+    """로컬 MOLIT 스텁 서버. respond(ym, page) → 응답 XML(문자열), delay는 요청마다 대기(초)."""
+
+    def __init__(self):
+        self.respond = lambda ym, page: ok_response(ym, [])
+        self.delay = 0.0
+        self.calls = []
+        self.url = None
+
+
+def ok_response(ym: str, prices, total=None) -> str:
+    items = "".join(
+        f"<item><년>{ym[:4]}</년><월>{int(ym[4:])}</월><법정동>묵동</법정동><지번>1</지번>"
+        f"<전용면적>59.9</전용면적><거래금액>{p:,}</거래금액><층>3</층><건축년도>2005</건축년도></item>"
+        for p in prices
+    )
+    total = len(prices) if total is None else total
+    return (
+        "<response><header><resultCode>00</resultCode><resultMsg>NORMAL SERVICE.</resultMsg></header>"
+        f"<body><items>{items}</items><totalCount>{total}</totalCount></body></response>"
+    )
+
+
+MOLIT_FIXTURES = ROOT / "tests" / "fixtures" / "molit"
+# data.go.kr 게이트웨이 오류 봉투(HTTP 200, resultCode 없음): 한도 초과
+GATEWAY_ERROR = (MOLIT_FIXTURES / "gateway_error.xml").read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def molit_stub():
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlsplit
+
+    stub = MolitStub()
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive(공용 세션 재사용)
+
+        def do_GET(self):
+            q = parse_qs(urlsplit(self.path).query)
+            ym, page = q["DEAL_YMD"][0], int(q.get("pageNo", ["1"])[0])
+            stub.calls.append((ym, page))
+            if stub.delay:
+                time.sleep(stub.delay)
+            body = stub.respond(ym, page).encode("utf-8")
+            self.send_response(200)  # 게이트웨이 오류도 HTTP 200
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield stub
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,92 @@
+"""auction_golden.json 재생성: 규칙 테이블 이전(app.py 안에 있던) 파서의 출력을 기준값으로 씁니다.
+
+    python tests/fixtures/make_auction_golden.py [기준 리비전]
+
+기준 리비전의 app.py에서 parse_auction_text/normalize_address/clean_extracted_snippet만 꺼내
+auction_text/*.txt, 고정 시드 퍼즈 텍스트, 주소 목록에 적용합니다. auction_pdf.py로 다시 만들지 마세요
+(그러면 골든 테스트가 스스로를 비교하게 됩니다).
+"""
+import ast
+import json
+import random
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent.parent
+BASELINE_REV = "deaa86c"  # [user-015] 커밋 = 파서를 auction_pdf.py로 옮기기 직전
+FUNCTIONS = ("parse_auction_text", "normalize_address", "clean_extracted_snippet")
+FUZZ_SEED = 1
+FUZZ_CASES = 60
+FUZZ_TOKENS = [
+    "매각기일", "2024타경12345", "2023 타경 9", "관련사건", "서울지방법원", "지원", ":", "2025.03.04", "2025-03-04",
+    "말소기준권리", "소 재 지", "새 주 소", "서울특별시", "서울특별시서울특별시", "중랑구", "중랑구중랑구", "묵동",
+    "묵동묵동", "동", "비동비동", "길길길", "층층", "호호", "12-3", "5층", "301호", "물건종별", "감 정 가", "감정가",
+    "350,000,000", "원", "최 저 가(80%)", "280,000,000", "2차", "(80%)", "최저가", "건물면적", "40.12", "㎡",
+    "임차인이 없", "소유자가 점유", "전입세대확인서", "제시외 건물", "(중복)-정지", "1(갑1)", "2024.01.02", "근저당",
+    "국민은행", "말소기준등기", "소멸", "1차", "유찰", "변경", "\n", "\t", "매각물건현황매각물건현황", "임차인현황",
+    "현진월드빌", "현진월드빌 현진월드빌", "경기도", "수원시", "장안구", ",", "，", "(", "80", "%", "대 지 권", "리", "읍",
+]
+ADDRESSES = [
+    "서울특별시 서울특별시 중랑구 중랑구 묵동 묵동 123-4",
+    "서울특별시서울특별시 중랑구중랑구 묵동 123-4, 현진월드빌 현진월드빌 비동비동 3층층 301호호",
+    "경기도 안양시 만안구 안양동 615-3 3층 302호",
+    "  대전광역시\t서구\r\n둔산동   1200 ，2층 201호 ",
+    "서울특별시 중랑구 묵동 동 동 12 층 층 호 호",
+    "",
+]
+
+
+def load_baseline(rev: str = BASELINE_REV) -> dict:
+    src = subprocess.run(
+        ["git", "show", f"{rev}:app.py"], cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    tree = ast.parse(src)
+    nodes = [n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name in FUNCTIONS]
+    ns = {"re": re}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), f"{rev}:app.py", "exec"), ns)
+    return {name: ns[name] for name in FUNCTIONS}
+
+
+def fuzz_texts():
+    rng = random.Random(FUZZ_SEED)
+    out = []
+    for _ in range(FUZZ_CASES):
+        sep = " " if rng.random() < 0.7 else ""
+        out.append(sep.join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(1, 60))))
+    return out
+
+
+def corpus():
+    """(이름, 텍스트) 목록: 손으로 만든 옥션원 형태 텍스트 + 퍼즈 텍스트."""
+    items = [(p.name, p.read_text(encoding="utf-8")) for p in sorted((HERE / "auction_text").glob("*.txt"))]
+    items += [(f"fuzz_{i:03d}", t) for i, t in enumerate(fuzz_texts())]
+    return items
+
+
+def expected(fns: dict) -> dict:
+    return {
+        "texts": {
+            name: {
+                "parse": fns["parse_auction_text"](text),
+                "normalize_address": fns["normalize_address"](text),
+                "snippet": fns["clean_extracted_snippet"](text),
+            }
+            for name, text in corpus()
+        },
+        "addresses": {a: fns["normalize_address"](a) for a in ADDRESSES},
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    golden = expected(load_baseline(argv[0] if argv else BASELINE_REV))
+    path = HERE / "auction_golden.json"
+    path.write_text(json.dumps(golden, ensure_ascii=False, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"{path} ({len(golden['texts'])}개 텍스트, {len(golden['addresses'])}개 주소)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""auction_pdf 규칙 테이블이 이전 파서(app.py 안의 정규식 코드)와 같은 결과를 내는지 확인하는 골든 테스트.
+
+기준값(fixtures/auction_golden.json)은 fixtures/make_auction_golden.py가 규칙 테이블 이전 리비전의
+app.py 함수로 만든 것입니다.
+"""
+import ast
+import json
+from pathlib import Path
+
+import pytest
+
+import auction_pdf
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+GOLDEN = json.loads((FIXTURES / "auction_golden.json").read_text(encoding="utf-8"))
+
+
+def _corpus():
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location("make_auction_golden", FIXTURES / "make_auction_golden.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod.corpus()
+
+
+CORPUS = _corpus()
+
+
+def test_corpus_matches_golden_names():
+    assert sorted(name for name, _ in CORPUS) == sorted(GOLDEN["texts"])
+
+
+@pytest.mark.parametrize("name,text", CORPUS, ids=[name for name, _ in CORPUS])
+def test_parse_auction_text(name, text):
+    # JSON 왕복으로 튜플/정수 표현 차이를 없앰
+    got = json.loads(json.dumps(auction_pdf.parse_auction_text(text), ensure_ascii=False))
+    assert got == GOLDEN["texts"][name]["parse"]
+
+
+@pytest.mark.parametrize("name,text", CORPUS, ids=[name for name, _ in CORPUS])
+def test_normalize_address_and_snippet(name, text):
+    want = GOLDEN["texts"][name]
+    assert auction_pdf.normalize_address(text) == want["normalize_address"]
+    assert auction_pdf.clean_extracted_snippet(text) == want["snippet"]
+
+
+@pytest.mark.parametrize("address", list(GOLDEN["addresses"]))
+def test_normalize_address_on_addresses(address):
+    assert auction_pdf.normalize_address(address) == GOLDEN["addresses"][address]
+
+
+def test_app_locals_do_not_shadow_imported_modules():
+    """app.py 함수 안에서 import한 모듈 이름에 값을 대입하면(예: auction_pdf = st.file_uploader(...))
+    같은 함수의 모듈 호출이 위젯 값으로 바뀝니다."""
+    tree = ast.parse((Path(__file__).resolve().parent.parent / "app.py").read_text(encoding="utf-8"))
+    modules = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.update((a.asname or a.name).split(".")[0] for a in node.names)
+    shadowed = []
+    for fn in ast.walk(tree):
+        if not isinstance(fn, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for node in ast.walk(fn):
+            targets = []
+            if isinstance(node, ast.Assign):
+                targets = node.targets
+            elif isinstance(node, (ast.AnnAssign, ast.AugAssign, ast.For, ast.withitem)):
+                targets = [getattr(node, "target", None) or getattr(node, "optional_vars", None)]
+            for t in targets:
+                for n in ast.walk(t) if t is not None else ():
+                    if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store) and n.id in modules:
+                        shadowed.append(f"{fn.name}:{n.lineno} {n.id}")
+    assert shadowed == []
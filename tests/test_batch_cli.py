@@ -0,0 +1,30 @@
+"""일괄 분석: 면적을 믿을 수 없는 PDF는 표본 없이 저장하지 않고 요약 CSV에 사유를 남김."""
+import pytest
+
+import batch_cli
+
+
+def _result(area):
+    subj = {"case_no": "2024타경1", "address": "서울 중랑구 묵동 1 3층", "area_m2": area,
+            "appraisal": 300_000_000, "min_price": 240_000_000}
+    return {"name": "a.pdf", "subject": subj, "error": None}
+
+
+@pytest.mark.parametrize("area", [None, 0, 0.5, 5.0, 1200.0])
+def test_implausible_area_skips_row(db, area):
+    calls = []
+
+    def comps_for(address, area_m2=None):
+        calls.append(area_m2)
+        raise AssertionError("면적이 비정상이면 표본을 읽지 않아야 함")
+
+    row = batch_cli.analyze_one(_result(area), "a.pdf", comps_for, {}, "연립다세대", "batch")
+    assert row["case_id"] is None and "전용면적" in row["error"]
+    assert not calls
+    assert db.fetch_one("SELECT COUNT(*) FROM cases")[0] == 0
+
+
+def test_area_problem_bounds():
+    assert batch_cli.area_problem(84.5) is None
+    assert batch_cli.area_problem(500.0) is None
+    assert batch_cli.area_problem(500.1)
@@ -0,0 +1,42 @@
+"""저장되는 매도가 표본은 크기가 고정(분위수 표본)이고 저장본으로 시뮬레이션이 재현됨."""
+import json
+
+import numpy as np
+import pandas as pd
+
+import analysis
+import bid_sim
+
+ASSUMPTIONS = {"interest_rate": 0.05, "holding_days": 90, "repair_cost": 5_000_000, "eviction_cost": 3_000_000,
+               "early_repay_fee_rate": 0.012, "tax_rate": 0.046, "bid_step": 1_000_000}
+
+
+def test_compact_sample_keeps_small_samples_and_quantiles():
+    assert bid_sim.compact_sample([3, 1, 2]) == [1, 2, 3]
+    prices = np.random.default_rng(0).normal(500_000_000, 30_000_000, 20_000)
+    sample = bid_sim.compact_sample(prices)
+    assert len(sample) == bid_sim.SAVED_SAMPLE_MAX and sample == sorted(sample)
+    for q in (0.25, 0.5, 0.75):
+        assert abs(np.quantile(sample, q) - np.quantile(prices, q)) < 3_000_000
+
+
+def test_finalize_stores_capped_sample():
+    rng = np.random.default_rng(1)
+    comps = pd.DataFrame({"area_m2": rng.uniform(82, 87, 5_000), "price": rng.normal(600_000_000, 40_000_000, 5_000)})
+    sr = analysis.estimate_sale_price_range(comps, 84.5)
+    assert len(sr["prices"]) > bid_sim.SAVED_SAMPLE_MAX
+
+    reviewed = {"case_no": "2024타경1", "address": "서울 중랑구 묵동 1", "property_type": "아파트", "area_m2": 84.5,
+                "appraisal": 700_000_000, "min_price": 560_000_000}
+    outputs, _, _ = analysis.finalize_analysis({}, reviewed, sr, ASSUMPTIONS)
+    saved = outputs["sale_range"]
+    assert saved["prices_n"] == len(sr["prices"])
+    assert len(bid_sim.sale_sample_from_outputs(outputs)) == bid_sim.SAVED_SAMPLE_MAX
+    assert len(json.dumps(saved)) < 10_000
+
+    # 결과 화면이 저장 표본으로 다시 돌려도 저장된 상한과 같음
+    bids = analysis.bid_grid(outputs["bid_range"]["start"], outputs["bid_range"]["end"], outputs["bid_range"]["step"])
+    table = bid_sim.simulate(bids, ASSUMPTIONS["tax_rate"], outputs["loan_amount"], ASSUMPTIONS["early_repay_fee_rate"],
+                             bid_sim.default_ranges(ASSUMPTIONS), prices=bid_sim.sale_sample_from_outputs(outputs),
+                             quartiles=outputs["sale_prices"], seed=0)
+    assert bid_sim.max_bid_for_loss_prob(table) == outputs["simulation"]["max_bid"]
@@ -0,0 +1,33 @@
+"""새 분석 실거래 표본: 스트리밍 구간은 (검수에서 고친) 대상면적 기준."""
+import analysis
+
+
+def _csv(rows):
+    lines = ["계약년월,시군구,번지,전용면적(㎡),거래금액(만원),층,건축년도"]
+    lines += [f"202401,묵동,{i},{area},{price},{floor},2005" for i, (area, price, floor) in enumerate(rows)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+DATA = _csv(
+    [(40.0 + i * 0.1, 25_000 + i * 100, 2) for i in range(12)]
+    + [(84.0 + i * 0.1, 60_000 + i * 100, 3) for i in range(12)]
+    + [(84.5, 20_000, -1)]  # 지하층
+)
+
+
+def test_stream_band_follows_area():
+    near_40, view_40 = analysis.load_comps_for_area(DATA, "comps.csv", None, 40.5)
+    near_84, view_84 = analysis.load_comps_for_area(DATA, "comps.csv", None, 84.5)
+    assert near_40["area_m2"].between(30.5, 50.5).all() and len(near_40) == 12
+    assert near_84["area_m2"].between(74.5, 94.5).all() and len(near_84) == 12
+    assert (view_84["층"] != -1).all()
+
+    # PDF 면적(40.5)으로 읽은 표본은 고친 면적(84.5)의 매도가능가를 내지 못함 → 다시 읽어야 함
+    assert analysis.estimate_sale_price_range(near_40, 84.5)["mid"] is None
+    assert analysis.estimate_sale_price_range(near_84, 84.5)["mid"] > 500_000_000
+
+
+def test_stream_without_area_defers_reading():
+    est, view = analysis.load_comps_for_area(DATA, "comps.csv", None, None)
+    assert est.empty and view is None
+    assert analysis.estimate_sale_price_range(est, None)["mid"] is None
@@ -0,0 +1,83 @@
+"""MOLIT 월 응답 캐시: 정산 여부는 받은 시점 기준."""
+import time
+from datetime import datetime
+
+import molit_api
+from conftest import GATEWAY_ERROR, ok_response
+
+DAY = 86400
+ROWS = [{"거래금액": "30,000", "전용면적(㎡)": "59.9"}]
+
+
+def _ts(y, m, d):
+    return datetime(y, m, d, 12, 0).timestamp()
+
+
+def _set_clock(monkeypatch, ts):
+    monkeypatch.setattr(time, "time", lambda: ts)
+
+
+def test_recent_month_expires_after_settle_window(db, monkeypatch):
+    # 2024-03 응답을 3월 중(최근 월)에 받아 둠
+    _set_clock(monkeypatch, _ts(2024, 3, 20))
+    molit_api.cache_put("11260", "202403", "연립다세대", ROWS)
+    assert molit_api.cache_get("11260", "202403", "연립다세대") == ROWS
+
+    # 시계가 정산 구간(2개월)을 넘어가도, 최근 월일 때 받은 응답이므로 TTL이 지나면 만료
+    _set_clock(monkeypatch, _ts(2024, 7, 1))
+    assert molit_api.is_settled("202403", molit_api.DEFAULT_SETTLE_MONTHS, today=datetime(2024, 7, 1))
+    assert molit_api.cache_get("11260", "202403", "연립다세대") is None
+
+
+def test_recent_month_within_ttl_is_served(db, monkeypatch):
+    _set_clock(monkeypatch, _ts(2024, 3, 20))
+    molit_api.cache_put("11260", "202403", "연립다세대", ROWS)
+    _set_clock(monkeypatch, _ts(2024, 3, 20) + molit_api.DEFAULT_RECENT_TTL_SEC - 60)
+    assert molit_api.cache_get("11260", "202403", "연립다세대") == ROWS
+
+
+def test_month_fetched_after_settling_stays_fresh(db, monkeypatch):
+    _set_clock(monkeypatch, _ts(2024, 7, 1))
+    molit_api.cache_put("11260", "202403", "연립다세대", ROWS)
+    _set_clock(monkeypatch, _ts(2024, 7, 1) + 400 * DAY)
+    assert molit_api.cache_get("11260", "202403", "연립다세대") == ROWS
+
+
+def test_is_fresh_uses_fetch_time():
+    fetched = _ts(2024, 3, 20)
+    later = _ts(2024, 7, 1)
+    assert not molit_api.is_fresh("202403", fetched, now=later)
+    assert molit_api.is_fresh("202403", fetched, now=fetched + 60)
+    assert molit_api.is_fresh("202401", fetched, now=later)
+
+
+def _fetch(stub, ym="202401"):
+    return molit_api.fetch_month("11260", ym, "연립다세대", "KEY", base_url=stub.url, rate_per_sec=100.0)
+
+
+def test_gateway_error_envelope_is_not_cached(db, molit_stub):
+    # HTTP 200 + cmmMsgHeader(한도 초과): item이 없어도 0건이 아니라 오류
+    molit_stub.respond = lambda ym, page: GATEWAY_ERROR
+    rows, err = _fetch(molit_stub)
+    assert rows == [] and "22" in err and "LIMITED_NUMBER" in err
+    assert molit_api.cache_get("11260", "202401", "연립다세대") is None
+    assert db.fetch_one("SELECT COUNT(*) FROM molit_cache")[0] == 0
+
+    # 한도가 풀리면 다시 받아 캐시
+    molit_stub.respond = lambda ym, page: ok_response(ym, [30_000, 31_000])
+    rows, err = _fetch(molit_stub)
+    assert err is None and len(rows) == 2
+    assert len(molit_api.cache_get("11260", "202401", "연립다세대")) == 2
+
+
+def test_missing_result_code_is_an_error(db, molit_stub):
+    molit_stub.respond = lambda ym, page: "<response><body><items></items></body></response>"
+    rows, err = _fetch(molit_stub)
+    assert rows == [] and "resultCode" in err
+    assert db.fetch_one("SELECT COUNT(*) FROM molit_cache")[0] == 0
+
+
+def test_confirmed_empty_month_is_cached(db, molit_stub):
+    molit_stub.respond = lambda ym, page: ok_response(ym, [])
+    assert _fetch(molit_stub) == ([], None)
+    assert molit_api.cache_get("11260", "202401", "연립다세대") == []
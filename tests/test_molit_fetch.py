@@ -0,0 +1,32 @@
+"""MOLIT 여러 달 병렬 조회: 느린 로컬 스텁 서버에서 순차 조회보다 벽시계 시간이 짧음."""
+import time
+
+import molit_api
+from conftest import ok_response
+
+LATENCY_SEC = 0.15
+YMS = [f"2023{m:02d}" for m in range(1, 13)]
+
+
+def test_fetch_months_beats_sequential(molit_stub):
+    molit_stub.delay = LATENCY_SEC
+    molit_stub.respond = lambda ym, page: ok_response(ym, [30_000])
+    kw = {"base_url": molit_stub.url, "rate_per_sec": 100.0, "use_cache": False}
+
+    t0 = time.perf_counter()
+    seq_rows = []
+    for ym in YMS:
+        rows, err = molit_api.fetch_month("11260", ym, "연립다세대", "KEY", **kw)
+        assert err is None
+        seq_rows.extend(rows)
+    sequential = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rows, errors = molit_api.fetch_months("11260", YMS, "연립다세대", "KEY", max_in_flight=6, **kw)
+    concurrent = time.perf_counter() - t0
+
+    assert not errors
+    assert rows == seq_rows and [r["계약년월"] for r in rows] == YMS
+    assert sequential >= LATENCY_SEC * len(YMS)
+    # 6개 동시 요청이면 이론상 1/6, 스레드/연결 오버헤드를 넉넉히 봐도 절반 이하
+    assert concurrent < sequential / 2, (sequential, concurrent)
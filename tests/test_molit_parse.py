@@ -0,0 +1,35 @@
+"""MOLIT 응답 픽스처(tests/fixtures/molit): 정상 페이지는 타입 변환된 행, 오류 봉투는 check_header에서 오류."""
+import io
+
+import pytest
+
+import molit_api
+from conftest import MOLIT_FIXTURES
+
+
+def _parse(name):
+    meta = {}
+    rows = list(molit_api.iter_items(io.BytesIO((MOLIT_FIXTURES / name).read_bytes()), meta))
+    return rows, meta
+
+
+def test_trade_page_fixture():
+    rows, meta = _parse("rh_trade_202301_p1.xml")
+    molit_api.check_header(meta)
+    assert len(rows) == int(meta["totalCount"]) == 60
+    assert all(r["계약년월"] == "202301" for r in rows)
+    assert all(isinstance(r["거래금액"], int) and isinstance(r["전용면적(㎡)"], float) for r in rows)
+    assert all(not r["시군구"].startswith(" ") for r in rows)
+    assert any(r["층"] == -1 for r in rows) and any(r["건축년도"] is None for r in rows)
+
+
+@pytest.mark.parametrize("name, code", [
+    ("gateway_error.xml", "22"),
+    ("unregistered_key.xml", "30"),
+    ("result_code_error.xml", "99"),
+])
+def test_error_fixtures_raise(name, code):
+    rows, meta = _parse(name)
+    assert rows == []
+    with pytest.raises(RuntimeError, match=code):
+        molit_api.check_header(meta)
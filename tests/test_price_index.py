@@ -0,0 +1,45 @@
+"""가격지수 집계: 빈 동/0건 달에서도 집계가 깨지지 않음(동기화 전체를 멈추지 않게)."""
+import price_index
+import storage
+import trade_warehouse
+
+COLS = ["deal_ym", "dong", "area_bucket", "n", "p25_ppm", "median_ppm", "p75_ppm"]
+
+
+def _rows(dong, n=6):
+    return [("202401", dong, 59.9, 30_000 + i * 100) for i in range(n)]
+
+
+def test_build_rows_zero_rows():
+    out = price_index.build_rows([])
+    assert list(out.columns) == COLS and out.empty
+
+
+def test_build_rows_all_blank_dong_keeps_district_row():
+    for blank in ("", None):
+        out = price_index.build_rows(_rows(blank))
+        assert list(out.columns) == COLS
+        assert out["dong"].tolist() == [price_index.ALL_DONGS]
+        assert int(out["n"].iloc[0]) == 6
+
+
+def test_build_rows_mixed_dongs():
+    out = price_index.build_rows(_rows("묵동", 3) + _rows("", 3))
+    assert sorted(out["dong"].tolist()) == ["", "묵동"]
+    assert out.set_index("dong").loc["", "n"] == 6
+
+
+def _store(ym, rows):
+    trade_warehouse.store_month("11260", "연립다세대", ym, [
+        {"시군구": dong, "번지": "1", "전용면적(㎡)": area, "거래금액": price, "층": 2, "건축년도": 2005}
+        for _, dong, area, price in rows
+    ])
+
+
+def test_refresh_blank_dong_and_empty_month(db):
+    _store("202401", _rows(""))
+    _store("202402", [])
+    assert price_index.refresh("11260", "연립다세대") == ["202401", "202402"]
+    rows = storage.fetch_all("SELECT deal_ym, dong, n FROM price_index ORDER BY deal_ym")
+    assert rows == [("202401", "", 6)]
+    assert price_index.stale_months("11260", "연립다세대") == []
@@ -0,0 +1,74 @@
+"""리스트 검색: 예전 str.contains(검색어)와 같은 부분 문자열 일치."""
+import pytest
+
+import storage
+
+CASES = [
+    ("a", "2024타경12345", "서울특별시 중랑구 묵동 123-4 2층 201호"),
+    ("b", "2023타경777", "서울특별시 노원구 상계동 55"),
+    ("c", "2024타경50%", "경기도 구리시 인창동 1_2"),
+]
+
+
+def _insert_cases(st):
+    for i, (cid, case_no, address) in enumerate(CASES):
+        st.execute(
+            "INSERT INTO cases(id, created_at, case_no, address, created_ts) VALUES(?,?,?,?,?)",
+            (cid, "2024-01-01 00:00:00", case_no, address, 1_700_000_000 + i),
+        )
+
+
+def _search(st, text):
+    clause, params = st.search_where("cases_fts", ("case_no", "address"), text)
+    return sorted(r[0] for r in st.fetch_all(f"SELECT id FROM cases WHERE {clause}", params))
+
+
+def _contains(text):
+    return sorted(cid for cid, case_no, address in CASES if text in case_no or text in address)
+
+
+QUERIES = ["12345", "2345", "타경", "묵동", "묵", "중랑구 묵동", "동 12", "50%", "1_2", "_", "777", "없는주소"]
+
+
+@pytest.mark.parametrize("text", QUERIES)
+def test_search_matches_substring(db, text):
+    _insert_cases(db)
+    assert db.has_fts("cases_fts")
+    assert _search(db, text) == _contains(text)
+
+
+@pytest.mark.parametrize("text", QUERIES)
+def test_like_fallback_without_fts(db, text):
+    _insert_cases(db)
+    db.transaction(lambda cur: storage._drop_fts(cur, "cases_fts"))
+    assert not db.has_fts("cases_fts")
+    assert _search(db, text) == _contains(text)
+
+
+def test_fts_follows_updates_and_deletes(db):
+    _insert_cases(db)
+    db.execute("UPDATE cases SET case_no=? WHERE id=?", ("2025타경99999", "a"))
+    assert _search(db, "12345") == []
+    assert _search(db, "99999") == ["a"]
+    db.execute("DELETE FROM cases WHERE id=?", ("b",))
+    assert _search(db, "777") == []
+
+
+def test_upgrade_rebuilds_token_index_as_trigram(db):
+    # 이전 버전(unicode61 토큰 인덱스, user_version=11) DB를 흉내 냄
+    _insert_cases(db)
+
+    def _downgrade(cur):
+        storage._drop_fts(cur, "cases_fts")
+        cur.execute(
+            "CREATE VIRTUAL TABLE cases_fts USING fts5(case_no, address, content='cases', content_rowid='rowid')"
+        )
+        cur.execute("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')")
+        cur.execute("PRAGMA user_version=11")
+
+    db.transaction(_downgrade)
+    assert db.fetch_all("SELECT rowid FROM cases_fts WHERE cases_fts MATCH ?", ('"12345"',)) == []
+
+    assert "_m012_fts_trigram" in db.migrate()
+    assert _search(db, "12345") == ["a"]
+    assert _search(db, "동 12") == ["a"]
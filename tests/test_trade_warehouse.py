@@ -0,0 +1,85 @@
+"""실거래 창고 증분 동기화: 최근 월일 때 받은 달은 정산 후 다시 받고, 가격지수도 그 달만 다시 집계."""
+import time
+from datetime import datetime
+
+import molit_api
+from conftest import GATEWAY_ERROR, ok_response
+import price_index
+import storage
+import trade_warehouse
+
+
+def _ts(y, m, d):
+    return datetime(y, m, d, 12, 0).timestamp()
+
+
+def _row(price_man, area="59.9"):
+    return {"시군구": "묵동", "번지": "1", "전용면적(㎡)": area, "거래금액": f"{price_man:,}", "층": "2", "건축년도": "2005"}
+
+
+def test_month_synced_while_recent_is_resynced_after_settling(db, monkeypatch):
+    clock = {"now": _ts(2024, 3, 20)}
+    monkeypatch.setattr(time, "time", lambda: clock["now"])
+    served = {"202403": [_row(30_000)] * 5, "202401": [_row(28_000)] * 5}
+    calls = []
+
+    def _fetch_month(lawd_cd, ym, property_type, service_key, **kw):
+        calls.append(ym)
+        return served[ym], None
+
+    monkeypatch.setattr(molit_api, "fetch_month", _fetch_month)
+    report = trade_warehouse.sync_district("11260", "연립다세대", ["202401", "202403"], "key")
+    assert sorted(report["synced"]) == ["202401", "202403"]
+
+    # 정산 구간이 지난 뒤: 2024-01은 동기화 당시 이미 정산 → 그대로, 2024-03은 최근 월일 때 받았으므로 다시 받음
+    clock["now"] = _ts(2024, 7, 1)
+    assert trade_warehouse.months_to_sync("11260", "연립다세대", ["202401", "202403"]) == ["202403"]
+
+    served["202403"] = [_row(30_000)] * 5 + [_row(40_000)] * 6  # 늦게 신고된 거래
+    calls.clear()
+    report = trade_warehouse.sync_district("11260", "연립다세대", ["202401", "202403"], "key")
+    assert calls == ["202403"] and report["skipped"] == 1
+
+    n = storage.fetch_one(
+        "SELECT n FROM price_index WHERE lawd_cd=? AND property_type=? AND dong=? AND deal_ym=?",
+        ("11260", "연립다세대", "묵동", "202403"),
+    )[0]
+    assert n == 11
+    assert price_index.stale_months("11260", "연립다세대") == []
+
+    # 정산 후 다시 받은 달은 더 이상 만료되지 않음
+    clock["now"] = _ts(2025, 7, 1)
+    assert trade_warehouse.months_to_sync("11260", "연립다세대", ["202401", "202403"]) == []
+
+
+def _trade_sync(ym):
+    return storage.fetch_one(
+        "SELECT row_count FROM trade_sync WHERE lawd_cd=? AND property_type=? AND deal_ym=?",
+        ("11260", "연립다세대", ym),
+    )
+
+
+def test_gateway_error_month_is_not_recorded(db, molit_stub, monkeypatch):
+    monkeypatch.setattr(molit_api, "MOLIT_BASE_URL", molit_stub.url)
+    molit_stub.respond = lambda ym, page: GATEWAY_ERROR
+    report = trade_warehouse.sync_district("11260", "연립다세대", ["202001"], "key", rate_per_sec=100.0)
+    assert report["synced"] == [] and "202001" in report["errors"]
+    assert _trade_sync("202001") is None
+    assert trade_warehouse.months_to_sync("11260", "연립다세대", ["202001"]) == ["202001"]
+
+
+def test_resync_empty_refetches_months_recorded_as_empty(db, molit_stub, monkeypatch):
+    monkeypatch.setattr(molit_api, "MOLIT_BASE_URL", molit_stub.url)
+    # 이전 버전: 오류 봉투가 0건으로 창고와 월 캐시에 남아 있음(정산된 달이라 다시 받지 않음)
+    trade_warehouse.store_month("11260", "연립다세대", "202001", [])
+    molit_api.cache_put("11260", "202001", "연립다세대", [])
+    assert trade_warehouse.months_to_sync("11260", "연립다세대", ["202001"]) == []
+    assert trade_warehouse.empty_months("11260", "연립다세대", ["202001"]) == ["202001"]
+
+    molit_stub.respond = lambda ym, page: ok_response(ym, [30_000, 31_000, 32_000])
+    report = trade_warehouse.sync_district("11260", "연립다세대", ["202001"], "key", rate_per_sec=100.0,
+                                           resync_empty=True)
+    assert report["synced"] == ["202001"] and report["rows"] == 3
+    assert molit_stub.calls == [("202001", 1)]
+    assert _trade_sync("202001")[0] == 3
+    assert trade_warehouse.empty_months("11260", "연립다세대", ["202001"]) == []
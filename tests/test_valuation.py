@@ -0,0 +1,42 @@
+"""층 보정: 지하층 주소와 층 모르는 실거래."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import valuation
+
+
+@pytest.mark.parametrize("address, floor", [
+    ("서울 중랑구 묵동 1 3층 302호", 3),
+    ("서울 중랑구 묵동 1 제12층 1201호", 12),
+    ("서울 중랑구 묵동 1 지하1층 B01호", None),
+    ("서울 중랑구 묵동 1 지하 2층", None),
+    ("서울 중랑구 묵동 1 B1층", None),
+    ("서울 중랑구 묵동 1", None),
+])
+def test_floor_from_address(address, floor):
+    assert valuation.floor_from_address(address) == floor
+
+
+def _trades(n=60, seed=1):
+    rng = np.random.default_rng(seed)
+    floor = rng.integers(1, 10, n).astype(float)
+    area = rng.uniform(40, 60, n)
+    ppm = 5_000_000 * np.where(floor == 1, 0.85, 1.0) * rng.lognormal(0, 0.02, n)
+    return pd.DataFrame({"month": 2024 * 12 + rng.integers(0, 6, n), "area": area,
+                         "price": ppm * area, "floor": floor, "build_year": 2005.0})
+
+
+def test_unknown_comp_floor_gets_no_floor_shift():
+    trades = _trades()
+    model = valuation.TimeFloorAgeModel(trades)
+    assert model.coefficients()["층:1층"] < -0.05
+
+    unknown = trades.assign(floor=np.nan)
+    same_month = unknown.assign(month=model.last_month)
+    # 층 모르는 거래는 1층 대상이라도 할인하지 않음(기준 3~5층으로 보고 1층 계수를 얹지 않음)
+    adjusted = model.adjust(same_month, subject_floor=1)
+    assert np.allclose(adjusted, same_month["price"].to_numpy())
+
+    known = same_month.assign(floor=4.0)
+    assert (model.adjust(known, subject_floor=1) < known["price"].to_numpy()).all()
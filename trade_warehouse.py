@@ -0,0 +1,256 @@
+"""시군구 단위 실거래 창고(app.db의 trades 테이블).
+
+MOLIT 월별 응답을 정규화해 저장하고, 아직 동기화하지 않은 월(또는 TTL이 지난
+최근 월)만 증분으로 받아옵니다. 동/번지 조회와 새 분석의 실거래 표본은
+네트워크 없이 이 테이블에서 인덱스 조회로 가져옵니다.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import molit_api
+import price_index
+import storage
+
+VIEW_COLUMNS = ["계약년월", "시군구", "번지", "건물명", "전용면적(㎡)", "거래금액", "면적단가", "층", "건축년도"]
+
+
+def _to_int(v):
+    try:
+        s = str(v).replace(",", "").strip()
+        return int(float(s)) if s else None
+    except Exception:
+        return None
+
+
+def _to_float(v):
+    try:
+        s = str(v).replace(",", "").strip()
+        return float(s) if s else None
+    except Exception:
+        return None
+
+
+def normalize_row(lawd_cd: str, property_type: str, deal_ym: str, r: dict):
+    """MOLIT 행(문자열) → trades 테이블 행(타입 변환)."""
+    return (
+        lawd_cd,
+        property_type,
+        deal_ym,
+        str(r.get("시군구") or "").strip(),
+        str(r.get("번지") or "").strip(),
+        str(r.get("건물명") or "").strip() or None,
+        _to_float(r.get("전용면적(㎡)")),
+        _to_int(r.get("거래금액")),
+        _to_int(r.get("층")),
+        _to_int(r.get("건축년도")),
+    )
+
+
+def store_month(lawd_cd: str, property_type: str, deal_ym: str, rows):
+    """한 달치 행을 교체 저장하고 동기화 기록을 남깁니다."""
+    params = [normalize_row(lawd_cd, property_type, deal_ym, r) for r in rows]
+
+    def _tx(cur):
+        cur.execute(
+            """DELETE FROM trades WHERE lawd_cd=? AND property_type=? AND deal_ym=?""",
+            (lawd_cd, property_type, deal_ym),
+        )
+        cur.executemany(
+            """INSERT INTO trades(lawd_cd, property_type, deal_ym, dong, jibun, building, area_m2, price_man, floor, build_year)
+               VALUES(?,?,?,?,?,?,?,?,?,?)""",
+            params,
+        )
+        cur.execute(
+            """INSERT OR REPLACE INTO trade_sync(lawd_cd, property_type, deal_ym, synced_ts, row_count)
+               VALUES(?,?,?,?,?)""",
+            (lawd_cd, property_type, deal_ym, int(time.time()), len(params)),
+        )
+
+    storage.transaction(_tx)
+    return len(params)
+
+
+def _sync_state(lawd_cd: str, property_type: str, yms):
+    """{yyyymm: (synced_ts, row_count)} (동기화 기록이 있는 월만)."""
+    marks = ",".join("?" for _ in yms)
+    rows = storage.fetch_all(
+        f"""SELECT deal_ym, synced_ts, row_count FROM trade_sync
+            WHERE lawd_cd=? AND property_type=? AND deal_ym IN ({marks})""",
+        [lawd_cd, property_type, *yms],
+    )
+    return {ym: (ts, n) for ym, ts, n in rows}
+
+
+def empty_months(lawd_cd: str, property_type: str, yms):
+    """0건으로 동기화 기록된 월(이전 버전에서 오류 응답이 빈 달로 저장됐을 수 있음)."""
+    yms = list(yms)
+    if not yms:
+        return []
+    state = _sync_state(lawd_cd, property_type, yms)
+    return [ym for ym in yms if ym in state and not state[ym][1]]
+
+
+def months_to_sync(lawd_cd: str, property_type: str, yms,
+                   settle_months: int = molit_api.DEFAULT_SETTLE_MONTHS,
+                   recent_ttl_sec: int = molit_api.DEFAULT_RECENT_TTL_SEC,
+                   resync_empty: bool = False):
+    """아직 동기화하지 않았거나, 미정산 상태로 동기화된 뒤 TTL이 지난 월만 골라냅니다.
+
+    resync_empty=True면 0건으로 기록된 월도 다시 받습니다.
+    """
+    yms = list(yms)
+    if not yms:
+        return []
+    state = _sync_state(lawd_cd, property_type, yms)
+    now = time.time()
+    # 정산 여부는 동기화 시점(synced_ts) 기준: 최근 월일 때 받은 달은 정산 후에도 한 번은 다시 받음
+    return [
+        ym for ym in yms
+        if ym not in state
+        or (resync_empty and not state[ym][1])
+        or not molit_api.is_fresh(ym, state[ym][0], settle_months, recent_ttl_sec, now=now)
+    ]
+
+
+def sync_district(lawd_cd: str, property_type: str, yms, service_key: str,
+                  max_in_flight: int = molit_api.DEFAULT_MAX_IN_FLIGHT,
+                  rate_per_sec: float = molit_api.DEFAULT_RATE_PER_SEC,
+                  settle_months: int = molit_api.DEFAULT_SETTLE_MONTHS,
+                  recent_ttl_sec: int = molit_api.DEFAULT_RECENT_TTL_SEC,
+                  stats: dict = None, resync_empty: bool = False):
+    """증분 동기화. 반환: {"synced": [...], "skipped": n, "rows": n, "errors": {yyyymm: err}}
+
+    trade_sync는 정상 헤더가 확인된 응답(fetch_month 오류 없음)만 기록합니다.
+    resync_empty=True면 0건으로 기록된 월을 캐시를 거치지 않고 다시 받습니다.
+    """
+    yms = list(yms)
+    todo = months_to_sync(lawd_cd, property_type, yms, settle_months, recent_ttl_sec, resync_empty)
+    report = {"synced": [], "skipped": len(yms) - len(todo), "rows": 0, "errors": {}}
+    if not todo:
+        return report
+    # 같은 빈 응답이 월 캐시에도 남아 있을 수 있으므로 캐시 우회
+    bypass = set(empty_months(lawd_cd, property_type, todo)) if resync_empty else set()
+
+    per_month = {}
+
+    def _one(ym):
+        rows, err = molit_api.fetch_month(
+            lawd_cd, ym, property_type, service_key, rate_per_sec=rate_per_sec,
+            use_cache=ym not in bypass, settle_months=settle_months, recent_ttl_sec=recent_ttl_sec, stats=stats,
+        )
+        per_month[ym] = (rows, err)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(int(max_in_flight), len(todo))), thread_name_prefix="sync") as ex:
+        list(ex.map(_one, todo))
+
+    for ym in todo:
+        rows, err = per_month.get(ym, ([], "조회 누락"))
+        if err:
+            report["errors"][ym] = err
+            continue
+        report["rows"] += store_month(lawd_cd, property_type, ym, rows)
+        report["synced"].append(ym)
+    # 가격지수는 이번에 받은 월(+ 이전에 집계가 밀린 월)만 다시 집계
+    if report["synced"]:
+        price_index.refresh(lawd_cd, property_type)
+    return report
+
+
+def _rows_to_view(rows) -> pd.DataFrame:
+    df = pd.DataFrame(
+        rows,
+        columns=["계약년월", "시군구", "번지", "건물명", "전용면적(㎡)", "거래금액", "층", "건축년도"],
+    )
+    if df.empty:
+        return pd.DataFrame(columns=VIEW_COLUMNS)
+    df["거래금액"] = pd.to_numeric(df["거래금액"], errors="coerce")
+    df["전용면적(㎡)"] = pd.to_numeric(df["전용면적(㎡)"], errors="coerce")
+    df["면적단가"] = (df["거래금액"] / df["전용면적(㎡)"]).round()
+    return df[VIEW_COLUMNS]
+
+
+def _dong_range(dong: str):
+    """'묵동' → ('묵', '묵\\uffff'): 기존 contains(동 제거) 조건을 인덱스 범위로 근사."""
+    stem = str(dong or "").strip()
+    if stem.endswith("동") and len(stem) > 1:
+        stem = stem[:-1]
+    return stem, stem + "\uffff"
+
+
+def query_lot(lawd_cd: str, property_type: str, dong: str, jibun: str, yms) -> pd.DataFrame:
+    """동/번지 실거래(지하층 제외, 최신월 우선)."""
+    yms = list(yms)
+    lo, hi = _dong_range(dong)
+    rows = storage.fetch_all(
+        """SELECT deal_ym, dong, jibun, building, area_m2, price_man, floor, build_year
+           FROM trades
+           WHERE lawd_cd=? AND property_type=? AND dong>=? AND dong<? AND jibun=?
+             AND deal_ym BETWEEN ? AND ?
+             AND (floor IS NULL OR floor<>-1)
+           ORDER BY deal_ym DESC""",
+        (lawd_cd, property_type, lo, hi, str(jibun).strip(), min(yms), max(yms)),
+    )
+    return _rows_to_view(rows)
+
+
+def query_dong(lawd_cd: str, property_type: str, dong: str, yms=None) -> pd.DataFrame:
+    """동 전체 실거래(새 분석의 유사면적 표본용)."""
+    lo, hi = _dong_range(dong)
+    sql = """SELECT deal_ym, dong, jibun, building, area_m2, price_man, floor, build_year
+             FROM trades
+             WHERE lawd_cd=? AND property_type=? AND dong>=? AND dong<?
+               AND (floor IS NULL OR floor<>-1)"""
+    params = [lawd_cd, property_type, lo, hi]
+    if yms:
+        yms = list(yms)
+        sql += " AND deal_ym BETWEEN ? AND ?"
+        params += [min(yms), max(yms)]
+    sql += " ORDER BY deal_ym DESC"
+    return _rows_to_view(storage.fetch_all(sql, params))
+
+
+def view_to_comps(view: pd.DataFrame) -> pd.DataFrame:
+    """창고 표(거래금액=만원) → estimate_sale_price_range 입력(area_m2, price=원)."""
+    out = pd.DataFrame({
+        "area_m2": pd.to_numeric(view.get("전용면적(㎡)"), errors="coerce"),
+        "price": pd.to_numeric(view.get("거래금액"), errors="coerce") * 10_000,
+    })
+    out = out.dropna(subset=["area_m2", "price"])
+    return out[(out["area_m2"] > 5) & (out["price"] > 10_000_000)]
+
+
+def synced_districts():
+    """동기화된 (lawd_cd, property_type, 월 수, 행 수) 목록."""
+    return storage.fetch_all(
+        """SELECT lawd_cd, property_type, COUNT(*), SUM(row_count) FROM trade_sync
+           GROUP BY lawd_cd, property_type ORDER BY lawd_cd, property_type"""
+    )
+
+
+def list_dongs(lawd_cd: str, property_type: str):
+    return [r[0] for r in storage.fetch_all(
+        """SELECT DISTINCT dong FROM trades WHERE lawd_cd=? AND property_type=? AND dong<>'' ORDER BY dong""",
+        (lawd_cd, property_type),
+    )]
+
+
+def resolve_dong(lawd_cd: str, property_type: str, dong: str):
+    """주소의 동 이름 → 창고에 저장된 동 이름(정확히 같으면 그대로, 아니면 query_dong과 같은 접두 범위의 첫 동)."""
+    lo, hi = _dong_range(dong)
+    row = storage.fetch_one(
+        """SELECT dong FROM trades WHERE lawd_cd=? AND property_type=? AND dong>=? AND dong<?
+           ORDER BY dong=? DESC, dong LIMIT 1""",
+        (lawd_cd, property_type, lo, hi, str(dong or "").strip()),
+    )
+    return row[0] if row else None
+
+
+def view_in_won(view: pd.DataFrame) -> pd.DataFrame:
+    """창고 표의 금액 컬럼(만원)을 엑셀 실거래 표와 같은 원 단위로 바꿉니다(결과 화면 표본용)."""
+    out = view.copy()
+    for c in ("거래금액", "면적단가"):
+        if c in out.columns:
+            out[c] = pd.to_numeric(out[c], errors="coerce") * 10_000
+    return out
@@ -0,0 +1,155 @@
+"""VWORLD 지번(PARCEL) 검색 → 시군구 단위 후보 인덱스(app.db의 parcels 테이블).
+
+- 첫 페이지로 전체 페이지 수를 확인한 뒤 나머지 페이지를 병렬로 받습니다
+  (MOLIT와 같은 keep-alive 세션 + 호스트별 속도 제한 공유)
+- PNU 기준으로 중복을 제거해 저장하고, 동/번지 목록은 인덱스에서 바로 읽습니다
+- 필지는 거의 바뀌지 않으므로 TTL을 길게(기본 30일) 둡니다
+"""
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import molit_api
+import storage
+
+VWORLD_SEARCH_URL = "https://api.vworld.kr/req/search"
+PAGE_SIZE = 1000  # search API 최대값
+REQUEST_TIMEOUT = 12
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_RATE_PER_SEC = 8.0
+DEFAULT_TTL_SEC = 30 * 86400
+
+_LOT_RE = re.compile(r"([가-힣0-9]+동)\s+(\d+)(?:-(\d+))?")
+
+
+def region_key(sido: str, sigungu: str) -> str:
+    return f"{str(sido).strip()} {str(sigungu).strip()}".strip()
+
+
+def parse_candidate(it: dict):
+    """검색 결과 item → {"dong", "bunji", "pnu", "address"} 또는 None."""
+    addr = str(it.get("address") or "")
+    pnu = str(it.get("id") or "")
+    m = _LOT_RE.search(addr)
+    if not m or not pnu:
+        return None
+    bun_main = m.group(2)
+    bun_sub = m.group(3) or "0"
+    bunji = f"{bun_main}-{bun_sub}" if bun_sub != "0" else bun_main
+    return {"dong": m.group(1), "bunji": bunji, "pnu": pnu, "address": addr}
+
+
+def _search_page(query: str, page: int, api_key: str, rate_per_sec: float):
+    """한 페이지 조회. 반환: (items, 전체 페이지 수)"""
+    params = {
+        "service": "search",
+        "request": "search",
+        "version": "2.0",
+        "crs": "EPSG:4326",
+        "size": str(PAGE_SIZE),
+        "page": str(page),
+        "query": query,
+        "type": "PARCEL",
+        "format": "json",
+        "errorformat": "json",
+        "key": api_key,
+    }
+    molit_api.get_limiter(VWORLD_SEARCH_URL, rate_per_sec).acquire()
+    r = molit_api.get_session().get(VWORLD_SEARCH_URL, params=params, timeout=REQUEST_TIMEOUT)
+    r.raise_for_status()
+    resp = (r.json() or {}).get("response") or {}
+    status = resp.get("status")
+    if status == "NOT_FOUND":
+        return [], 0
+    if status and status != "OK":
+        raise RuntimeError(((resp.get("error") or {}).get("text")) or status)
+    items = ((resp.get("result") or {}).get("items")) or []
+    try:
+        total_pages = int((resp.get("page") or {}).get("total") or 1)
+    except (TypeError, ValueError):
+        total_pages = 1
+    return items, total_pages
+
+
+def fetch_all_candidates(sido: str, sigungu: str, api_key: str,
+                         max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                         rate_per_sec: float = DEFAULT_RATE_PER_SEC, progress=None):
+    """모든 페이지를 받아 PNU 기준으로 중복 제거합니다. 반환: (cands, err)
+
+    progress(done, total)를 넘기면 페이지가 끝날 때마다 호출됩니다.
+    """
+    query = region_key(sido, sigungu)
+    try:
+        first, total_pages = _search_page(query, 1, api_key, rate_per_sec)
+    except Exception as e:
+        return [], f"VWORLD 조회 실패: {e}"
+
+    pages = {1: first}
+    done = 1
+    if progress:
+        progress(done, max(1, total_pages))
+    errors = []
+    if total_pages > 1:
+        workers = max(1, min(int(max_in_flight), total_pages - 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vworld") as ex:
+            futs = {ex.submit(_search_page, query, p, api_key, rate_per_sec): p for p in range(2, total_pages + 1)}
+            for fut in as_completed(futs):
+                p = futs[fut]
+                try:
+                    pages[p] = fut.result()[0]
+                except Exception as e:
+                    errors.append(f"{p}페이지: {e}")
+                done += 1
+                if progress:
+                    progress(done, total_pages)
+    if errors:
+        # 일부 페이지가 빠진 결과를 오래 캐시하지 않도록 실패로 돌려줍니다
+        return [], "VWORLD 조회 실패: " + "; ".join(sorted(errors)[:3])
+
+    out = {}
+    for p in sorted(pages):
+        for it in pages[p]:
+            c = parse_candidate(it)
+            if c and c["pnu"] not in out:
+                out[c["pnu"]] = c
+    return list(out.values()), None
+
+
+def store_candidates(region: str, cands):
+    def _tx(cur):
+        cur.execute("""DELETE FROM parcels WHERE region=?""", (region,))
+        cur.executemany(
+            """INSERT OR IGNORE INTO parcels(region, pnu, dong, bunji, address) VALUES(?,?,?,?,?)""",
+            [(region, c["pnu"], c["dong"], c["bunji"], c.get("address")) for c in cands],
+        )
+        cur.execute(
+            """INSERT OR REPLACE INTO parcel_sync(region, fetched_ts, row_count) VALUES(?,?,?)""",
+            (region, int(time.time()), len(cands)),
+        )
+
+    storage.transaction(_tx)
+
+
+def is_fresh(region: str, ttl_sec: int = DEFAULT_TTL_SEC) -> bool:
+    row = storage.fetch_one("""SELECT fetched_ts FROM parcel_sync WHERE region=?""", (region,))
+    return bool(row) and time.time() - float(row[0] or 0) <= ttl_sec
+
+
+def load_candidates(sido: str, sigungu: str, api_key: str, ttl_sec: int = DEFAULT_TTL_SEC,
+                    force: bool = False, progress=None, **fetch_kw):
+    """인덱스가 TTL 안이면 그대로 쓰고, 아니면 전체 페이지를 받아 갱신합니다.
+
+    반환: (후보 수, err, from_index)
+    """
+    region = region_key(sido, sigungu)
+    if not force and is_fresh(region, ttl_sec):
+        row = storage.fetch_one("""SELECT row_count FROM parcel_sync WHERE region=?""", (region,))
+        return int(row[0] or 0), None, True
+    if not api_key:
+        return 0, "VWORLD_API_KEY가 설정되지 않았습니다.", False
+    cands, err = fetch_all_candidates(sido, sigungu, api_key, progress=progress, **fetch_kw)
+    if err:
+        return 0, err, False
+    store_candidates(region, cands)
+    return len(cands), None, False
+